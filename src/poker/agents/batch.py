@@ -0,0 +1,94 @@
+from typing import Callable, Dict, Tuple, Union
+
+import numpy as np
+
+from src.poker.poker_game.utils import CARDS
+
+# Коды действий пакетного протокола (их же использует VectorizedTables).
+FOLD = 0
+CHECK = 1
+CALL = 2
+RAISE = 3
+ACTIONS = ['fold', 'check', 'call', 'raise']
+
+# Пакетный протокол решений.
+#
+# Агент с методом
+#     decide_batch(rows, seat, current_bet, agent_bet, money, pot, min_bet,
+#                  hole_cards, community_cards) -> (actions, amounts)
+# получает наблюдения сразу для многих столов: массивы длины M (hole_cards —
+# форма (M, 2), community_cards — (M, 0..5), коды карт из utils), номера
+# строк-столов `rows` и место `seat`, и возвращает коды действий (FOLD,
+# CHECK, CALL, RAISE выше) и суммы в том же смысле, что у make_decision.
+# Так работают BatchRandomAgent и VectorizedTables; агентов с
+# make_decision подключает PerSeatAdapter.
+
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+
+
+class PerSeatAdapter:
+    def __init__(self, agent: Union[object, Callable[[int], object]]):
+        """
+        Подключает агента с make_decision к пакетному протоколу.
+
+        Для каждой строки пакета агенту выставляются карты, стек и ставка,
+        после чего вызывается make_decision; решения собираются в массивы.
+        Это медленнее векторного агента, но позволяет сажать любых агентов
+        за VectorizedTables.
+
+        Args:
+            agent: Агент, общий для всех столов (подходит для агентов без
+                памяти между решениями, как RandomAgent), или фабрика
+                factory(row) -> агент — тогда у каждого стола свой экземпляр.
+        """
+        if hasattr(agent, 'make_decision'):
+            self.agent = agent
+            self.factory = None
+        else:
+            self.agent = None
+            self.factory = agent
+        self.agents: Dict[int, object] = {}
+
+    def agent_for(self, row: int):
+        """Агент, который принимает решения за стол `row`."""
+        if self.factory is None:
+            return self.agent
+        agent = self.agents.get(row)
+        if agent is None:
+            agent = self.agents[row] = self.factory(row)
+        return agent
+
+    def decide_batch(self, rows, current_bet, agent_bet, money, pot, min_bet, hole_cards, community_cards,
+                     **observation) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Принимает решения по одному make_decision на строку.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Коды действий и суммы.
+        """
+        count = len(rows)
+        actions = np.full(count, FOLD, dtype=np.int64)
+        amounts = np.zeros(count, dtype=np.int64)
+        hole_cards = np.asarray(hole_cards).tolist()
+        community_cards = np.asarray(community_cards).tolist()
+        current_bet = np.asarray(current_bet).tolist()
+        agent_bet = np.asarray(agent_bet).tolist()
+        money = np.asarray(money).tolist()
+        pot = np.asarray(pot).tolist()
+
+        for index in range(count):
+            agent = self.agent_for(int(rows[index]))
+            hole = hole_cards[index]
+            board = community_cards[index]
+            agent.cards = [CARDS[code] for code in hole]
+            agent.money = money[index]
+            agent.current_bet = agent_bet[index]
+            agent.active = True
+            tracker = getattr(agent, 'hand_tracker', None)
+            if tracker is not None:
+                tracker.reset(hole + board)
+            decision, amount = agent.make_decision([CARDS[code] for code in board], current_bet[index],
+                                                   pot[index], min_bet)
+            actions[index] = ACTION_CODES[decision]
+            amounts[index] = amount
+        return actions, amounts
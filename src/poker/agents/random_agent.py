@@ -1,5 +1,10 @@
 import random
 
+import numpy as np
+
+from src.poker.poker_game.hand_evaluation import IncrementalEvaluator
+from src.poker.agents.batch import FOLD, CHECK, CALL, RAISE
+
 class RandomAgent:
     def __init__(self, name):
         self.name = name
@@ -7,6 +12,7 @@ class RandomAgent:
         self.money = 1000  # Начальный баланс
         self.current_bet = 0
         self.active = True
+        self.hand_tracker = IncrementalEvaluator()  # Оценка руки по ходу раздачи
 
     def receive_cards(self, cards):
         """Получить карты от дилера."""
@@ -51,5 +57,44 @@ class RandomAgent:
 
     def reset(self):
         """Сброс состояния агента перед следующим раундом."""
-        self.cards = []
+        self.cards.clear()
         self.current_bet = 0
+
+
+class BatchRandomAgent:
+    def __init__(self, rng=None):
+        """
+        Векторная версия RandomAgent для пакетного движка.
+
+        Те же веса fold/call/raise и тот же диапазон рейза, но решения
+        принимаются сразу за все столы одним вызовом.
+        """
+        self.rng = np.random.default_rng(rng)
+
+    def decide_batch(self, current_bet, agent_bet, money, min_bet, **observation):
+        """
+        Принимает решения для массива ситуаций.
+
+        Args:
+            current_bet (np.ndarray): Текущая ставка на каждом столе.
+            agent_bet (np.ndarray): Ставка агента в текущей раздаче.
+            money (np.ndarray): Остаток денег агента.
+            min_bet (int): Минимальная ставка.
+            **observation: Остальные наблюдения движка (не используются).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Коды действий и суммы.
+        """
+        roll = self.rng.random(len(current_bet))
+        can_check = current_bet == agent_bet
+        short = money <= min_bet
+
+        actions = np.where(roll < 0.2, FOLD, np.where(roll < 0.7, CALL, RAISE))
+        actions = np.where(short, np.where(roll < 0.2, FOLD, CALL), actions)
+        actions = np.where(can_check, np.where(roll < 0.7, CHECK, RAISE), actions)
+        actions = np.where(money <= 0, FOLD, actions)
+
+        raise_amounts = self.rng.integers(current_bet, current_bet + min_bet * 2, endpoint=True)
+        call_amounts = np.minimum(current_bet - agent_bet, money)
+        amounts = np.where(actions == RAISE, raise_amounts, np.where(actions == CALL, call_amounts, 0))
+        return actions, amounts
@@ -0,0 +1,239 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.battle import play_hand
+from src.poker.poker_game.deck import CompactDeck
+from src.poker.poker_game.game import PokerGame
+from src.poker.poker_game.hand_evaluation import evaluate_hand, evaluate_hands_batch
+from src.poker.poker_game.utils import CARDS
+
+# Замер — это фабрика: по зерну она готовит данные и возвращает функцию,
+# выполняющую `ops` операций за один вызов. Подготовка в замер не входит.
+Workload = Callable[[int], Tuple[Callable[[], None], int]]
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+class CallingStation(RandomAgent):
+    """Агент, который только чекает и коллирует: все раздачи доходят до шоудауна."""
+
+    def make_decision(self, community_cards, current_bet, pot, min_bet):
+        if current_bet == self.current_bet:
+            return "check", 0
+        return "call", min(current_bet - self.current_bet, self.money)
+
+
+def evaluate_7card(seed: int):
+    rng = random.Random(seed)
+    hands = [rng.sample(CARDS, 7) for _ in range(10000)]
+
+    def run():
+        for cards in hands:
+            evaluate_hand(cards)
+    return run, len(hands)
+
+
+def evaluate_batch(seed: int):
+    rng = np.random.default_rng(seed)
+    hands = np.argsort(rng.random((100000, 52)), axis=1)[:, :7]
+
+    def run():
+        evaluate_hands_batch(hands)
+    return run, len(hands)
+
+
+def _hands(agent_class, num_players: int, count: int = 200):
+    def workload(seed: int):
+        agents = [agent_class(f"Agent {i+1}") for i in range(num_players)]
+        game = PokerGame(num_players=num_players)
+        hand_index = 0
+
+        def run():
+            nonlocal hand_index
+            for _ in range(count):
+                play_hand(agents, game, hand_index, seed)
+                hand_index += 1
+        return run, count
+    return workload
+
+
+def deck_deal(seed: int):
+    deck = CompactDeck(random.Random(seed))
+    draw = deck.draw
+    count = 10000
+
+    def run():
+        for _ in range(count):
+            deck.reset()
+            for _ in range(17):  # 6 игроков по 2 карты и 5 общих
+                draw()
+    return run, count
+
+
+WORKLOADS: Dict[str, Workload] = {
+    'evaluate_hand': evaluate_7card,
+    'evaluate_hands_batch': evaluate_batch,
+    'full_hand_2p': _hands(RandomAgent, 2),
+    'full_hand_6p': _hands(RandomAgent, 6),
+    'full_hand_9p': _hands(RandomAgent, 9),
+    'showdown_hand_6p': _hands(CallingStation, 6),
+    'deck_reset_deal': deck_deal,
+}
+
+
+def measure(workload: Workload, seed: int = 0, repeats: int = 5) -> Dict:
+    """
+    Замеряет одну нагрузку.
+
+    Скорость — лучший из `repeats` прогонов (меньше всего шума от
+    планировщика). Память считается отдельным прогоном под tracemalloc,
+    чтобы трассировка не искажала время: пик выделенной памяти и сколько
+    блоков и байт осталось занятыми после прогона (рост на операцию
+    означает утечку или неограниченный кэш).
+
+    Returns:
+        Dict: ops_per_sec, best_sec, mean_sec, ops, repeats, peak_bytes,
+        retained_blocks_per_op и retained_bytes_per_op.
+    """
+    run, ops = workload(seed)
+    run()  # прогрев: кэши, ленивые импорты
+    times = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - started)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    run, ops = workload(seed)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        start_size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+
+    best = min(times)
+    return {
+        'ops_per_sec': ops / best,
+        'best_sec': best,
+        'mean_sec': sum(times) / len(times),
+        'ops': ops,
+        'repeats': repeats,
+        'peak_bytes': peak - start_size,
+        'retained_blocks_per_op': blocks / ops,
+        'retained_bytes_per_op': size / ops,
+    }
+
+
+def run_benchmarks(names: Optional[List[str]] = None, seed: int = 0, repeats: int = 5) -> Dict:
+    """
+    Прогоняет выбранные нагрузки (по умолчанию все).
+
+    Returns:
+        Dict: meta — окружение и параметры, results — замеры по имени нагрузки.
+    """
+    names = names or list(WORKLOADS)
+    results = {}
+    for name in names:
+        if name not in WORKLOADS:
+            raise ValueError(f"Неизвестная нагрузка: {name}")
+        results[name] = measure(WORKLOADS[name], seed=seed, repeats=repeats)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeats': repeats,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.1) -> List[Dict]:
+    """
+    Сравнивает замеры с эталоном.
+
+    Args:
+        current (Dict): Результат run_benchmarks.
+        baseline (Dict): Сохранённый ранее результат run_benchmarks.
+        threshold (float): Допустимое падение скорости (0.1 — 10%).
+
+    Returns:
+        List[Dict]: По записи на общую нагрузку: name, ops_per_sec,
+        baseline_ops_per_sec, ratio и regression.
+    """
+    rows = []
+    for name, result in current['results'].items():
+        reference = baseline.get('results', {}).get(name)
+        if reference is None:
+            continue
+        ratio = result['ops_per_sec'] / reference['ops_per_sec']
+        rows.append({
+            'name': name,
+            'ops_per_sec': result['ops_per_sec'],
+            'baseline_ops_per_sec': reference['ops_per_sec'],
+            'ratio': ratio,
+            'regression': ratio < 1 - threshold,
+        })
+    return rows
+
+
+def _print_results(report: Dict, comparison: List[Dict]):
+    ratios = {row['name']: row for row in comparison}
+    for name, result in report['results'].items():
+        line = (f"{name:22} {result['ops_per_sec']:14,.0f} оп/с "
+                f"пик {result['peak_bytes'] / 1024:10.1f} КБ  {result['retained_bytes_per_op']:8.1f} байт/оп остаётся")
+        row = ratios.get(name)
+        if row is not None:
+            line += f"  {row['ratio']:6.2f}x" + ("  РЕГРЕССИЯ" if row['regression'] else "")
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки оценки рук, движка ставок и колоды.")
+    parser.add_argument("names", nargs="*", help=f"Нагрузки (по умолчанию все): {', '.join(WORKLOADS)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="Сохранить результаты в JSON.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Эталон для сравнения.")
+    parser.add_argument("--save-baseline", action="store_true", help="Записать результаты как эталон.")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Допустимое падение скорости.")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.names, seed=args.seed, repeats=args.repeats)
+    comparison = []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as file:
+            comparison = compare(report, json.load(file), args.threshold)
+    _print_results(report, comparison)
+
+    for path in filter(None, (args.output, args.baseline if args.save_baseline else None)):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    if any(row['regression'] for row in comparison):
+        sys.exit(1)
@@ -0,0 +1,370 @@
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .events import (EventSink, STREET, FOLD, CHECK, CALL, ALL_IN, RAISE, INVALID_RAISE, HAND_START,
+                     HAND_END)
+from .history import MAX_ACTIONS, MAX_SEATS, HandHistoryReader
+
+# Счётчики игрока. Добровольный вход (vpip) — колл с доплатой, колл ва-банк
+# или рейз на префлопе (блайнды не считаются); pfr — рейз на префлопе.
+# Действия после флопа (postflop_*) дают фактор и частоту агрессии.
+# Шоудаун — дошёл до вскрытия (не сфолдил, и к концу раздачи осталось больше
+# одного игрока); "выиграл" — закончил раздачу в плюсе. Шоудаун считается и
+# увиденным флопом: при all-in на префлопе в режиме RUNOUT_EV доска не
+# сдаётся, но вскрытие всё равно было, и WTSD не выходит за 100%.
+FIELDS = ('hands', 'vpip', 'pfr', 'saw_flop', 'showdown', 'showdown_won', 'won', 'net',
+          'postflop_raises', 'postflop_calls', 'postflop_checks', 'postflop_folds')
+
+# Имена игроков раздачи для записей истории: общий список для всех раздач
+# (места не меняются) или функция hand_id -> имена по местам.
+SeatNames = Union[Sequence[str], Callable[[int], Sequence[str]], None]
+
+
+def position_name(seat: int, num_seats: int) -> str:
+    """
+    Позиция места: seats[0] — малый блайнд, seats[1] — большой, последнее
+    место — баттон (в хедз-апе баттон — малый блайнд).
+    """
+    if seat == 0:
+        return 'SB'
+    if seat == 1:
+        return 'BB'
+    from_button = num_seats - 1 - seat
+    if from_button < 3:
+        return ('BTN', 'CO', 'HJ')[from_button]
+    return 'UTG' if seat == 2 else f'UTG+{seat - 2}'
+
+
+# Номер позиции по (число мест, место) для векторной обработки записей.
+POSITIONS = sorted({position_name(seat, seats) for seats in range(2, MAX_SEATS + 1) for seat in range(seats)})
+_POSITION_INDEX = np.zeros((MAX_SEATS + 1, MAX_SEATS), dtype=np.int64)
+for _seats in range(2, MAX_SEATS + 1):
+    for _seat in range(_seats):
+        _POSITION_INDEX[_seats, _seat] = POSITIONS.index(position_name(_seat, _seats))
+
+
+class PlayerStats:
+    __slots__ = ('name', 'position') + FIELDS
+
+    def __init__(self, name: str, position: Optional[str] = None):
+        """Счётчики игрока (на одной позиции или по всем); объединяются через merge."""
+        self.name = name
+        self.position = position
+        for field in FIELDS:
+            setattr(self, field, 0)
+
+    def merge(self, other: 'PlayerStats'):
+        for field in FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def summary(self, big_blind: int = 20) -> Dict:
+        """
+        Сводка по игроку.
+
+        Returns:
+            Dict: hands, vpip, pfr, af (рейзы / коллы после флопа), afq (доля
+            рейзов среди действий после флопа), wtsd (доля шоудаунов среди
+            увиденных флопов), wsd (доля выигранных шоудаунов), win_rate,
+            chips и bb_per_100.
+        """
+        def ratio(numerator, denominator):
+            return numerator / denominator if denominator else 0.0
+
+        postflop = self.postflop_raises + self.postflop_calls + self.postflop_checks + self.postflop_folds
+        if self.postflop_calls:
+            af = self.postflop_raises / self.postflop_calls
+        else:
+            af = math.inf if self.postflop_raises else 0.0
+        return {
+            'hands': self.hands,
+            'vpip': ratio(self.vpip, self.hands),
+            'pfr': ratio(self.pfr, self.hands),
+            'af': af,
+            'afq': ratio(self.postflop_raises, postflop),
+            'wtsd': ratio(self.showdown, self.saw_flop),
+            'wsd': ratio(self.showdown_won, self.showdown),
+            'win_rate': ratio(self.won, self.hands),
+            'chips': self.net,
+            'bb_per_100': ratio(self.net, self.hands) / big_blind * 100,
+        }
+
+    def __repr__(self):
+        return f"PlayerStats(name={self.name!r}, position={self.position!r}, hands={self.hands})"
+
+
+class HandStats:
+    def __init__(self):
+        """
+        Статистика по агентам и позициям.
+
+        Память ограничена числом пар (агент, позиция), а не числом раздач.
+        Накопители из разных процессов или файлов складываются через merge.
+        """
+        self.players: Dict[Tuple[str, str], PlayerStats] = {}
+
+    def get(self, name: str, position: str) -> PlayerStats:
+        stats = self.players.get((name, position))
+        if stats is None:
+            stats = self.players[(name, position)] = PlayerStats(name, position)
+        return stats
+
+    def merge(self, other: 'HandStats') -> 'HandStats':
+        for (name, position), stats in other.players.items():
+            self.get(name, position).merge(stats)
+        return self
+
+    def by_agent(self) -> Dict[str, PlayerStats]:
+        """Счётчики каждого агента по всем позициям."""
+        result: Dict[str, PlayerStats] = {}
+        for (name, _), stats in self.players.items():
+            if name not in result:
+                result[name] = PlayerStats(name)
+            result[name].merge(stats)
+        return result
+
+    def summary(self, big_blind: int = 20) -> Dict:
+        """Сводка PlayerStats.summary по агентам; в 'positions' — она же по позициям."""
+        result = {}
+        for name, stats in sorted(self.by_agent().items()):
+            result[name] = stats.summary(big_blind)
+            result[name]['positions'] = {
+                position: self.players[(name, position)].summary(big_blind)
+                for position in POSITIONS if (name, position) in self.players
+            }
+        return result
+
+    def add_records(self, records: np.ndarray, names: SeatNames = None):
+        """
+        Добавляет блок записей истории (см. HandHistoryReader.iter_chunks).
+
+        Все признаки считаются над массивами блока целиком: действия
+        раскладываются по парам (раздача, место) через bincount, а затем
+        суммируются по парам (агент, позиция).
+
+        Args:
+            records (np.ndarray): Записи с dtype history.HAND_DTYPE.
+            names: Имена по местам — список или функция hand_id -> имена;
+                None — "Seat 1", "Seat 2", ...
+        """
+        count = len(records)
+        if not count:
+            return
+        kinds = records['action_kind']
+        streets = records['action_street']
+        amounts = records['action_amount']
+        num_seats = records['num_seats'].astype(np.int64)
+        valid = np.arange(MAX_ACTIONS) < records['num_actions'][:, None]
+        flat = np.arange(count)[:, None] * MAX_SEATS + records['action_seat']
+
+        def per_seat(mask):
+            return np.bincount(flat[mask & valid], minlength=count * MAX_SEATS).reshape(count, MAX_SEATS)
+
+        preflop = streets == 0
+        postflop = ~preflop
+        calls = ((kinds == CALL) & (amounts > 0)) | (kinds == ALL_IN)
+        raises = kinds == RAISE
+        folds = (kinds == FOLD) | (kinds == INVALID_RAISE)
+
+        seated = np.arange(MAX_SEATS) < num_seats[:, None]
+        folded = per_seat(folds) > 0
+        still_in = seated & ~folded
+        showdown = still_in & (still_in.sum(axis=1) > 1)[:, None]
+        reached_flop = seated & (records['board_size'] >= 3)[:, None] & ~(per_seat(preflop & folds) > 0)
+        results = records['results'].astype(np.int64)
+        values = {
+            'hands': seated,
+            'vpip': per_seat(preflop & (calls | raises)) > 0,
+            'pfr': per_seat(preflop & raises) > 0,
+            'saw_flop': reached_flop | showdown,
+            'showdown': showdown,
+            'showdown_won': showdown & (results > 0),
+            'won': seated & (results > 0),
+            'net': np.where(seated, results, 0),
+            'postflop_raises': per_seat(postflop & raises),
+            'postflop_calls': per_seat(postflop & calls),
+            'postflop_checks': per_seat(postflop & (kinds == CHECK)),
+            'postflop_folds': per_seat(postflop & folds),
+        }
+
+        # Пара (агент, позиция) для каждого места каждой раздачи.
+        agent_names, agent_ids = _seat_agents(records['hand_id'], num_seats, names)
+        keys = agent_ids * len(POSITIONS) + _POSITION_INDEX[num_seats]
+        keys = keys[seated]
+        size = len(agent_names) * len(POSITIONS)
+        totals = {field: np.bincount(keys, weights=value[seated], minlength=size) for field, value in values.items()}
+        for key in np.flatnonzero(totals['hands']):
+            agent, position = divmod(int(key), len(POSITIONS))
+            stats = self.get(agent_names[agent], POSITIONS[position])
+            for field in FIELDS:
+                setattr(stats, field, getattr(stats, field) + int(round(totals[field][key])))
+
+
+def _seat_agents(hand_ids: np.ndarray, num_seats: np.ndarray, names: SeatNames) -> Tuple[List[str], np.ndarray]:
+    """Имена агентов и массив (раздача, место) -> номер агента."""
+    if names is None:
+        return [f"Seat {seat + 1}" for seat in range(MAX_SEATS)], np.broadcast_to(np.arange(MAX_SEATS),
+                                                                                  (len(hand_ids), MAX_SEATS))
+    if not callable(names):
+        names = list(names)
+        padded = names + [f"Seat {seat + 1}" for seat in range(len(names), MAX_SEATS)]
+        return padded, np.broadcast_to(np.arange(MAX_SEATS), (len(hand_ids), MAX_SEATS))
+
+    agent_names: List[str] = []
+    index: Dict[str, int] = {}
+    ids = np.zeros((len(hand_ids), MAX_SEATS), dtype=np.int64)
+    for row, (hand_id, seats) in enumerate(zip(hand_ids.tolist(), num_seats.tolist())):
+        for seat, name in enumerate(names(hand_id)[:seats]):
+            agent = index.get(name)
+            if agent is None:
+                agent = index[name] = len(agent_names)
+                agent_names.append(name)
+            ids[row, seat] = agent
+    return agent_names, ids
+
+
+class AnalyticsSink(EventSink):
+    def __init__(self, stats: Optional[HandStats] = None):
+        """
+        Считает статистику на лету из событий движка.
+
+        Подключается к manage_betting_rounds как приёмник событий (вместе с
+        другими — через TeeSink); признаки совпадают с HandStats.add_records
+        для тех же раздач, записанных HandHistoryWriter.
+        """
+        self.stats = stats if stats is not None else HandStats()
+        self._names: List[str] = []
+        self._seats: Dict[str, int] = {}
+        self._stacks: List[int] = []
+        self._street = 0
+        # Признаки текущей раздачи по местам; списки переиспользуются.
+        self._vpip = [False] * MAX_SEATS
+        self._pfr = [False] * MAX_SEATS
+        self._folded = [False] * MAX_SEATS
+        self._folded_preflop = [False] * MAX_SEATS
+        self._actions = [[0, 0, 0, 0] for _ in range(MAX_SEATS)]  # рейзы, коллы, чеки, фолды после флопа
+
+    def emit(self, kind, player=None, amount=0, info=None):
+        if kind == CALL or kind == ALL_IN or kind == RAISE:
+            if kind == CALL and amount <= 0:
+                return
+            seat = self._seats[player]
+            if self._street == 0:
+                self._vpip[seat] = True
+                if kind == RAISE:
+                    self._pfr[seat] = True
+            else:
+                self._actions[seat][0 if kind == RAISE else 1] += 1
+        elif kind == CHECK:
+            if self._street:
+                self._actions[self._seats[player]][2] += 1
+        elif kind == FOLD or kind == INVALID_RAISE:
+            seat = self._seats[player]
+            self._folded[seat] = True
+            if self._street:
+                self._actions[seat][3] += 1
+            else:
+                self._folded_preflop[seat] = True
+        elif kind == STREET:
+            self._street = info[0]
+        elif kind == HAND_START:
+            self._start(info[0], info[1])
+        elif kind == HAND_END:
+            self._finish(info[0])
+
+    def _start(self, names: List[str], stacks: List[int]):
+        self._names = names
+        self._seats = {name: seat for seat, name in enumerate(names)}
+        self._stacks = stacks
+        self._street = 0
+        for seat in range(len(names)):
+            self._vpip[seat] = self._pfr[seat] = self._folded[seat] = self._folded_preflop[seat] = False
+            actions = self._actions[seat]
+            actions[0] = actions[1] = actions[2] = actions[3] = 0
+
+    def _finish(self, final_stacks: List[int]):
+        num_seats = len(self._names)
+        still_in = num_seats - sum(self._folded[:num_seats])
+        for seat, name in enumerate(self._names):
+            stats = self.stats.get(name, position_name(seat, num_seats))
+            result = final_stacks[seat] - self._stacks[seat]
+            showdown = still_in > 1 and not self._folded[seat]
+            stats.hands += 1
+            stats.vpip += self._vpip[seat]
+            stats.pfr += self._pfr[seat]
+            stats.saw_flop += showdown or self._street >= 1 and not self._folded_preflop[seat]
+            stats.showdown += showdown
+            stats.showdown_won += showdown and result > 0
+            stats.won += result > 0
+            stats.net += result
+            raises, calls, checks, folds = self._actions[seat]
+            stats.postflop_raises += raises
+            stats.postflop_calls += calls
+            stats.postflop_checks += checks
+            stats.postflop_folds += folds
+
+
+def _analyze_range(path: str, start: int, stop: int, names: SeatNames, chunk_size: int) -> HandStats:
+    """Задача для рабочего процесса: статистика по записям [start, stop) файла."""
+    records = HandHistoryReader(path).records
+    stats = HandStats()
+    for offset in range(start, stop, chunk_size):
+        stats.add_records(records[offset:min(offset + chunk_size, stop)], names)
+    return stats
+
+
+def analyze_history(path: str, names: SeatNames = None, processes: Optional[int] = 1,
+                    chunk_size: int = 65536) -> HandStats:
+    """
+    Статистика по файлу истории раздач за один проход.
+
+    Файл читается блоками через memmap; с несколькими процессами он делится
+    на равные диапазоны записей, а их накопители объединяются.
+
+    Args:
+        path (str): Файл HandHistoryWriter.
+        names: Имена по местам (см. HandStats.add_records); функция должна
+            быть доступна по импорту, если processes > 1.
+        processes (int): Число рабочих процессов (None — все ядра).
+        chunk_size (int): Записей в одном векторном блоке.
+    """
+    total = len(HandHistoryReader(path))
+    processes = processes or os.cpu_count() or 1
+    if processes <= 1 or total <= chunk_size:
+        return _analyze_range(path, 0, total, names, chunk_size)
+
+    bounds = np.linspace(0, total, processes + 1).astype(np.int64).tolist()
+    stats = HandStats()
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(_analyze_range, path, start, stop, names, chunk_size)
+                   for start, stop in zip(bounds, bounds[1:]) if stop > start]
+        for future in futures:
+            stats.merge(future.result())
+    return stats
+
+
+def format_summary(summary: Dict) -> List[str]:
+    lines = []
+    for name, row in summary.items():
+        lines.append(f"{name}: {row['hands']} раздач, VPIP {row['vpip']:.1%}, PFR {row['pfr']:.1%}, "
+                     f"AF {row['af']:.2f}, WTSD {row['wtsd']:.1%}, W$SD {row['wsd']:.1%}, "
+                     f"{row['bb_per_100']:+.1f} bb/100")
+        for position, stats in row['positions'].items():
+            lines.append(f"  {position:>6}: {stats['hands']} раздач, VPIP {stats['vpip']:.1%}, "
+                         f"PFR {stats['pfr']:.1%}, {stats['bb_per_100']:+.1f} bb/100")
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Статистика игроков по файлу истории раздач.")
+    parser.add_argument("path")
+    parser.add_argument("--names", nargs="+", default=None, help="Имена по местам (если места не менялись).")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--big-blind", type=int, default=20)
+    args = parser.parse_args()
+    for line in format_summary(analyze_history(args.path, args.names, args.processes).summary(args.big_blind)):
+        print(line)
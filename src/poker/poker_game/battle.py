@@ -0,0 +1,221 @@
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.betting import RUNOUT_PLAY, RUNOUT_MODES, manage_betting_rounds
+from src.poker.poker_game.events import EventSink, NULL_SINK, PRINT_SINK
+from src.poker.poker_game.game import PokerGame
+
+# Описание места за столом: имя агента и фабрика, создающая его по имени.
+# Фабрика должна быть доступна по импорту, чтобы её можно было передать в процесс.
+AgentSpec = Tuple[str, Callable[[str], object]]
+
+Z_95 = 1.96
+
+
+class AgentStats:
+    __slots__ = ('name', 'hands', 'won', 'total', 'total_sq')
+
+    def __init__(self, name: str):
+        """Накопитель результатов агента; объединяется с накопителями других процессов."""
+        self.name = name
+        self.hands = 0
+        self.won = 0
+        self.total = 0
+        self.total_sq = 0
+
+    def add(self, result: int):
+        self.hands += 1
+        self.total += result
+        self.total_sq += result * result
+        if result > 0:
+            self.won += 1
+
+    def merge(self, other: 'AgentStats'):
+        self.hands += other.hands
+        self.won += other.won
+        self.total += other.total
+        self.total_sq += other.total_sq
+
+    def summary(self, big_blind: int) -> Dict:
+        """
+        Сводка по агенту.
+
+        Returns:
+            Dict: hands, chips, bb_per_100, win_rate, variance (в bb² за раздачу)
+            и ci (половина 95% интервала для bb/100).
+        """
+        if not self.hands:
+            return {'hands': 0, 'chips': 0, 'bb_per_100': 0.0, 'win_rate': 0.0,
+                    'variance': 0.0, 'ci': math.inf}
+        mean = self.total / self.hands
+        variance = 0.0
+        if self.hands > 1:
+            variance = max(self.total_sq / self.hands - mean * mean, 0.0) * self.hands / (self.hands - 1)
+        variance_bb = variance / big_blind ** 2
+        return {
+            'hands': self.hands,
+            'chips': self.total,
+            'bb_per_100': mean / big_blind * 100,
+            'win_rate': self.won / self.hands,
+            'variance': variance_bb,
+            'ci': Z_95 * math.sqrt(variance_bb / self.hands) * 100 if self.hands > 1 else math.inf,
+        }
+
+
+def hand_seed(seed: int, hand_index: int) -> str:
+    """Зерно конкретной раздачи: по нему раздачу можно переиграть отдельно."""
+    return f"{seed}:{hand_index}"
+
+
+def play_hand(agents: List, game: PokerGame, hand_index: int, seed: int, stack: int = 1000,
+              min_bet: int = 10, small_blind: int = 10, big_blind: int = 20,
+              sink: EventSink = NULL_SINK, runout: str = RUNOUT_PLAY, max_boards: int = 20000) -> List[int]:
+    """
+    Играет одну раздачу с кнопкой, сдвинутой на `hand_index` мест.
+
+    Колода и решения RandomAgent используют модуль random, поэтому
+    перед раздачей он засевается зерном hand_seed(seed, hand_index).
+    runout и max_boards передаются в manage_betting_rounds.
+
+    Returns:
+        List[int]: Выигрыш каждого агента (в порядке `agents`).
+    """
+    random.seed(hand_seed(seed, hand_index))
+    button = hand_index % len(agents)
+    seats = agents[button:] + agents[:button]
+
+    for agent in agents:
+        agent.reset()
+        agent.active = True
+        agent.money = stack
+    game.players = seats
+    game.community_cards = []
+    game.deck.reset()
+    game.deal_cards()
+
+    manage_betting_rounds(agents=seats, min_bet=min_bet, game=game,
+                          small_blind=small_blind, big_blind=big_blind, sink=sink,
+                          runout=runout, max_boards=max_boards)
+    return [agent.money - stack for agent in agents]
+
+
+def _play_chunk(specs: Sequence[AgentSpec], start: int, count: int, seed: int, options: Dict) -> List[AgentStats]:
+    """Задача для рабочего процесса: играет раздачи [start, start + count)."""
+    agents = [factory(name) for name, factory in specs]
+    game = PokerGame(num_players=len(agents))
+    stats = [AgentStats(name) for name, _ in specs]
+    for hand_index in range(start, start + count):
+        for accumulator, result in zip(stats, play_hand(agents, game, hand_index, seed, **options)):
+            accumulator.add(result)
+    return stats
+
+
+def run_matchup(specs: Sequence[AgentSpec], hands: int, seed: int = 0, processes: Optional[int] = None,
+                chunk_size: int = 500, progress: Optional[Callable[[Dict, int, float], None]] = None,
+                stack: int = 1000, min_bet: int = 10, small_blind: int = 10, big_blind: int = 20,
+                runout: str = RUNOUT_PLAY) -> Dict:
+    """
+    Играет `hands` раздач одним составом агентов на пуле процессов.
+
+    Раздачи делятся на блоки по `chunk_size`; по мере готовности блоков
+    результаты объединяются в родительском процессе, а `progress`
+    получает текущую сводку, число сыгранных раздач и скорость (раздач/с).
+
+    Args:
+        specs (Sequence[AgentSpec]): Места за столом: (имя, фабрика агента).
+        hands (int): Количество раздач.
+        seed (int): Базовое зерно; раздача i воспроизводится через replay_hand.
+        processes (int): Число процессов (по умолчанию — все ядра).
+        chunk_size (int): Раздач на одну задачу.
+        progress (Callable): Обратный вызов прогресса.
+        runout (str): Режим all-in (см. manage_betting_rounds); RUNOUT_EV
+            делит банк по эквити и заметно снижает дисперсию сравнения агентов.
+
+    Returns:
+        Dict: agents — сводка по каждому агенту (см. AgentStats.summary),
+        hands и hands_per_sec.
+    """
+    options = {'stack': stack, 'min_bet': min_bet, 'small_blind': small_blind, 'big_blind': big_blind,
+               'runout': runout}
+    totals = [AgentStats(name) for name, _ in specs]
+    processes = processes or os.cpu_count() or 1
+    started = time.perf_counter()
+    done = 0
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        chunks = iter(range(0, hands, chunk_size))
+        pending = {}
+        while True:
+            for start in chunks:
+                count = min(chunk_size, hands - start)
+                pending[executor.submit(_play_chunk, specs, start, count, seed, options)] = count
+                if len(pending) >= 2 * processes:
+                    break
+            if not pending:
+                break
+            completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                done += pending.pop(future)
+                for accumulator, part in zip(totals, future.result()):
+                    accumulator.merge(part)
+            if progress is not None:
+                elapsed = time.perf_counter() - started
+                progress(_summaries(totals, big_blind), done, done / elapsed if elapsed else 0.0)
+
+    elapsed = time.perf_counter() - started
+    return {
+        'agents': _summaries(totals, big_blind),
+        'hands': done,
+        'hands_per_sec': done / elapsed if elapsed else 0.0,
+    }
+
+
+def run_battle(matchups: Sequence[Sequence[AgentSpec]], hands: int, seed: int = 0, **kwargs) -> List[Dict]:
+    """Прогоняет run_matchup для каждого состава; у составов разные зёрна."""
+    return [run_matchup(specs, hands, seed=seed + index, **kwargs) for index, specs in enumerate(matchups)]
+
+
+def replay_hand(specs: Sequence[AgentSpec], hand_index: int, seed: int = 0,
+                sink: EventSink = PRINT_SINK, **options) -> List[int]:
+    """Переигрывает одну раздачу из run_matchup с выводом событий."""
+    agents = [factory(name) for name, factory in specs]
+    game = PokerGame(num_players=len(agents))
+    return play_hand(agents, game, hand_index, seed, sink=sink, **options)
+
+
+def _summaries(totals: List[AgentStats], big_blind: int) -> Dict:
+    return {accumulator.name: accumulator.summary(big_blind) for accumulator in totals}
+
+
+def _print_progress(summary: Dict, done: int, hands_per_sec: float):
+    print(f"{done} раздач, {hands_per_sec:.0f} раздач/с")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Матч агентов на пуле процессов.")
+    parser.add_argument("--agents", type=int, default=6)
+    parser.add_argument("--hands", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--replay", type=int, default=None, help="Номер раздачи для переигровки.")
+    parser.add_argument("--runout", choices=RUNOUT_MODES, default=RUNOUT_PLAY,
+                        help="Что делать, когда ставить больше некому.")
+    args = parser.parse_args()
+
+    specs = [(f"Agent {i+1}", RandomAgent) for i in range(args.agents)]
+    if args.replay is not None:
+        replay_hand(specs, args.replay, args.seed, runout=args.runout)
+    else:
+        result = run_matchup(specs, args.hands, seed=args.seed, processes=args.processes,
+                             chunk_size=args.chunk_size, progress=_print_progress, runout=args.runout)
+        for name, stats in result['agents'].items():
+            print(f"{name}: {stats['bb_per_100']:+.1f} bb/100 ± {stats['ci']:.1f}, "
+                  f"выигрыш в {stats['win_rate']:.1%} раздач, {stats['hands']} раздач")
+        print(f"Скорость: {result['hands_per_sec']:.0f} раздач/с")
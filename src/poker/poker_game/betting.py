@@ -1,15 +1,23 @@
+from time import perf_counter
 from typing import List
+import numpy as np
 from src.poker.agents.random_agent import RandomAgent
 from src.poker.poker_game.game import PokerGame
-from src.poker.poker_game.hand_evaluation import evaluate_hand  # Реализация функций для вычисления силы руки
-
-def determine_winner(agents: List[RandomAgent], community_cards: List[str]) -> List[RandomAgent]:
+from src.poker.poker_game.table import TableState
+from src.poker.poker_game.hand_evaluation import evaluate_hand, evaluate_with_board  # Реализация функций для вычисления силы руки
+from src.poker.poker_game.profiling import PROFILER, BETTING_ROUND, SHOWDOWN as SHOWDOWN_PHASE, POT
+from src.poker.poker_game.events import EventSink, PRINT_SINK, STREET, BLIND, TO_CALL, FOLD, CHECK, CALL, ALL_IN, RAISE, INVALID_RAISE, SHOWDOWN_START, SHOWDOWN, POT_AWARDED, UNCONTESTED, NO_SHOWDOWN, HAND_START, HAND_END, EQUITY_SHARE
+from src.poker.poker_game.equity import runout_boards
+from src.poker.poker_game.utils import CARD_CODES
+
+def determine_winner(agents: List[RandomAgent], community_cards: List[str], sink: EventSink = PRINT_SINK) -> List[RandomAgent]:
     """
     Определяет победителя (или победителей в случае ничьей) по комбинациям.
 
     Args:
         agents (List[RandomAgent]): Список агентов.
         community_cards (List[str]): Общие карты.
+        sink (EventSink): Приёмник событий.
 
     Returns:
         List[RandomAgent]: Список победителей.
@@ -20,11 +28,10 @@ def determine_winner(agents: List[RandomAgent], community_cards: List[str]) -> L
     for agent in agents:
         if agent.active:
             # Используем функцию evaluate_hand для расчета силы руки
-            print(agent.cards)
-            print(community_cards)
-            print(agent.cards + community_cards)
             hand_score = evaluate_hand(agent.cards + community_cards)
-            print(f"{agent.name} комбинация: {hand_score['combination_name']} (оценка: {hand_score['score']})")
+            if sink.enabled:
+                sink.emit(SHOWDOWN, agent.name, hand_score['score'],
+                          (hand_score['combination_name'], list(agent.cards)))
 
             # Сравниваем текущую комбинацию с лучшей
             if best_score is None or hand_score['score'] > best_score:
@@ -35,13 +42,14 @@ def determine_winner(agents: List[RandomAgent], community_cards: List[str]) -> L
 
     return winners
 
-def distribute_pot(winners: List[RandomAgent], pot: int):
+def distribute_pot(winners: List[RandomAgent], pot: int, sink: EventSink = PRINT_SINK):
     """
     Распределяет банк между победителями.
 
     Args:
         winners (List[RandomAgent]): Список победителей.
         pot (int): Размер банка.
+        sink (EventSink): Приёмник событий.
     """
     if not winners:
         raise ValueError("Нет победителей для распределения банка.")
@@ -49,32 +57,89 @@ def distribute_pot(winners: List[RandomAgent], pot: int):
     share = pot // len(winners)
     for winner in winners:
         winner.money += share
-        print(f"{winner.name} получает {share} из банка!")
+        if sink.enabled:
+            sink.emit(POT_AWARDED, winner.name, share, False)
 
     # Обработка остатка
     remainder = pot % len(winners)
     if remainder > 0:
         winners[0].money += remainder
-        print(f"{winners[0].name} получает дополнительно {remainder} из остатка банка.")
+        if sink.enabled:
+            sink.emit(POT_AWARDED, winners[0].name, remainder, True)
 
-def betting_round(agents: List[RandomAgent], min_bet: int, current_bet: int, pot: int, community_cards: List[str], small_blind: int, big_blind: int, round_number: int):
+def betting_round(table: TableState, min_bet: int, small_blind: int, big_blind: int, sink: EventSink = PRINT_SINK,
+                  skip_all_in: bool = False):
     """
     Проводит один раунд ставок.
 
+    Банк и текущая ставка берутся из состояния стола и записываются обратно;
+    номер раунда — table.street (0 — префлоп, 1 — флоп и т.д.).
+
     Args:
-        agents (List[RandomAgent]): Список агентов, участвующих в раунде.
+        table (TableState): Состояние стола.
         min_bet (int): Минимальная ставка для входа в раунд.
-        current_bet (int): Текущая ставка, которую нужно "догнать".
-        pot (int): Текущий банк.
-        community_cards (List[str]): Общие карты.
         small_blind (int): Размер малого блайнда.
         big_blind (int): Размер большого блайнда.
-        round_number (int): Номер раунда (0 — префлоп, 1 — флоп и т.д.).
+        sink (EventSink): Приёмник событий.
+        skip_all_in (bool): Не спрашивать игроков без фишек (см. betting_steps).
+    """
+    play_steps(betting_steps(table, min_bet, small_blind, big_blind, sink, skip_all_in), table, min_bet)
 
-    Returns:
-        int: Обновлённый банк (pot).
-        int: Обновлённая текущая ставка (current_bet).
+def play_steps(steps, table: TableState, min_bet: int):
+    """
+    Проводит генератор правил (betting_steps или hand_steps), спрашивая
+    решения у самих агентов через make_decision.
+
+    Args:
+        steps: Генератор, отдающий (агент, текущая ставка, банк).
+        table (TableState): Состояние стола (общие карты и номер улицы).
+        min_bet (int): Минимальная ставка.
+    """
+    request = next(steps, None)
+    # hand_steps начинает раздачу (и её замер) только на первом шаге.
+    community_cards = table.community_cards
+    profiling = PROFILER.active
+    while request is not None:
+        agent, current_bet, pot = request
+        # Агент принимает решение
+        if profiling:
+            started = perf_counter()
+        decision = agent.make_decision(
+            community_cards=community_cards,
+            current_bet=current_bet,
+            pot=pot,
+            min_bet=min_bet,
+        )
+        if profiling:
+            PROFILER.decision(table.street, decision[0], perf_counter() - started)
+        try:
+            request = steps.send(decision)
+        except StopIteration:
+            break
+
+def betting_steps(table: TableState, min_bet: int, small_blind: int, big_blind: int, sink: EventSink = PRINT_SINK,
+                  skip_all_in: bool = False):
     """
+    Правила раунда ставок в виде генератора, без вызова агентов.
+
+    На каждом ходе генератор отдаёт (агент, текущая ставка, банк) и ждёт
+    через send решение агента — пару (действие, сумма). Так одни и те же
+    правила работают и в betting_round, и в асинхронном движке, где решение
+    приходит по сети.
+
+    Args:
+        table (TableState): Состояние стола.
+        min_bet (int): Минимальная ставка для входа в раунд.
+        small_blind (int): Размер малого блайнда.
+        big_blind (int): Размер большого блайнда.
+        sink (EventSink): Приёмник событий.
+        skip_all_in (bool): Игроки без фишек (all-in) не ходят и не считаются
+            недоуравнявшими ставку. По умолчанию их спрашивают, как и раньше.
+    """
+    agents = table.seats
+    round_number = table.street
+    pot = table.pot
+    current_bet = table.current_bet
     small_blind_agent = agents[0]
     big_blind_agent = agents[1]
 
@@ -85,12 +150,14 @@ def betting_round(agents: List[RandomAgent], min_bet: int, current_bet: int, pot
             small_blind_agent.money -= small_blind
             small_blind_agent.current_bet = small_blind
             pot += small_blind
-            print(f"{small_blind_agent.name} поставил малый блайнд: {small_blind}")
+            if sink.enabled:
+                sink.emit(BLIND, small_blind_agent.name, small_blind, (False, False))
         else:
             pot += small_blind_agent.money
             small_blind_agent.current_bet = small_blind_agent.money
             small_blind_agent.money = 0
-            print(f"{small_blind_agent.name} поставил всё (малый блайнд): {small_blind_agent.current_bet}")
+            if sink.enabled:
+                sink.emit(BLIND, small_blind_agent.name, small_blind_agent.current_bet, (False, True))
 
         # Большой блайнд
         if big_blind_agent.money >= big_blind:
@@ -98,13 +165,15 @@ def betting_round(agents: List[RandomAgent], min_bet: int, current_bet: int, pot
             big_blind_agent.current_bet = big_blind
             pot += big_blind
             current_bet = big_blind
-            print(f"{big_blind_agent.name} поставил большой блайнд: {big_blind}")
+            if sink.enabled:
+                sink.emit(BLIND, big_blind_agent.name, big_blind, (True, False))
         else:
             pot += big_blind_agent.money
             big_blind_agent.current_bet = big_blind_agent.money
             big_blind_agent.money = 0
             current_bet = big_blind_agent.current_bet
-            print(f"{big_blind_agent.name} поставил всё (большой блайнд): {big_blind_agent.current_bet}")
+            if sink.enabled:
+                sink.emit(BLIND, big_blind_agent.name, big_blind_agent.current_bet, (True, True))
 
     # Игроки делают ходы начиная с игрока после большого блайнда
     pending_action = True
@@ -112,32 +181,33 @@ def betting_round(agents: List[RandomAgent], min_bet: int, current_bet: int, pot
     while pending_action:
         pending_action = False
         
-        for agent in agents:
-            if round_number == 0 and (agent == small_blind_agent or agent == big_blind_agent) and flag != 2:
+        for seat, agent in enumerate(agents):
+            if round_number == 0 and seat < 2 and flag != 2:
                 flag += 1
                 continue
-            if not agent.active:
+            if not table.active_mask >> seat & 1:
                 continue
 
-            # Проверка, остался ли только один активный игрок
-            if handle_one_player_left(agents, pot):
-                return pot, current_bet
+            # Если остался один активный игрок, раунд окончен; банк ему
+            # отдаёт manage_betting_rounds, иначе он получил бы его дважды.
+            if table.active_count == 1:
+                table.pot = pot
+                table.current_bet = current_bet
+                return
+            if skip_all_in and agent.money <= 0:
+                continue
 
             amount_to_call = current_bet - agent.current_bet
-            print(f"{agent.name}: нужно поставить {amount_to_call} для колла (текущая ставка: {current_bet}, текущая ставка агента: {agent.current_bet})")
+            if sink.enabled:
+                sink.emit(TO_CALL, agent.name, amount_to_call, (current_bet, agent.current_bet))
 
-            # Агент принимает решение
-            decision, amount = agent.make_decision(
-                community_cards=community_cards,
-                current_bet=current_bet,
-                pot=pot,
-                min_bet=min_bet,
-            )
+            decision, amount = yield agent, current_bet, pot
 
             # Обработка решения агента
             if decision == "fold":
-                agent.active = False
-                print(f"{agent.name} решил fold (ставка: 0, остаток: {agent.money})")
+                table.fold(seat)
+                if sink.enabled:
+                    sink.emit(FOLD, agent.name, 0, agent.money)
 
             elif decision == "call":
                 if amount_to_call > 0:
@@ -145,15 +215,19 @@ def betting_round(agents: List[RandomAgent], min_bet: int, current_bet: int, pot
                         agent.money -= amount_to_call
                         pot += amount_to_call
                         agent.current_bet += amount_to_call
-                        
-                        print(f"{agent.name} решил call (ставка: {agent.current_bet}, остаток: {agent.money})")
+
+                        if sink.enabled:
+                            sink.emit(CALL, agent.name, amount_to_call, (agent.current_bet, agent.money))
                     else:
-                        pot += agent.money
-                        agent.current_bet += agent.money
+                        all_in = agent.money
+                        pot += all_in
+                        agent.current_bet += all_in
                         agent.money = 0
-                        print(f"{agent.name} делает all-in (текущая ставка агента: {agent.current_bet}, остаток: 0)")
+                        if sink.enabled:
+                            sink.emit(ALL_IN, agent.name, all_in, agent.current_bet)
                 else:
-                    print(f"{agent.name} уже уравнял текущую ставку.")
+                    if sink.enabled:
+                        sink.emit(CALL, agent.name, 0, (agent.current_bet, agent.money))
 
             elif decision == "raise":
                 if amount + agent.current_bet > current_bet:
@@ -167,80 +241,306 @@ def betting_round(agents: List[RandomAgent], min_bet: int, current_bet: int, pot
                         agent.money -= raise_amount
                         pot += raise_amount
                         current_bet += raise_amount
-                        print(f"{agent.name} решил raise на {raise_amount} (текущая ставка агента: {agent.current_bet}, остаток: {agent.money})")
+                        if sink.enabled:
+                            sink.emit(RAISE, agent.name, raise_amount, (agent.current_bet, agent.money))
                         pending_action = True
                     else:
-                        print(f"{agent.name} не может сделать raise на {raise_amount}. Делает фолд.")
-                        agent.active = False
+                        if sink.enabled:
+                            sink.emit(INVALID_RAISE, agent.name, raise_amount, False)
+                        table.fold(seat)
                 else:
-                    print(f"{agent.name} не может сделать raise на меньшую сумму. Фолд.")
-                    agent.active = False
+                    if sink.enabled:
+                        sink.emit(INVALID_RAISE, agent.name, amount, True)
+                    table.fold(seat)
 
             elif decision == "check":
-                print(f"{agent.name} решил check (ставка: {agent.current_bet}, остаток: {agent.money})")
+                if sink.enabled:
+                    sink.emit(CHECK, agent.name, 0, (agent.current_bet, agent.money))
 
         # Проверка, уравняли ли все активные игроки текущую ставку
-        for agent in agents:
-            if agent.active and agent.current_bet < current_bet:
+        for seat, agent in enumerate(agents):
+            if table.active_mask >> seat & 1 and agent.current_bet < current_bet and not (skip_all_in and agent.money <= 0):
                 pending_action = True
                 break
 
-    return pot, current_bet
+    table.pot = pot
+    table.current_bet = current_bet
 
-def handle_one_player_left(agents: List[RandomAgent], pot: int) -> bool:
+def handle_one_player_left(table: TableState, sink: EventSink = PRINT_SINK) -> bool:
     """
     Завершает раздачу, если остался только один активный игрок.
 
     Args:
-        agents (List[RandomAgent]): Список всех агентов.
-        pot (int): Текущий банк.
+        table (TableState): Состояние стола.
+        sink (EventSink): Приёмник событий.
 
     Returns:
         bool: True, если раздача завершена, иначе False.
     """
-    active_agents = [agent for agent in agents if agent.active]
-    if len(active_agents) == 1:
-        winner = active_agents[0]
-        winner.money += pot
-        print(f"{winner.name} выиграл банк: {pot}!")
+    if table.active_count == 1:
+        winner = table.last_active()
+        winner.money += table.pot
+        if sink.enabled:
+            sink.emit(UNCONTESTED, winner.name, table.pot)
         return True
     return False
 
-def manage_betting_rounds(agents: List[RandomAgent], min_bet: int, game: PokerGame, small_blind: int, big_blind: int):
+# Что делать, когда торговля больше невозможна (фишки остались не больше
+# чем у одного активного игрока).
+RUNOUT_PLAY = 'play'  # раунды ставок идут как обычно: агенты ходят и с пустым стеком
+RUNOUT_DEAL = 'deal'  # оставшиеся общие карты сдаются сразу, затем шоудаун
+RUNOUT_EV = 'ev'      # банк делится по эквити all-in (перебор всех досок)
+RUNOUT_MODES = (RUNOUT_PLAY, RUNOUT_DEAL, RUNOUT_EV)
+
+
+def betting_closed(table: TableState) -> bool:
+    """Торговля невозможна: фишки остались не больше чем у одного активного игрока."""
+    mask = table.active_mask
+    with_chips = 0
+    for seat, agent in enumerate(table.seats):
+        if mask >> seat & 1 and agent.money > 0:
+            with_chips += 1
+            if with_chips > 1:
+                return False
+    return True
+
+
+def deal_runout(table: TableState, game: PokerGame, sink: EventSink = PRINT_SINK):
+    """Сдаёт все оставшиеся общие карты за один раз, как ривер."""
+    game.deal_community_cards(5 - len(game.community_cards))
+    table.street = 3
+    if sink.enabled:
+        sink.emit(STREET, None, table.pot, (3, list(game.community_cards)))
+
+
+def pot_layers(table: TableState) -> List[List]:
     """
-    Управляет раундами ставок в игре, включая повторное уравнивание ставок.
+    Делит банк на основной и побочные по вкладам игроков.
+
+    Вклад игрока за раздачу — agent.current_bet (ставка копится со всех
+    улиц). Каждый уровень вклада активного игрока открывает слой банка,
+    на который претендуют активные игроки, вложившие не меньше.
 
     Args:
-        agents (List[RandomAgent]): Список агентов.
-        min_bet (int): Минимальная ставка для входа в игру.
-        game (PokerGame): Игра.
-        small_blind (int): Размер малого блайнда.
-        big_blind (int): Размер большого блайнда.
+        table (TableState): Состояние стола.
+
+    Returns:
+        List[List]: Слои [сумма, индексы претендентов в table.active_seats()].
     """
-    current_bet = min_bet
-    pot = 0
+    seats = table.seats
+    mask = table.active_mask
+    active = [agent for seat, agent in enumerate(seats) if mask >> seat & 1]
+    layers = []
+    previous = 0
+    for level in sorted({agent.current_bet for agent in active}):
+        amount = sum(min(agent.current_bet, level) - min(agent.current_bet, previous) for agent in seats)
+        layers.append([amount, [index for index, agent in enumerate(active) if agent.current_bet >= level]])
+        previous = level
+    # Фишки сверх верхнего уровня (если банк не сходится со вкладами) — в последний слой.
+    layers[-1][0] += table.pot - sum(amount for amount, _ in layers)
+    return layers
+
+
+def split_pot(layers: List[List], scores: np.ndarray) -> List[int]:
+    """
+    Средний выигрыш активных игроков по доскам с учётом побочных банков.
+
+    На каждой доске слой делится поровну между лучшими руками среди его
+    претендентов. Доли округляются вниз, а оставшиеся фишки достаются
+    игрокам с наибольшей дробной частью (при равенстве — раньше сидящему).
+
+    Args:
+        layers (List[List]): Слои банка из pot_layers.
+        scores (np.ndarray): Оценки рук формы (R, M) — R досок, M активных игроков.
+
+    Returns:
+        List[int]: Выигрыш каждого активного игрока, в сумме весь банк.
+    """
+    exact = np.zeros(scores.shape[1])
+    for amount, eligible in layers:
+        contest = scores[:, eligible]
+        winners = contest == contest.max(axis=1, keepdims=True)
+        exact[eligible] += amount * (winners / winners.sum(axis=1, keepdims=True)).mean(axis=0)
+    exact = exact.tolist()
+    shares = [int(value + 1e-9) for value in exact]
+    order = sorted(range(len(shares)), key=lambda index: shares[index] - exact[index])
+    for index in order[:sum(amount for amount, _ in layers) - sum(shares)]:
+        shares[index] += 1
+    return shares
+
+
+def settle_showdown(table: TableState, game: PokerGame, sink: EventSink = PRINT_SINK):
+    """
+    Шоудаун по полной доске с побочными банками.
+
+    Нужен режимам RUNOUT_DEAL и RUNOUT_EV: в них игроки all-in не уравнивают
+    ставку, и банк сверх их вклада им не положен.
+    """
+    active = table.active_seats()
+    scores = []
+    for agent in active:
+        hand_score = evaluate_hand(agent.cards + game.community_cards)
+        scores.append(hand_score['score'])
+        if sink.enabled:
+            sink.emit(SHOWDOWN, agent.name, hand_score['score'],
+                      (hand_score['combination_name'], list(agent.cards)))
+    shares = split_pot(pot_layers(table), np.array([scores]))
+    for agent, share in zip(active, shares):
+        if share:
+            agent.money += share
+            if sink.enabled:
+                sink.emit(POT_AWARDED, agent.name, share, False)
+
+
+def settle_by_equity(table: TableState, game: PokerGame, max_boards: int = 20000, sink: EventSink = PRINT_SINK):
+    """
+    Делит банк между активными игроками по их эквити all-in.
+
+    Выигрыш усредняется по всем доскам из оставшихся карт
+    (equity.runout_boards), с учётом побочных банков; сброшенные карты
+    выбывших игроков в доски не попадают. Зерно случайных досок — одно
+    число из генератора колоды (game.deck.rng): одинаковые руки в разных
+    раздачах получают независимые выборки, а раздача с тем же сидом
+    делится так же.
+
+    Args:
+        table (TableState): Состояние стола.
+        game (PokerGame): Игра (общие карты).
+        max_boards (int): Предел точного перебора; на префлопе досок больше,
+            и берётся столько же случайных.
+        sink (EventSink): Приёмник событий.
+    """
+    seats = table.seats
+    mask = table.active_mask
+    active = table.active_seats()
+    dead = [card for seat, agent in enumerate(seats) if not mask >> seat & 1 for card in agent.cards]
+    known = [card for agent in active for card in agent.cards] + dead
+    # random() есть и у модуля random, и у random.Random, и у numpy Generator.
+    seed = int(game.deck.rng.random() * (1 << 53))
+    boards, _ = runout_boards(game.community_cards, known, max_boards, seed)
+    holes = np.array([[CARD_CODES[card] for card in agent.cards] for agent in active], dtype=np.int64)
+    shares = split_pot(pot_layers(table), evaluate_with_board(holes, boards))
+    pot = table.pot
+    for agent, share in zip(active, shares):
+        agent.money += share
+        if sink.enabled:
+            sink.emit(EQUITY_SHARE, agent.name, share, share / pot if pot else 0.0)
+
+def hand_steps(agents: List[RandomAgent], min_bet: int, game: PokerGame, small_blind: int, big_blind: int,
+               sink: EventSink = PRINT_SINK, runout: str = RUNOUT_PLAY, max_boards: int = 20000,
+               profile: bool = True):
+    """
+    Раздача целиком в виде генератора, без вызова агентов.
+
+    Улицы, события, выход при одном оставшемся игроке, режимы runout и
+    шоудаун описаны здесь один раз; решения запрашиваются так же, как в
+    betting_steps: генератор отдаёт (агент, текущая ставка, банк) и ждёт
+    через send пару (действие, сумма). manage_betting_rounds отвечает на
+    запросы через make_decision, асинхронный движок — по сети.
 
+    Параметры те же, что у manage_betting_rounds; profile=False отключает
+    замеры (асинхронному движку они ни к чему: между шагами идут другие столы).
+    """
+    profiling = profile and PROFILER.enabled and PROFILER.begin_hand()
+    if profiling:
+        hand_started = perf_counter()
+    table = game.table
+    table.start_hand(agents, game.community_cards, min_bet)
+    if sink.enabled:
+        sink.emit(HAND_START, None, 0, ([agent.name for agent in agents], [agent.money for agent in agents],
+                                        [list(agent.cards) for agent in agents]))
+
+    skip_all_in = runout != RUNOUT_PLAY
     for round_number in range(4):  # Префлоп, флоп, терн, ривер
-        print(f"\nРаунд ставок {round_number + 1}:")
-        if round_number == 0:
-            print("Префлоп")
-        elif round_number == 1:
+        table.street = round_number
+        if round_number == 1:
             game.deal_community_cards(3)  # Флоп
-        else:
+        elif round_number > 1:
             game.deal_community_cards(1)  # Терн и ривер
 
-        print(f"Общие карты: {game.community_cards}")
-        pot, current_bet = betting_round(agents, min_bet, current_bet, pot, game.community_cards, small_blind, big_blind, round_number)
+        if sink.enabled:
+            sink.emit(STREET, None, table.pot, (round_number, list(game.community_cards)))
+        if profiling:
+            started = perf_counter()
+            yield from betting_steps(table, min_bet, small_blind, big_blind, sink, skip_all_in)
+            PROFILER.record(BETTING_ROUND, perf_counter() - started)
+        else:
+            yield from betting_steps(table, min_bet, small_blind, big_blind, sink, skip_all_in)
 
         # Проверка, остался ли только один игрок
-        if handle_one_player_left(agents, pot):
+        if handle_one_player_left(table, sink):
+            if sink.enabled:
+                sink.emit(HAND_END, None, table.pot, ([agent.money for agent in agents], list(game.community_cards)))
+            if profiling:
+                PROFILER.hand_finished(perf_counter() - hand_started)
             return
 
+        # Ставить больше некому: оставшиеся раунды не нужны.
+        if skip_all_in and round_number < 3 and betting_closed(table):
+            if runout == RUNOUT_EV:
+                if sink.enabled:
+                    sink.emit(SHOWDOWN_START)
+                if profiling:
+                    started = perf_counter()
+                settle_by_equity(table, game, max_boards, sink)
+                if profiling:
+                    PROFILER.record(SHOWDOWN_PHASE, perf_counter() - started)
+                if sink.enabled:
+                    sink.emit(HAND_END, None, table.pot, ([agent.money for agent in agents], list(game.community_cards)))
+                if profiling:
+                    PROFILER.hand_finished(perf_counter() - hand_started)
+                return
+            deal_runout(table, game, sink)
+            break
+
     # Шоудаун, если осталось несколько игроков
-    active_agents = [agent for agent in agents if agent.active]
-    if len(active_agents) > 1:
-        print("Все дошли до шоудауна. Определяем победителя...")
-        winners = determine_winner(active_agents, game.community_cards)
-        distribute_pot(winners, pot)
+    if table.active_count > 1:
+        if sink.enabled:
+            sink.emit(SHOWDOWN_START)
+        if skip_all_in:
+            if profiling:
+                started = perf_counter()
+            settle_showdown(table, game, sink)
+            if profiling:
+                PROFILER.record(SHOWDOWN_PHASE, perf_counter() - started)
+        elif profiling:
+            started = perf_counter()
+            winners = determine_winner(table.active_seats(), game.community_cards, sink)
+            showdown_done = perf_counter()
+            distribute_pot(winners, table.pot, sink)
+            PROFILER.record(SHOWDOWN_PHASE, showdown_done - started)
+            PROFILER.record(POT, perf_counter() - showdown_done)
+        else:
+            winners = determine_winner(table.active_seats(), game.community_cards, sink)
+            distribute_pot(winners, table.pot, sink)
     else:
-        print("Игроков недостаточно для шоудауна. Игра завершена.")
\ No newline at end of file
+        if sink.enabled:
+            sink.emit(NO_SHOWDOWN)
+    if sink.enabled:
+        sink.emit(HAND_END, None, table.pot, ([agent.money for agent in agents], list(game.community_cards)))
+    if profiling:
+        PROFILER.hand_finished(perf_counter() - hand_started)
+
+def manage_betting_rounds(agents: List[RandomAgent], min_bet: int, game: PokerGame, small_blind: int, big_blind: int, sink: EventSink = PRINT_SINK,
+                          runout: str = RUNOUT_PLAY, max_boards: int = 20000):
+    """
+    Управляет раундами ставок в игре, включая повторное уравнивание ставок.
+
+    Правила раздачи — в hand_steps; здесь решения принимают сами агенты.
+
+    Args:
+        agents (List[RandomAgent]): Список агентов.
+        min_bet (int): Минимальная ставка для входа в игру.
+        game (PokerGame): Игра.
+        small_blind (int): Размер малого блайнда.
+        big_blind (int): Размер большого блайнда.
+        sink (EventSink): Приёмник событий; NULL_SINK отключает вывод.
+        runout (str): Что делать, если после раунда ставок торговля невозможна
+            (betting_closed): RUNOUT_PLAY — играть оставшиеся раунды как обычно,
+            RUNOUT_DEAL — сразу сдать доску и вскрыться, RUNOUT_EV — разделить
+            банк по эквити all-in. В двух последних режимах игроки all-in больше
+            не ходят, а банк делится с побочными банками (settle_showdown).
+        max_boards (int): Предел точного перебора досок для RUNOUT_EV.
+    """
+    play_steps(hand_steps(agents, min_bet, game, small_blind, big_blind, sink, runout, max_boards),
+               game.table, min_bet)
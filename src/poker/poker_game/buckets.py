@@ -0,0 +1,445 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .equity import Card, _to_codes
+from .equity_tables import NUM_CLASSES, _class_representative
+from .hand_evaluation import evaluate_hands_batch
+
+# Формат файла корзин одной улицы (little-endian):
+#   заголовок: magic "PKBK", версия, карт на доске, число корзин K, число
+#   признаков F, log2 размера хэш-таблицы, число рук, резерв (8 x uint32);
+#   float32[K, F] — центры корзин (по возрастанию EHS);
+#   int64[2^bits] — канонические ключи рук, -1 в пустых ячейках;
+#   uint8[2^bits] — корзина руки в той же ячейке.
+MAGIC = b'PKBK'
+VERSION = 1
+HEADER_SIZE = 32
+MAX_BUCKETS = 256
+
+STREETS = {'preflop': 0, 'flop': 3, 'turn': 4, 'river': 5}
+# Признаки руки: текущая сила, сила к риверу, положительный и отрицательный потенциал.
+FEATURES = ['hs', 'ehs', 'ppot', 'npot']
+
+# Хэш Фибоначчи: старшие биты произведения ключа на 2^64 / phi.
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+_loaded: Dict[str, 'BucketTables'] = {}
+
+
+def canonical_key(hole_cards: List[Card], board: List[Card]) -> int:
+    """
+    Ключ руки и доски, не зависящий от перестановки мастей.
+
+    Коды карт после utils.canonical_cards в системе счисления с основанием
+    52 (для флопа совпадает с equity_tables.canonical_flop_key). Порядок
+    мастей считается по маскам рангов, как в canonical_keys, — это в
+    несколько раз быстрее кортежей подписей в canonical_cards.
+    """
+    hole, board = _to_codes(hole_cards), _to_codes(board)
+    signatures = [0, 0, 0, 0]
+    for code in hole:
+        signatures[code & 3] |= 1 << ((code >> 2) + 13)
+    for code in board:
+        signatures[code & 3] |= 1 << (code >> 2)
+    mapping = [0] * 4
+    for new_suit, suit in enumerate(sorted(range(4), key=lambda suit: signatures[suit] * 4 + suit, reverse=True)):
+        mapping[suit] = new_suit
+
+    key = 0
+    for group in (hole, board):
+        for code in sorted(((code & ~3) | mapping[code & 3] for code in group), reverse=True):
+            key = key * 52 + code
+    return key
+
+
+def canonical_keys(holes: np.ndarray, boards: np.ndarray) -> np.ndarray:
+    """
+    Векторная версия canonical_key.
+
+    Масти упорядочиваются так же, как в canonical_cards: подпись масти —
+    маски рангов этой масти на руке и на доске. Лексикографический порядок
+    убывающих списков рангов совпадает с порядком масок как чисел.
+
+    Args:
+        holes (np.ndarray): Карты на руках, форма (N, 2).
+        boards (np.ndarray): Общие карты, форма (N, 0..5).
+
+    Returns:
+        np.ndarray: Ключи int64 длины N.
+    """
+    holes = np.asarray(holes, dtype=np.int64)
+    boards = np.asarray(boards, dtype=np.int64).reshape(len(holes), -1)
+    rows = np.arange(len(holes))[:, None]
+
+    signatures = np.zeros((len(holes), 4), dtype=np.int64)
+    for cards, shift in ((holes, 13), (boards, 0)):
+        for column in range(cards.shape[1]):
+            codes = cards[:, column]
+            signatures[rows[:, 0], codes & 3] |= 1 << ((codes >> 2) + shift)
+    # Как в canonical_cards: сортировка (подпись, масть) по убыванию.
+    order = np.argsort(-(signatures * 4 + np.arange(4)), axis=1)
+    mapping = np.argsort(order, axis=1)
+
+    key = np.zeros(len(holes), dtype=np.int64)
+    for cards in (holes, boards):
+        canonical = -np.sort(-((cards & ~3) | mapping[rows, cards & 3]), axis=1)
+        for column in range(cards.shape[1]):
+            key = key * 52 + canonical[:, column]
+    return key
+
+
+def _slots(keys: np.ndarray, bits: int) -> np.ndarray:
+    product = keys.astype(np.uint64) * np.uint64(_HASH_MULTIPLIER)
+    return (product >> np.uint64(64 - bits)).astype(np.int64)
+
+
+def _sample_distinct(rng: np.random.Generator, count: int, population: int, size: int) -> np.ndarray:
+    """Индексы без повторов внутри строки: форма (count, size), значения < population."""
+    result = rng.integers(0, population, size=(count, size))
+    while True:
+        ordered = np.sort(result, axis=1)
+        repeated = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+        if not len(repeated):
+            return result
+        result[repeated] = rng.integers(0, population, size=(len(repeated), size))
+
+
+def hand_features(hole: Sequence[int], boards: np.ndarray, samples: int,
+                  rng: np.random.Generator) -> np.ndarray:
+    """
+    Признаки руки на каждой из досок против случайной руки соперника.
+
+    Для каждой доски разыгрывается `samples` пар (рука соперника, докрутка
+    до ривера). hs — доля выигрышей сейчас (ничья за половину), ehs — то же
+    на ривере, ppot — доля ставших впереди среди отстающих сейчас, npot —
+    доля отставших среди лидирующих. На префлопе текущая сила не
+    определена: hs = ehs и потенциалы нулевые; на ривере потенциалы нулевые.
+
+    Args:
+        hole (Sequence[int]): Две карты на руках.
+        boards (np.ndarray): Доски одного размера, форма (N, 0..5).
+        samples (int): Раскладов на доску.
+        rng (np.random.Generator): Генератор случайных чисел.
+
+    Returns:
+        np.ndarray: float32 формы (N, 4) в порядке FEATURES.
+    """
+    boards = np.asarray(boards, dtype=np.int64)
+    count, board_size = boards.shape
+    missing = 5 - board_size
+
+    known = np.zeros((count, 52), dtype=bool)
+    known[:, list(hole)] = True
+    known[np.arange(count)[:, None], boards] = True
+    remaining = np.nonzero(~known)[1].reshape(count, 52 - 2 - board_size)
+
+    picks = _sample_distinct(rng, count * samples, remaining.shape[1], 2 + missing)
+    dealt = np.take_along_axis(np.repeat(remaining, samples, axis=0), picks, axis=1)
+    board_rows = np.repeat(boards, samples, axis=0)
+    hero_hole = np.broadcast_to(np.array(hole, dtype=np.int64), (len(dealt), 2))
+    final_board = np.hstack([board_rows, dealt[:, 2:]])
+
+    hero_final = evaluate_hands_batch(np.hstack([hero_hole, final_board]))
+    villain_final = evaluate_hands_batch(np.hstack([dealt[:, :2], final_board]))
+    final = (np.sign(hero_final.astype(np.int64) - villain_final) + 1).reshape(count, samples)
+
+    features = np.zeros((count, len(FEATURES)), dtype=np.float32)
+    features[:, 1] = final.mean(axis=1) / 2
+    if board_size == 0:
+        features[:, 0] = features[:, 1]
+        return features
+    if missing == 0:
+        now = final
+    else:
+        hero_now = evaluate_hands_batch(np.hstack([hero_hole, board_rows]))
+        villain_now = evaluate_hands_batch(np.hstack([dealt[:, :2], board_rows]))
+        now = (np.sign(hero_now.astype(np.int64) - villain_now) + 1).reshape(count, samples)
+    # 0 — позади, 1 — ничья, 2 — впереди.
+    features[:, 0] = now.mean(axis=1) / 2
+    behind, ahead = now == 0, now == 2
+    features[:, 2] = (behind & (final == 2)).sum(axis=1) / np.maximum(behind.sum(axis=1), 1)
+    features[:, 3] = (ahead & (final == 0)).sum(axis=1) / np.maximum(ahead.sum(axis=1), 1)
+    return features
+
+
+def _class_path(work: str, street: str, index: int) -> str:
+    return os.path.join(work, street, f'class_{index:03d}.npz')
+
+
+def _class_task(work: str, street: str, index: int, samples: int, seed: Optional[int], chunk_size: int) -> int:
+    """
+    Задача пула: канонические руки одного префлоп-класса на улице и их признаки.
+
+    Результат пишется в отдельный файл, поэтому прерванную сборку можно
+    продолжить с первого непосчитанного класса.
+
+    Returns:
+        int: Число канонических рук класса.
+    """
+    path = _class_path(work, street, index)
+    if os.path.exists(path):
+        with np.load(path) as data:
+            return len(data['keys'])
+
+    hole = _class_representative(index)
+    rest = [code for code in range(52) if code not in hole]
+    board_size = STREETS[street]
+    boards = list(combinations(rest, board_size))
+    boards = np.array(boards, dtype=np.int64).reshape(len(boards), board_size)
+    keys, first = np.unique(canonical_keys(np.tile(hole, (len(boards), 1)), boards), return_index=True)
+    boards = boards[first]
+
+    rng = np.random.default_rng(None if seed is None else [seed, board_size, index])
+    features = np.concatenate([
+        hand_features(hole, boards[start:start + chunk_size], samples, rng)
+        for start in range(0, len(boards), chunk_size)
+    ])
+    tmp_path = path + '.tmp.npz'
+    np.savez(tmp_path, keys=keys, features=features)
+    os.replace(tmp_path, path)
+    return len(keys)
+
+
+def _kmeans(points: np.ndarray, clusters: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    """k-means (инициализация k-means++) — центры формы (clusters, F)."""
+    centers = [points[rng.integers(len(points))]]
+    distances = ((points - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, clusters):
+        total = distances.sum()
+        index = rng.choice(len(points), p=distances / total) if total > 0 else rng.integers(len(points))
+        centers.append(points[index])
+        distances = np.minimum(distances, ((points - points[index]) ** 2).sum(axis=1))
+    centers = np.array(centers)
+
+    for _ in range(iterations):
+        labels = _nearest(points, centers)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, points)
+        sizes = np.bincount(labels, minlength=clusters)
+        moved = np.where(sizes[:, None] > 0, sums / np.maximum(sizes, 1)[:, None], centers)
+        if np.allclose(moved, centers):
+            break
+        centers = moved
+    return centers
+
+
+def _nearest(points: np.ndarray, centers: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+    labels = np.empty(len(points), dtype=np.int64)
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start + chunk_size]
+        distances = ((chunk[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        labels[start:start + len(chunk)] = distances.argmin(axis=1)
+    return labels
+
+
+def _write_street(path: str, board_size: int, keys: np.ndarray, buckets: np.ndarray, centers: np.ndarray):
+    """Строит хэш-таблицу с линейным пробированием (заполнение не выше 1/2) и пишет файл."""
+    bits = max(int(2 * len(keys) - 1).bit_length(), 1)
+    size = 1 << bits
+    table_keys = np.full(size, -1, dtype='<i8')
+    table_buckets = np.zeros(size, dtype=np.uint8)
+
+    pending = np.arange(len(keys))
+    slots = _slots(keys, bits)
+    while len(pending):
+        targets = slots[pending]
+        free = table_keys[targets] < 0
+        # В свободную ячейку попадает первый из претендентов, остальные идут дальше.
+        placed_slots, first = np.unique(targets[free], return_index=True)
+        winners = pending[free][first]
+        table_keys[placed_slots] = keys[winners]
+        table_buckets[placed_slots] = buckets[winners]
+        placed = np.zeros(len(keys), dtype=bool)
+        placed[winners] = True
+        pending = pending[~placed[pending]]
+        slots[pending] = (slots[pending] + 1) & (size - 1)
+
+    header = np.array([int.from_bytes(MAGIC, 'little'), VERSION, board_size, len(centers),
+                       centers.shape[1], bits, len(keys), 0], dtype='<u4')
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(header.tobytes())
+        file.write(centers.astype('<f4').tobytes())
+        file.write(table_keys.tobytes())
+        file.write(table_buckets.tobytes())
+    os.replace(tmp_path, path)
+
+
+def street_path(directory: str, street: str) -> str:
+    return os.path.join(directory, f'{street}.bkt')
+
+
+def build_buckets(directory: str, streets: Iterable[str] = ('preflop', 'flop', 'turn', 'river'),
+                  num_buckets: Union[int, Dict[str, int]] = 50, samples: int = 200,
+                  processes: Optional[int] = None, seed: Optional[int] = None, chunk_size: int = 4096,
+                  kmeans_sample: int = 200000, kmeans_iterations: int = 50):
+    """
+    Строит корзины рук по улицам и записывает их в `directory`.
+
+    Для каждой улицы перебираются все изоморфные по мастям руки (по
+    представителю каждого префлоп-класса и все доски к нему), считаются
+    признаки hand_features и группируются k-means в K корзин, пронумерованных
+    по возрастанию EHS. Признаки каждого класса сохраняются в
+    directory/work, готовые улицы пропускаются — прерванную сборку можно
+    запустить ещё раз с теми же параметрами.
+
+    Число рук: префлоп 169, флоп 1 286 792, терн 13 960 050, ривер 123 156 254;
+    ривер требует нескольких гигабайт памяти на сборку и файл ~2.4 ГБ.
+
+    Args:
+        directory (str): Каталог результата.
+        streets (Iterable[str]): Какие улицы строить.
+        num_buckets (int | Dict[str, int]): K для всех улиц или по улицам (не больше 256).
+        samples (int): Раскладов на руку для признаков.
+        processes (int): Число рабочих процессов (по умолчанию — все ядра).
+        seed (int): Зерно; у каждого класса собственный поток, так что
+            результат не зависит от порядка задач.
+        chunk_size (int): Рук в одном векторном расчёте признаков.
+        kmeans_sample (int): Сколько рук брать для подбора центров.
+        kmeans_iterations (int): Максимум итераций k-means.
+    """
+    processes = processes or os.cpu_count() or 1
+    work = os.path.join(directory, 'work')
+    for street in streets:
+        if street not in STREETS:
+            raise ValueError(f"Неизвестная улица: {street!r}")
+        clusters = num_buckets[street] if isinstance(num_buckets, dict) else num_buckets
+        if not 1 <= clusters <= MAX_BUCKETS:
+            raise ValueError(f"Число корзин должно быть от 1 до {MAX_BUCKETS}.")
+        path = street_path(directory, street)
+        if os.path.exists(path):
+            continue
+        os.makedirs(os.path.join(work, street), exist_ok=True)
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            list(executor.map(_class_task, [work] * NUM_CLASSES, [street] * NUM_CLASSES, range(NUM_CLASSES),
+                              [samples] * NUM_CLASSES, [seed] * NUM_CLASSES, [chunk_size] * NUM_CLASSES))
+
+        keys, features = [], []
+        for index in range(NUM_CLASSES):
+            with np.load(_class_path(work, street, index)) as data:
+                keys.append(data['keys'])
+                features.append(data['features'])
+        keys = np.concatenate(keys)
+        features = np.concatenate(features)
+
+        rng = np.random.default_rng(None if seed is None else [seed, STREETS[street]])
+        if len(features) <= clusters:
+            centers = features
+        else:
+            sample = features[rng.choice(len(features), min(kmeans_sample, len(features)), replace=False)]
+            centers = _kmeans(sample.astype(np.float64), clusters, kmeans_iterations, rng)
+        centers = centers[np.argsort(centers[:, FEATURES.index('ehs')], kind='stable')]
+        buckets = _nearest(features, centers)
+        _write_street(path, STREETS[street], keys, buckets, centers)
+
+
+class _StreetTable:
+    __slots__ = ('board_size', 'num_buckets', 'centers', 'keys', 'buckets', 'bits', 'mask', 'size')
+
+    def __init__(self, path: str):
+        header = np.fromfile(path, dtype='<u4', count=8)
+        if header.size != 8 or header[0] != int.from_bytes(MAGIC, 'little'):
+            raise ValueError(f"{path} не является файлом корзин.")
+        if header[1] != VERSION:
+            raise ValueError(f"Неподдерживаемая версия файла корзин: {header[1]}.")
+        self.board_size, self.num_buckets, num_features, self.bits, self.size = (int(value) for value in header[2:7])
+        table_size = 1 << self.bits
+        self.mask = table_size - 1
+
+        offset = HEADER_SIZE
+        self.centers = np.memmap(path, dtype='<f4', mode='r', offset=offset, shape=(self.num_buckets, num_features))
+        offset += self.num_buckets * num_features * 4
+        # Обычные представления буфера: индексация memmap заметно дороже.
+        self.keys = np.asarray(np.memmap(path, dtype='<i8', mode='r', offset=offset, shape=(table_size,)))
+        offset += table_size * 8
+        self.buckets = np.asarray(np.memmap(path, dtype=np.uint8, mode='r', offset=offset, shape=(table_size,)))
+
+    def lookup(self, key: int) -> int:
+        slot = ((key * _HASH_MULTIPLIER) & _MASK64) >> (64 - self.bits)
+        keys = self.keys
+        while True:
+            found = keys[slot]
+            if found == key:
+                return int(self.buckets[slot])
+            if found < 0:
+                raise KeyError(key)
+            slot = (slot + 1) & self.mask
+
+
+class BucketTables:
+    def __init__(self, directory: str):
+        """
+        Корзины рук из файлов build_buckets, отображённых в память.
+
+        Поиск — каноникализация мастей и несколько обращений к хэш-таблице,
+        поэтому его можно звать прямо из make_decision. Объект подходит как
+        абстракция карт для cfr.GameAbstraction (атрибут num_buckets и метод
+        bucket); при передаче в другой процесс файлы открываются заново.
+        """
+        self.directory = directory
+        self._open()
+
+    def _open(self):
+        self.streets = {}
+        for street, board_size in STREETS.items():
+            path = street_path(self.directory, street)
+            if os.path.exists(path):
+                self.streets[board_size] = _StreetTable(path)
+        if not self.streets:
+            raise ValueError(f"В {self.directory} нет файлов корзин.")
+        self.num_buckets = max(table.num_buckets for table in self.streets.values())
+
+    def bucket(self, hole_cards: List[Card], board: List[Card]) -> int:
+        """
+        Корзина руки; улица определяется числом карт на доске.
+
+        Returns:
+            int: Номер корзины (больше — сильнее в среднем).
+        """
+        table = self.streets.get(len(board))
+        if table is None:
+            raise ValueError(f"Корзины для доски из {len(board)} карт не построены.")
+        return table.lookup(canonical_key(hole_cards, board))
+
+    def centers(self, street: str) -> np.ndarray:
+        """Центры корзин улицы в порядке FEATURES."""
+        return np.array(self.streets[STREETS[street]].centers)
+
+    def __getstate__(self):
+        return {'directory': self.directory}
+
+    def __setstate__(self, state):
+        self.directory = state['directory']
+        self._open()
+
+    def __repr__(self):
+        return f"BucketTables(directory={self.directory!r}, num_buckets={self.num_buckets})"
+
+
+def load_buckets(directory: str) -> BucketTables:
+    """Загружает корзины один раз на процесс и возвращает общий экземпляр."""
+    directory = os.path.abspath(directory)
+    tables = _loaded.get(directory)
+    if tables is None:
+        tables = _loaded[directory] = BucketTables(directory)
+    return tables
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Построение корзин рук по силе и потенциалу.")
+    parser.add_argument("directory")
+    parser.add_argument("--streets", nargs="+", default=list(STREETS), choices=list(STREETS))
+    parser.add_argument("--buckets", type=int, default=50)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    build_buckets(args.directory, args.streets, args.buckets, args.samples,
+                  processes=args.processes, seed=args.seed)
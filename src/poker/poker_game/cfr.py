@@ -0,0 +1,414 @@
+import argparse
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.hand_evaluation import IncrementalEvaluator, evaluate_cards, hand_category
+from src.poker.poker_game.ranges import COMBO_CLASS, COMBO_INDEX, preflop_order
+from src.poker.poker_game.utils import cards_to_ints
+
+# Действия абстрактной игры.
+FOLD = 0
+CALL = 1   # чек или колл
+RAISE = 2
+NUM_ACTIONS = 3
+ACTIONS = range(NUM_ACTIONS)
+
+# Уровни суммы колла (log2 в минимальных ставках) и размера банка (log2 в больших блайндах).
+CALL_LEVELS = 8
+POT_LEVELS = 8
+BOARD_STREETS = {0: 0, 3: 1, 4: 2, 5: 3}
+
+META_FILE = 'meta.json'
+REGRET_FILE = 'regret.npy'
+STRATEGY_FILE = 'strategy.npy'
+
+
+class StrengthAbstraction:
+    def __init__(self, preflop_buckets: int = 10):
+        """
+        Простая абстракция карт.
+
+        Префлоп: классы стартовых рук по ranges.preflop_order, разбитые на
+        `preflop_buckets` равных групп. После флопа: категория лучшей
+        комбинации и признак сильного дро (флеш-дро или двусторонний
+        стрит-дро) — 18 корзин.
+        """
+        self.preflop_buckets = preflop_buckets
+        self.num_buckets = max(preflop_buckets, 18)
+        self._class_bucket = None
+
+    def bucket(self, hole: Sequence[int], board: Sequence[int]) -> int:
+        """Корзина руки; раунд ставок определяется числом карт на доске."""
+        if not board:
+            if self._class_bucket is None:
+                order = preflop_order()
+                ranks = np.empty(len(order), dtype=np.int64)
+                ranks[order] = np.arange(len(order))
+                self._class_bucket = ranks * self.preflop_buckets // len(ranks)
+            return int(self._class_bucket[COMBO_CLASS[COMBO_INDEX[hole[0], hole[1]]]])
+        category = hand_category(evaluate_cards(list(hole) + list(board)))
+        drawing = 0
+        if len(board) < 5:
+            draws = IncrementalEvaluator(list(hole) + list(board)).draws()
+            drawing = int(draws['flush_draw'] is not None or draws['straight_draw'] == 'open-ended')
+        return category * 2 + drawing
+
+
+class GameAbstraction:
+    def __init__(self, stack: int = 1000, small_blind: int = 10, big_blind: int = 20, min_bet: int = 10,
+                 raise_extra: Optional[int] = None, cards: Optional[StrengthAbstraction] = None):
+        """
+        Абстракция игры хедз-ап для обучения.
+
+        Торговля повторяет betting_steps: ставки копятся за всю раздачу,
+        проходы по местам повторяются, пока кто-то рейзит или не уравнял
+        ставку, рейз на сумму amount поднимает текущую ставку на amount (и
+        требует money >= amount + текущая ставка), а игрок без фишек не
+        торгуется — чекает или, если ставка не уравнена, сбрасывает карты,
+        как CFRAgent. Первым на каждой улице ходит малый блайнд.
+
+        Действия — фолд, чек/колл и рейз одного размера: текущая ставка плюс
+        `raise_extra`, то есть примерно удвоение, как у RandomAgent. Инфосет —
+        улица, корзина карт, уровень суммы колла и уровень банка: те же
+        признаки агент видит в make_decision, поэтому стратегия переносится
+        в игру без истории действий.
+
+        Args:
+            stack (int): Стек каждого игрока.
+            small_blind (int): Малый блайнд.
+            big_blind (int): Большой блайнд.
+            min_bet (int): Минимальная ставка (единица уровня колла).
+            raise_extra (int): Надбавка рейза к текущей ставке (по умолчанию min_bet).
+            cards: Абстракция карт с атрибутом num_buckets и методом bucket.
+        """
+        self.stack = stack
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.min_bet = min_bet
+        self.raise_extra = min_bet if raise_extra is None else raise_extra
+        self.cards = cards if cards is not None else StrengthAbstraction()
+        self.num_infosets = 4 * self.cards.num_buckets * CALL_LEVELS * POT_LEVELS
+
+    def infoset(self, street: int, bucket: int, to_call: int, pot: int) -> int:
+        """Номер инфосета: смешанная система счисления по признакам, без коллизий."""
+        call_level = min(max(to_call // self.min_bet, 0).bit_length(), CALL_LEVELS - 1)
+        pot_level = min(max(pot // self.big_blind, 1).bit_length() - 1, POT_LEVELS - 1)
+        return ((street * self.cards.num_buckets + bucket) * CALL_LEVELS + call_level) * POT_LEVELS + pot_level
+
+    def raise_amount(self, current_bet: int) -> int:
+        """Сумма рейза в смысле make_decision."""
+        return current_bet + self.raise_extra
+
+    def legal_actions(self, to_call: int, current_bet: int, money: int) -> Tuple[bool, bool, bool]:
+        """
+        Допустимые действия (фолд, чек/колл, рейз).
+
+        Колл на все фишки меньше ставки не допускается: такой игрок остаётся
+        неуравнявшим и на следующем проходе сбрасывает карты, то есть теряет
+        больше, чем при фолде.
+        """
+        return to_call > 0, to_call <= money, money >= self.raise_amount(current_bet) + current_bet
+
+    def describe(self) -> Dict:
+        return {
+            'stack': self.stack, 'small_blind': self.small_blind, 'big_blind': self.big_blind,
+            'min_bet': self.min_bet, 'raise_extra': self.raise_extra,
+            'card_abstraction': type(self.cards).__name__, 'num_buckets': self.cards.num_buckets,
+            'num_infosets': self.num_infosets,
+        }
+
+
+def regret_matching(regrets: Sequence[float], legal: Sequence[bool]) -> List[float]:
+    """Стратегия, пропорциональная положительным сожалениям (равномерная, если их нет)."""
+    positive = [regret if allowed and regret > 0 else 0.0 for regret, allowed in zip(regrets, legal)]
+    total = sum(positive)
+    if total > 0:
+        return [value / total for value in positive]
+    count = sum(legal)
+    return [1.0 / count if allowed else 0.0 for allowed in legal]
+
+
+class _Deal:
+    __slots__ = ('buckets', 'winner')
+
+    def __init__(self, game: GameAbstraction, rng: random.Random):
+        """Сдача для одной итерации: корзины игроков по улицам и исход шоудауна."""
+        cards = rng.sample(range(52), 9)
+        holes = (cards[0:2], cards[2:4])
+        board = cards[4:]
+        self.buckets = [[game.cards.bucket(hole, board[:size]) for size in (0, 3, 4, 5)] for hole in holes]
+        scores = [evaluate_cards(hole + board) for hole in holes]
+        self.winner = 0 if scores[0] > scores[1] else 1 if scores[1] > scores[0] else -1
+
+
+class _Trainer:
+    def __init__(self, game: GameAbstraction, regret: np.ndarray, strategy: np.ndarray, rng: random.Random):
+        self.game = game
+        # Обычные представления того же буфера: у memmap заметные накладные
+        # расходы на каждую индексацию.
+        self.regret = np.asarray(regret)
+        self.strategy = np.asarray(strategy)
+        self.rng = rng
+        self.deal = None
+
+    def iterate(self):
+        """Одна итерация MCCFR с внешней выборкой: по обходу за каждого игрока."""
+        game = self.game
+        self.deal = _Deal(game, self.rng)
+        for traverser in (0, 1):
+            # Малый блайнд — игрок 0, большой — игрок 1; на префлопе первый
+            # проход блайнды пропускают, и торговлю открывает малый блайнд.
+            self._traverse(traverser, 0, 0, [game.small_blind, game.big_blind], game.big_blind, False)
+
+    def _traverse(self, traverser: int, street: int, player: int, bets: List[int], current_bet: int,
+                  raised: bool) -> float:
+        game = self.game
+        to_call = current_bet - bets[player]
+        money = game.stack - bets[player]
+        if money <= 0:
+            # Без фишек игрок не торгуется (см. CFRAgent.make_decision).
+            action = CALL if to_call <= 0 else FOLD
+            return self._child(traverser, street, player, bets, current_bet, raised, action)
+
+        key = game.infoset(street, self.deal.buckets[player][street], to_call, bets[0] + bets[1])
+        legal = game.legal_actions(to_call, current_bet, money)
+        regret = self.regret[key]
+        strategy = regret_matching(regret.tolist(), legal)
+
+        if player == traverser:
+            values = [0.0] * NUM_ACTIONS
+            value = 0.0
+            for action in range(NUM_ACTIONS):
+                if legal[action]:
+                    values[action] = self._child(traverser, street, player, bets, current_bet, raised, action)
+                    value += strategy[action] * values[action]
+            regret += [values[action] - value if legal[action] else 0.0 for action in range(NUM_ACTIONS)]
+            return value
+
+        self.strategy[key] += strategy
+        action = self.rng.choices(ACTIONS, weights=strategy)[0]
+        return self._child(traverser, street, player, bets, current_bet, raised, action)
+
+    def _child(self, traverser: int, street: int, player: int, bets: List[int], current_bet: int,
+               raised: bool, action: int) -> float:
+        if action == FOLD:
+            # Сфолдивший теряет свой вклад в банк.
+            return -bets[traverser] if player == traverser else bets[1 - traverser]
+        bets = list(bets)
+        if action == RAISE:
+            # Как в betting_steps: текущая ставка и ставка игрока растут на amount.
+            amount = self.game.raise_amount(current_bet)
+            if bets[player] == 0:
+                bets[player] = current_bet
+            bets[player] += amount
+            current_bet += amount
+            raised = True
+        else:
+            bets[player] = max(bets[player], current_bet)
+        if player == 0:
+            return self._traverse(traverser, street, 1, bets, current_bet, raised)
+        # Конец прохода: новый проход, если был рейз или кто-то не уравнял ставку.
+        if raised or bets[0] < current_bet or bets[1] < current_bet:
+            return self._traverse(traverser, street, 0, bets, current_bet, False)
+        if street == 3:
+            winner = self.deal.winner
+            if winner < 0:
+                return 0.0
+            return bets[1 - traverser] if winner == traverser else -bets[traverser]
+        return self._traverse(traverser, street + 1, 0, bets, current_bet, False)
+
+
+def _open_tables(directory: str, game: GameAbstraction, mode: str):
+    from numpy.lib.format import open_memmap
+    shape = (game.num_infosets, NUM_ACTIONS)
+    tables = []
+    for name in (REGRET_FILE, STRATEGY_FILE):
+        path = os.path.join(directory, name)
+        if mode == 'w+':
+            tables.append(open_memmap(path, mode='w+', dtype=np.float64, shape=shape))
+        else:
+            table = open_memmap(path, mode=mode)
+            if table.shape != shape:
+                raise ValueError(f"{path}: таблица не соответствует абстракции игры.")
+            tables.append(table)
+    return tables
+
+
+def _train_batch(directory: str, game: GameAbstraction, iterations: int, seed) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Задача рабочего процесса: обучается на копии общих таблиц и возвращает
+    приращения сожалений и сумм стратегии, которые родитель добавляет в файлы.
+    """
+    regret_file, strategy_file = _open_tables(directory, game, 'r')
+    regret = np.array(regret_file)
+    strategy = np.zeros_like(regret)
+    start = regret.copy()
+    trainer = _Trainer(game, regret, strategy, random.Random(seed))
+    for _ in range(iterations):
+        trainer.iterate()
+    return regret - start, strategy
+
+
+class CFRTrainer:
+    def __init__(self, directory: str, game: Optional[GameAbstraction] = None):
+        """
+        Обучение MCCFR с внешней выборкой и контрольными точками на диске.
+
+        Сожаления и суммы стратегии лежат в файлах .npy, отображённых в
+        память (массивы float64 формы (число инфосетов, 3)); если в
+        каталоге уже есть таблицы, обучение продолжается с них.
+
+        Args:
+            directory (str): Каталог контрольной точки.
+            game (GameAbstraction): Абстракция игры (должна совпадать при продолжении).
+        """
+        self.directory = directory
+        self.game = game if game is not None else GameAbstraction()
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding='utf-8') as file:
+                self.meta = json.load(file)
+            self.regret, self.strategy = _open_tables(directory, self.game, 'r+')
+        else:
+            self.meta = {'iterations': 0, 'game': self.game.describe()}
+            self.regret, self.strategy = _open_tables(directory, self.game, 'w+')
+            self.checkpoint()
+
+    @property
+    def iterations(self) -> int:
+        return self.meta['iterations']
+
+    def train(self, iterations: int, processes: int = 1, batch_size: int = 1000, seed: Optional[int] = None,
+              checkpoint_every: int = 10000):
+        """
+        Проводит `iterations` итераций.
+
+        В одном процессе итерации пишут прямо в отображённые таблицы. С
+        несколькими процессами каждая задача из `batch_size` итераций
+        стартует с текущих общих таблиц, а её приращения складываются в
+        них по мере готовности.
+
+        Args:
+            iterations (int): Число итераций.
+            processes (int): Число рабочих процессов.
+            batch_size (int): Итераций в одной задаче.
+            seed (int): Зерно; задачи получают независимые потоки.
+            checkpoint_every (int): Как часто сбрасывать таблицы на диск.
+        """
+        seeds = np.random.SeedSequence(seed)
+        since_checkpoint = 0
+        if processes <= 1:
+            trainer = _Trainer(self.game, self.regret, self.strategy,
+                               random.Random(int(seeds.generate_state(1)[0])))
+            for _ in range(iterations):
+                trainer.iterate()
+                self.meta['iterations'] += 1
+                since_checkpoint += 1
+                if since_checkpoint >= checkpoint_every:
+                    self.checkpoint()
+                    since_checkpoint = 0
+        else:
+            self.checkpoint()
+            sizes = [min(batch_size, iterations - start) for start in range(0, iterations, batch_size)]
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                futures = [executor.submit(_train_batch, self.directory, self.game, size,
+                                           int(child.generate_state(1)[0]))
+                           for size, child in zip(sizes, seeds.spawn(len(sizes)))]
+                for size, future in zip(sizes, futures):
+                    regret_delta, strategy_delta = future.result()
+                    self.regret += regret_delta
+                    self.strategy += strategy_delta
+                    self.meta['iterations'] += size
+                    since_checkpoint += size
+                    if since_checkpoint >= checkpoint_every:
+                        self.checkpoint()
+                        since_checkpoint = 0
+        self.checkpoint()
+
+    def checkpoint(self):
+        """Сбрасывает таблицы и метаданные на диск."""
+        self.regret.flush()
+        self.strategy.flush()
+        path = os.path.join(self.directory, META_FILE)
+        with open(path + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump(self.meta, file, ensure_ascii=False, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def policy(self) -> 'CFRPolicy':
+        return CFRPolicy(self.directory, self.game)
+
+
+class CFRPolicy:
+    def __init__(self, directory: str, game: Optional[GameAbstraction] = None):
+        """Средняя стратегия из контрольной точки (таблица открывается только для чтения)."""
+        self.game = game if game is not None else GameAbstraction()
+        _, self.strategy = _open_tables(directory, self.game, 'r')
+
+    def action_probabilities(self, street: int, bucket: int, to_call: int, pot: int) -> np.ndarray:
+        total = np.array(self.strategy[self.game.infoset(street, bucket, to_call, pot)])
+        if total.sum() > 0:
+            return total / total.sum()
+        return np.full(NUM_ACTIONS, 1 / NUM_ACTIONS)
+
+
+class CFRAgent(RandomAgent):
+    def __init__(self, name, policy: Optional[CFRPolicy] = None, rng: Optional[random.Random] = None):
+        """
+        Агент, играющий по средней стратегии CFR.
+
+        Наблюдение make_decision переводится в те же признаки инфосета,
+        что и при обучении; недопустимые действия отбрасываются.
+        """
+        super().__init__(name)
+        self.policy = policy
+        self.rng = rng if rng is not None else random
+
+    def make_decision(self, community_cards, current_bet, pot, min_bet):
+        to_call = current_bet - self.current_bet
+        if self.money <= 0:
+            # Ставить нечем: чек, если ставка уравнена (RandomAgent в этом случае сбрасывает карты).
+            if to_call <= 0:
+                return "check", 0
+            self.active = False
+            return "fold", 0
+        game = self.policy.game
+        street = BOARD_STREETS[len(community_cards)]
+        hole = cards_to_ints(self.cards)
+        board = cards_to_ints(community_cards)
+        probabilities = self.policy.action_probabilities(street, game.cards.bucket(hole, board), to_call, pot)
+
+        legal = game.legal_actions(to_call, current_bet, self.money)
+        weights = [p if ok else 0.0 for p, ok in zip(probabilities, legal)]
+        if sum(weights) <= 0:
+            weights = [float(ok) for ok in legal]
+        action = self.rng.choices(ACTIONS, weights=weights)[0]
+
+        if action == FOLD:
+            self.active = False
+            return "fold", 0
+        if action == RAISE:
+            return "raise", game.raise_amount(current_bet)
+        if to_call <= 0:
+            return "check", 0
+        return "call", to_call
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Обучение стратегии MCCFR с контрольными точками.")
+    parser.add_argument("directory")
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    trainer = CFRTrainer(args.directory)
+    trainer.train(args.iterations, processes=args.processes, batch_size=args.batch_size, seed=args.seed)
+    print(f"Итераций всего: {trainer.iterations}")
@@ -1,5 +1,7 @@
 import random
 
+from .utils import CARDS, card_to_int
+
 class Deck:
     def __init__(self):
         """
@@ -51,4 +53,100 @@ class Deck:
         Returns:
             str: Описание колоды.
         """
-        return f"Deck(cards={len(self.cards)})"
\ No newline at end of file
+        return f"Deck(cards={len(self.cards)})"
+
+
+_ORDERED_CODES = bytes(range(52))
+
+
+class CompactDeck:
+    __slots__ = ('cards', 'position', 'size', 'rng')
+
+    def __init__(self, rng=None):
+        """
+        Колода из 52 целочисленных кодов карт (см. utils.card_to_int).
+
+        Карты не перетасовываются заранее: draw выбирает случайную карту из
+        ещё не сданных (частичный Фишер–Йетс), поэтому reset — это просто
+        возврат курсора в начало.
+
+        Args:
+            rng: Источник случайности с методом random() — модуль random,
+                random.Random или numpy Generator. По умолчанию модуль random.
+        """
+        self.cards = bytearray(range(52))
+        self.position = 0  # Карты [0, position) уже сданы
+        self.size = 52  # Карты [size, 52) убраны из игры
+        self.rng = rng if rng is not None else random
+
+    def draw_code(self):
+        """
+        Сдаёт одну случайную карту из оставшихся.
+
+        Returns:
+            int: Код карты.
+            None: Если колода пуста.
+        """
+        position = self.position
+        remaining = self.size - position
+        if remaining <= 0:
+            return None
+        cards = self.cards
+        index = position + int(self.rng.random() * remaining)
+        card = cards[index]
+        cards[index] = cards[position]
+        cards[position] = card
+        self.position = position + 1
+        return card
+
+    def draw(self):
+        """
+        Сдаёт одну карту в строковом виде, как Deck.draw.
+
+        Returns:
+            str: Карта в формате "рангмасть" (например, "A♠").
+            None: Если колода пуста.
+        """
+        code = self.draw_code()
+        return None if code is None else CARDS[code]
+
+    def remove(self, cards):
+        """
+        Убирает карты из колоды (мёртвые карты для расчёта эквити).
+
+        Args:
+            cards: Карты в виде строк или кодов; ещё не сданные.
+        """
+        for card in cards:
+            code = card_to_int(card) if isinstance(card, str) else card
+            try:
+                index = self.cards.index(code, self.position, self.size)
+            except ValueError:
+                raise ValueError(f"Карты {CARDS[code]} нет среди оставшихся.") from None
+            self.size -= 1
+            self.cards[index] = self.cards[self.size]
+            self.cards[self.size] = code
+
+    def shuffle(self):
+        """Ничего не делает: карты выбираются случайно при сдаче."""
+
+    def reset(self):
+        """
+        Возвращает в колоду все карты, включая убранные, в исходном порядке.
+
+        Порядок важен для воспроизводимости: одни и те же случайные числа
+        сдают одни и те же карты независимо от предыдущих раздач.
+        """
+        self.cards[:] = _ORDERED_CODES
+        self.position = 0
+        self.size = 52
+
+    def remaining(self):
+        """Строковые представления ещё не сданных карт."""
+        return [CARDS[code] for code in self.cards[self.position:self.size]]
+
+    def __len__(self):
+        return self.size - self.position
+
+    def __repr__(self):
+        return f"CompactDeck(cards={len(self)})"
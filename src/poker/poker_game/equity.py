@@ -0,0 +1,300 @@
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .hand_evaluation import _board_keys, _evaluate_rows, evaluate_with_board
+from .utils import card_to_int
+
+Card = Union[str, int]
+
+# 95% доверительный интервал для нормального приближения.
+Z_95 = 1.96
+
+_executor = None
+_executor_workers = 0
+
+
+def _to_codes(cards: Iterable[Card]) -> List[int]:
+    return [card_to_int(card) if isinstance(card, str) else int(card) for card in cards]
+
+
+def _get_executor(processes: int) -> ProcessPoolExecutor:
+    """Возвращает общий пул процессов, чтобы не платить за запуск на каждый вызов."""
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != processes:
+        if _executor is not None:
+            _executor.shutdown(cancel_futures=True)
+        _executor = ProcessPoolExecutor(max_workers=processes)
+        _executor_workers = processes
+    return _executor
+
+
+def shutdown_pool():
+    """Останавливает пул процессов, созданный для расчёта эквити."""
+    global _executor, _executor_workers
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+        _executor_workers = 0
+
+
+def _simulate(hole: List[int], board: List[int], num_opponents: int, pool: np.ndarray,
+              samples: int, rng: np.random.Generator):
+    """
+    Разыгрывает `samples` случайных раскладов и возвращает суммы для статистики.
+
+    Returns:
+        tuple: (сумма эквити, сумма квадратов эквити, число побед, число ничьих).
+    """
+    missing = 5 - len(board)
+    needed = missing + 2 * num_opponents
+    width = len(pool)
+
+    # Частичный Фишер–Йетс сразу для всех раскладов: перемешиваем только
+    # первые `needed` позиций каждой строки. Колода хранит позиции в pool
+    # (uint8) в плоском массиве, так перестановки дешевле.
+    deck = np.tile(np.arange(width, dtype=np.uint8), samples)
+    starts = np.arange(samples) * width
+    for position in range(needed):
+        swap = starts + rng.integers(position, width, size=samples)
+        drawn = deck[swap]
+        deck[swap] = deck[starts + position]
+        deck[starts + position] = drawn
+    dealt = pool[deck.reshape(samples, width)[:, :needed]]
+
+    full_board = np.empty((samples, 5), dtype=np.int64)
+    full_board[:, :len(board)] = board
+    full_board[:, len(board):] = dealt[:, :missing]
+    board_keys = _board_keys(full_board)
+
+    hero = _evaluate_rows(np.broadcast_to(np.array(hole, dtype=np.int64), (samples, 2)), full_board, board_keys)
+    # Все соперники оцениваются одним вызовом: строка i * num_opponents + j — соперник j в раскладе i.
+    opponents = _evaluate_rows(dealt[:, missing:].reshape(-1, 2), full_board, board_keys, num_opponents)
+    opponents = opponents.reshape(samples, num_opponents)
+    best = opponents.max(axis=1)
+    ties = (opponents == best[:, None]).sum(axis=1)
+
+    win = hero > best
+    tie = hero == best
+    equity = win.astype(np.float64)
+    equity[tie] = 1.0 / (ties[tie] + 1)
+    return float(equity.sum()), float(np.dot(equity, equity)), int(win.sum()), int(tie.sum())
+
+
+def _run_batch(hole, board, num_opponents, pool, samples, seed_sequence):
+    """Точка входа для рабочих процессов: у каждой партии свой поток ГПСЧ."""
+    rng = np.random.default_rng(seed_sequence)
+    return _simulate(hole, board, num_opponents, pool, samples, rng)
+
+
+def calculate_equity(hole_cards: List[Card], community_cards: Optional[List[Card]] = None,
+                     num_opponents: int = 1, samples: int = 10000,
+                     time_budget: Optional[float] = None, target_ci: Optional[float] = None,
+                     batch_size: int = 2500, processes: Optional[int] = None,
+                     seed: Union[int, np.random.SeedSequence, None] = None,
+                     dead_cards: Optional[List[Card]] = None) -> Dict:
+    """
+    Оценивает вероятность выигрыша методом Монте-Карло.
+
+    Неизвестные карты — это все карты, кроме своих, общих и `dead_cards`:
+    карты соперников игроку не видны, поэтому они разыгрываются заново.
+
+    Время растёт с числом соперников: при samples=10000 в одном процессе
+    расчёт укладывается в 10 мс только против одного соперника (около
+    5 мс); против 3 соперников — около 8 мс, против 5 — около 11 мс.
+    Для жёсткого бюджета задавайте time_budget или уменьшайте samples.
+
+    Args:
+        hole_cards (List[Card]): Две карты на руках (строки или коды).
+        community_cards (List[Card]): Уже открытые общие карты (0–5).
+        num_opponents (int): Количество соперников со случайными руками.
+        samples (int): Максимальное число раскладов.
+        time_budget (float): Ограничение по времени в секундах.
+        target_ci (float): Остановиться, когда половина 95% доверительного
+            интервала эквити станет не больше этого значения.
+        batch_size (int): Размер партии раскладов; после каждой партии
+            проверяются условия остановки.
+        processes (int): Число рабочих процессов; None или 1 — считать в
+            текущем процессе (так быстрее всего для небольших бюджетов).
+        seed (int | np.random.SeedSequence): Зерно для воспроизводимости;
+            партии получают независимые потоки через SeedSequence.spawn.
+            Можно передать уже порождённую SeedSequence (так делает
+            equity_tables, чтобы у каждой задачи был свой поток).
+        dead_cards (List[Card]): Карты, заведомо вышедшие из игры.
+
+    Returns:
+        Dict: equity, win, tie, samples, ci (половина 95% интервала).
+    """
+    hole = _to_codes(hole_cards)
+    board = _to_codes(community_cards or [])
+    dead = _to_codes(dead_cards or [])
+    if len(hole) != 2:
+        raise ValueError("Должно быть ровно 2 карты на руках.")
+    if len(board) > 5:
+        raise ValueError("Общих карт не может быть больше 5.")
+    if num_opponents < 1:
+        raise ValueError("Нужен хотя бы один соперник.")
+
+    known = set(hole) | set(board) | set(dead)
+    if len(known) != len(hole) + len(board) + len(set(dead)):
+        raise ValueError("Карты повторяются.")
+    pool = np.array([code for code in range(52) if code not in known], dtype=np.int64)
+    if len(pool) < 5 - len(board) + 2 * num_opponents:
+        raise ValueError("Недостаточно карт для такого количества соперников.")
+
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    seeds = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    totals = [0.0, 0.0, 0, 0]
+    done = 0
+
+    def merge(result, size):
+        nonlocal done
+        for i in range(4):
+            totals[i] += result[i]
+        done += size
+
+    def finished():
+        if done >= samples:
+            return True
+        if deadline is not None and time.perf_counter() >= deadline:
+            return True
+        if target_ci is not None and done:
+            return _half_width(totals[0], totals[1], done) <= target_ci
+        return False
+
+    if not processes or processes == 1:
+        while not finished():
+            size = min(batch_size, samples - done)
+            rng = np.random.default_rng(seeds.spawn(1)[0])
+            merge(_simulate(hole, board, num_opponents, pool, size, rng), size)
+    else:
+        executor = _get_executor(processes)
+        pending = {}
+        submitted = 0
+        while True:
+            while len(pending) < 2 * processes and submitted < samples:
+                size = min(batch_size, samples - submitted)
+                future = executor.submit(_run_batch, hole, board, num_opponents, pool, size, seeds.spawn(1)[0])
+                pending[future] = size
+                submitted += size
+            if not pending:
+                break
+            completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                merge(future.result(), pending.pop(future))
+            if finished():
+                for future in pending:
+                    future.cancel()
+                break
+
+    return {
+        'equity': totals[0] / done if done else 0.0,
+        'win': totals[2] / done if done else 0.0,
+        'tie': totals[3] / done if done else 0.0,
+        'samples': done,
+        'ci': _half_width(totals[0], totals[1], done),
+    }
+
+
+def _half_width(total: float, total_sq: float, n: int) -> float:
+    if n < 2:
+        return math.inf
+    mean = total / n
+    variance = max(total_sq / n - mean * mean, 0.0) * n / (n - 1)
+    return Z_95 * math.sqrt(variance / n)
+
+
+def runout_boards(community_cards: Optional[List[Card]] = None, known_cards: Optional[List[Card]] = None,
+                  max_boards: int = 20000, seed: Union[int, np.random.Generator, None] = None):
+    """
+    Все доски, которыми может закончиться раздача.
+
+    Если вариантов больше `max_boards` (префлоп), вместо перебора берётся
+    столько же случайных досок.
+
+    Args:
+        community_cards (List[Card]): Открытые общие карты (0–5).
+        known_cards (List[Card]): Карты, которых нет в колоде (на руках, сброшенные).
+        max_boards (int): Предел точного перебора.
+        seed: Зерно или генератор NumPy для случайных досок.
+
+    Returns:
+        Tuple[np.ndarray, bool]: Доски формы (R, 5) и признак полного перебора.
+    """
+    board = _to_codes(community_cards or [])
+    known = set(board) | set(_to_codes(known_cards or []))
+    rest = np.array([code for code in range(52) if code not in known], dtype=np.int64)
+    missing = 5 - len(board)
+
+    exact = math.comb(len(rest), missing) <= max_boards
+    if exact:
+        completions = np.array(list(combinations(range(len(rest)), missing)), dtype=np.int64).reshape(-1, missing)
+    else:
+        rng = np.random.default_rng(seed)
+        completions = rng.integers(0, len(rest), size=(max_boards, missing))
+        # Доски с повторной картой пересдаются, проверяются только пересданные строки.
+        rows = np.arange(max_boards)
+        while len(rows):
+            ordered = np.sort(completions[rows], axis=1)
+            rows = rows[(ordered[:, 1:] == ordered[:, :-1]).any(axis=1)]
+            completions[rows] = rng.integers(0, len(rest), size=(len(rows), missing))
+    boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.int64), (len(completions), len(board))),
+                        rest[completions]])
+    return boards, exact
+
+
+def showdown_equities(hole_cards: Sequence[List[Card]], community_cards: Optional[List[Card]] = None,
+                      dead_cards: Optional[List[Card]] = None, max_boards: int = 20000,
+                      seed: Union[int, np.random.Generator, None] = None) -> Dict:
+    """
+    Эквити игроков с известными картами: доля банка, усреднённая по доскам.
+
+    Перебираются все доски из оставшихся карт (с флопа это не больше 990
+    досок, см. runout_boards), на каждой доске банк делится поровну между
+    лучшими руками.
+
+    Args:
+        hole_cards (Sequence[List[Card]]): Карты на руках каждого игрока.
+        community_cards (List[Card]): Открытые общие карты (0–5).
+        dead_cards (List[Card]): Карты, вышедшие из игры (например, сброшенные).
+        max_boards (int): Предел точного перебора.
+        seed: Зерно или генератор NumPy для случайных досок.
+
+    Returns:
+        Dict: equity (массив долей по игрокам, сумма 1), boards (число досок)
+        и exact (True, если перебраны все доски).
+    """
+    holes = np.array([_to_codes(cards) for cards in hole_cards], dtype=np.int64).reshape(-1, 2)
+    shown = holes.ravel().tolist() + _to_codes(community_cards or [])
+    if len(set(shown)) != len(shown):
+        raise ValueError("Карты игроков и доски не должны повторяться.")
+    boards, exact = runout_boards(community_cards, holes.ravel().tolist() + _to_codes(dead_cards or []),
+                                  max_boards, seed)
+    scores = evaluate_with_board(holes, boards)
+    winners = scores == scores.max(axis=1, keepdims=True)
+    equity = (winners / winners.sum(axis=1, keepdims=True)).mean(axis=0)
+    return {'equity': equity, 'boards': len(boards), 'exact': exact}
+
+
+def agent_equity(agent, game, num_opponents: Optional[int] = None, **kwargs) -> Dict:
+    """
+    Эквити агента в текущей раздаче игры.
+
+    Args:
+        agent: Агент с картами `agent.cards`.
+        game (PokerGame): Игра с общими картами `game.community_cards`.
+        num_opponents (int): Число соперников; по умолчанию — все остальные
+            активные игроки за столом.
+        **kwargs: Параметры calculate_equity (samples, time_budget, ...).
+
+    Returns:
+        Dict: Результат calculate_equity.
+    """
+    if num_opponents is None:
+        num_opponents = sum(1 for player in game.players
+                            if player is not agent and getattr(player, 'active', True))
+    return calculate_equity(agent.cards, game.community_cards, max(num_opponents, 1), **kwargs)
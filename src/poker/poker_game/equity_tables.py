@@ -0,0 +1,238 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .equity import Card, _to_codes, calculate_equity
+from .utils import canonical_cards
+
+# Формат файла (little-endian):
+#   заголовок: magic "PKEQ", версия, MAX_OPPONENTS, число записей флопа (4 x uint32);
+#   float32[169, MAX_OPPONENTS] — эквити префлоп-классов против 1..9 соперников;
+#   int32[N] — отсортированные канонические ключи (рука, флоп);
+#   uint16[N] — эквити хедз-ап на флопе, квантованное в 0..65535.
+MAGIC = b'PKEQ'
+VERSION = 1
+MAX_OPPONENTS = 9
+NUM_CLASSES = 169
+HEADER_SIZE = 16
+EQUITY_SCALE = 65535
+
+_loaded: Dict[str, 'EquityTables'] = {}
+
+
+def hole_class(hole_cards: List[Card]) -> int:
+    """
+    Индекс класса стартовой руки в сетке 13x13.
+
+    Пары лежат на диагонали, одномастные — выше неё (старший ранг в строке),
+    разномастные — ниже.
+
+    Args:
+        hole_cards (List[Card]): Две карты на руках.
+
+    Returns:
+        int: Индекс от 0 до 168.
+    """
+    first, second = _to_codes(hole_cards)
+    high, low = max(first >> 2, second >> 2), min(first >> 2, second >> 2)
+    if (first & 3) == (second & 3):
+        return high * 13 + low
+    return low * 13 + high
+
+
+def _class_representative(index: int) -> List[int]:
+    row, column = divmod(index, 13)
+    if row >= column:  # пара или одномастная
+        return [row * 4, column * 4 + (0 if row != column else 1)]
+    return [column * 4, row * 4 + 1]
+
+
+def canonical_flop_key(hole_cards: List[Card], flop: List[Card]) -> int:
+    """
+    Ключ руки и флопа, не зависящий от перестановки мастей.
+
+    Масти переставляются через utils.canonical_cards.
+    """
+    hole, board = canonical_cards(_to_codes(hole_cards), _to_codes(flop))
+    key = 0
+    for code in hole + board:
+        key = key * 52 + code
+    return key
+
+
+def _decode_key(key: int):
+    codes = []
+    for _ in range(5):
+        key, code = divmod(key, 52)
+        codes.append(code)
+    codes.reverse()
+    return codes[:2], codes[2:]
+
+
+def _preflop_row(index: int, samples: int, seeds: np.random.SeedSequence) -> List[float]:
+    hole = _class_representative(index)
+    return [
+        calculate_equity(hole, num_opponents=opponents, samples=samples, seed=child)['equity']
+        for opponents, child in zip(range(1, MAX_OPPONENTS + 1), seeds.spawn(MAX_OPPONENTS))
+    ]
+
+
+def _flop_chunk(keys: List[int], samples: int, seeds: np.random.SeedSequence) -> List[float]:
+    result = []
+    for key in keys:
+        # Потомок seeds с номером, равным ключу позиции: поток не зависит от разбиения на задачи.
+        child = np.random.SeedSequence(seeds.entropy, spawn_key=seeds.spawn_key + (key,))
+        hole, flop = _decode_key(key)
+        result.append(calculate_equity(hole, flop, 1, samples=samples, seed=child)['equity'])
+    return result
+
+
+def _flop_keys(flops: Optional[Iterable[List[Card]]]) -> List[int]:
+    keys = set()
+    if flops is None:
+        # Берём по представителю каждого класса руки и все флопы к нему:
+        # каноникализация склеивает оставшиеся перестановки мастей.
+        for index in range(NUM_CLASSES):
+            hole = _class_representative(index)
+            rest = [code for code in range(52) if code not in hole]
+            for flop in combinations(rest, 3):
+                keys.add(canonical_flop_key(hole, flop))
+    else:
+        for flop in flops:
+            flop = _to_codes(flop)
+            rest = [code for code in range(52) if code not in flop]
+            for hole in combinations(rest, 2):
+                keys.add(canonical_flop_key(hole, flop))
+    return sorted(keys)
+
+
+def build_tables(path: str, preflop_samples: int = 20000, flop_samples: int = 0,
+                 flops: Optional[Iterable[List[Card]]] = None, processes: Optional[int] = None,
+                 seed: Optional[int] = None, chunk_size: int = 2000):
+    """
+    Считает таблицы эквити и записывает их в бинарный файл.
+
+    Args:
+        path (str): Путь к выходному файлу.
+        preflop_samples (int): Раскладов на каждую пару (класс, число соперников).
+        flop_samples (int): Раскладов на каждую каноническую позицию флопа;
+            0 — не строить флоповую таблицу.
+        flops (Iterable): Флопы для таблицы; None — все флопы.
+        processes (int): Число рабочих процессов (по умолчанию — все ядра).
+        seed (int): Зерно для воспроизводимости. Каждая запись таблицы
+            считается своим потоком из SeedSequence(seed).spawn, поэтому
+            ошибки Монте-Карло разных записей независимы, а результат не
+            зависит от числа процессов и chunk_size.
+        chunk_size (int): Позиций флопа на одну задачу пула.
+    """
+    processes = processes or os.cpu_count() or 1
+    preflop_seeds, flop_seeds = np.random.SeedSequence(seed).spawn(2)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        rows = executor.map(_preflop_row, range(NUM_CLASSES),
+                            [preflop_samples] * NUM_CLASSES, preflop_seeds.spawn(NUM_CLASSES))
+        preflop = np.array(list(rows), dtype='<f4')
+
+        keys = _flop_keys(flops) if flop_samples > 0 else []
+        chunks = [keys[i:i + chunk_size] for i in range(0, len(keys), chunk_size)]
+        equities = []
+        for values in executor.map(_flop_chunk, chunks, [flop_samples] * len(chunks), [flop_seeds] * len(chunks)):
+            equities.extend(values)
+
+    header = np.array([int.from_bytes(MAGIC, 'little'), VERSION, MAX_OPPONENTS, len(keys)], dtype='<u4')
+    with open(path, 'wb') as file:
+        file.write(header.tobytes())
+        file.write(preflop.tobytes())
+        file.write(np.array(keys, dtype='<i4').tobytes())
+        file.write(np.round(np.array(equities, dtype=np.float64) * EQUITY_SCALE).astype('<u2').tobytes())
+
+
+class EquityTables:
+    def __init__(self, path: str):
+        """
+        Отображает файл таблиц в память без чтения его целиком.
+
+        Страницы файла разделяются всеми процессами через кэш ОС.
+        """
+        header = np.fromfile(path, dtype='<u4', count=4)
+        if header.size != 4 or header[0] != int.from_bytes(MAGIC, 'little'):
+            raise ValueError(f"{path} не является файлом таблиц эквити.")
+        if header[1] != VERSION:
+            raise ValueError(f"Неподдерживаемая версия таблиц эквити: {header[1]}.")
+        self.path = path
+        self.max_opponents = int(header[2])
+        flop_count = int(header[3])
+
+        offset = HEADER_SIZE
+        self.preflop_table = np.memmap(path, dtype='<f4', mode='r', offset=offset,
+                                       shape=(NUM_CLASSES, self.max_opponents))
+        offset += NUM_CLASSES * self.max_opponents * 4
+        if flop_count:
+            self.flop_keys = np.memmap(path, dtype='<i4', mode='r', offset=offset, shape=(flop_count,))
+            offset += flop_count * 4
+            self.flop_equity = np.memmap(path, dtype='<u2', mode='r', offset=offset, shape=(flop_count,))
+        else:
+            self.flop_keys = np.empty(0, dtype='<i4')
+            self.flop_equity = np.empty(0, dtype='<u2')
+
+    def preflop(self, hole_cards: List[Card], num_opponents: int = 1) -> float:
+        """Эквити руки на префлопе против `num_opponents` случайных рук."""
+        return float(self.preflop_table[hole_class(hole_cards), num_opponents - 1])
+
+    def flop(self, hole_cards: List[Card], flop: List[Card]) -> Optional[float]:
+        """
+        Эквити хедз-ап на флопе или None, если позиции нет в таблице.
+
+        Ключи в файле отсортированы, поиск — двоичный, O(log N): для всех
+        ~1.3 млн канонических позиций это около 20 сравнений по memmap.
+        """
+        key = canonical_flop_key(hole_cards, flop)
+        index = int(np.searchsorted(self.flop_keys, key))
+        if index < len(self.flop_keys) and self.flop_keys[index] == key:
+            return int(self.flop_equity[index]) / EQUITY_SCALE
+        return None
+
+    def lookup(self, hole_cards: List[Card], community_cards: List[Card], num_opponents: int = 1) -> Optional[float]:
+        """
+        Эквити для текущей ситуации из таблиц, если она там есть.
+
+        Удобно вызывать из make_decision: на префлопе работает для 1..9
+        соперников, на флопе — для хедз-апа.
+
+        Returns:
+            Optional[float]: Эквити или None, если ситуации нет в таблицах.
+        """
+        if not community_cards:
+            if 1 <= num_opponents <= self.max_opponents:
+                return self.preflop(hole_cards, num_opponents)
+            return None
+        if len(community_cards) == 3 and num_opponents == 1:
+            return self.flop(hole_cards, community_cards)
+        return None
+
+    def __repr__(self):
+        return f"EquityTables(path={self.path!r}, flops={len(self.flop_keys)})"
+
+
+def load_tables(path: str) -> EquityTables:
+    """Загружает таблицы один раз на процесс и возвращает общий экземпляр."""
+    path = os.path.abspath(path)
+    tables = _loaded.get(path)
+    if tables is None:
+        tables = _loaded[path] = EquityTables(path)
+    return tables
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Построение таблиц эквити.")
+    parser.add_argument("path")
+    parser.add_argument("--preflop-samples", type=int, default=20000)
+    parser.add_argument("--flop-samples", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    build_tables(args.path, args.preflop_samples, args.flop_samples,
+                 processes=args.processes, seed=args.seed)
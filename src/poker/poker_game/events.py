@@ -0,0 +1,175 @@
+import json
+import sys
+from typing import Any, List, Optional, TextIO
+
+# Типы событий движка. Событие — это (kind, player, amount, info):
+# имя игрока, сумма в фишках и небольшая дополнительная информация.
+STREET = 0          # info: (номер раунда, общие карты)
+BLIND = 1           # info: (большой ли блайнд, all-in ли)
+TO_CALL = 2         # amount: сколько нужно для колла; info: (текущая ставка, ставка агента)
+FOLD = 3            # info: остаток
+CHECK = 4           # info: (ставка агента, остаток)
+CALL = 5            # amount: доплата (0 — ставка уже уравнена); info: (ставка агента, остаток)
+ALL_IN = 6          # amount: поставленный остаток; info: ставка агента
+RAISE = 7           # amount: размер рейза; info: (ставка агента, остаток)
+INVALID_RAISE = 8   # amount: запрошенный рейз; info: True, если рейз меньше текущей ставки
+SHOWDOWN_START = 9
+SHOWDOWN = 10       # amount: оценка руки; info: (название комбинации, карты)
+POT_AWARDED = 11    # amount: доля банка; info: True, если это остаток от деления
+UNCONTESTED = 12    # amount: банк, выигранный без вскрытия
+NO_SHOWDOWN = 13
+HAND_START = 14     # info: (имена, стеки до блайндов, карты на руках) по местам
+HAND_END = 15       # amount: банк; info: (стеки после раздачи, общие карты)
+TIMEOUT = 16        # агент не ответил вовремя; info: действие по умолчанию
+EQUITY_SHARE = 17   # amount: доля банка при делении по эквити all-in; info: эквити
+
+EVENT_NAMES = [
+    'street', 'blind', 'to_call', 'fold', 'check', 'call', 'all_in', 'raise',
+    'invalid_raise', 'showdown_start', 'showdown', 'pot_awarded', 'uncontested', 'no_showdown',
+    'hand_start', 'hand_end', 'timeout', 'equity_share',
+]
+
+
+class EventSink:
+    """
+    Приёмник событий движка.
+
+    Движок проверяет `enabled` перед формированием события, поэтому
+    выключенный приёмник не тратит время на аргументы и форматирование.
+    """
+    enabled = True
+
+    def emit(self, kind: int, player: Optional[str] = None, amount: int = 0, info: Any = None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class NullSink(EventSink):
+    """Отбрасывает все события (режим без вывода для симуляций)."""
+    enabled = False
+
+    def emit(self, kind, player=None, amount=0, info=None):
+        pass
+
+
+class PrintSink(EventSink):
+    """Печатает события в человекочитаемом виде, как раньше делал betting.py."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+
+    def emit(self, kind, player=None, amount=0, info=None):
+        text = format_event(kind, player, amount, info)
+        if text is not None:
+            print(text, file=self.stream or sys.stdout)
+
+
+class ListSink(EventSink):
+    """Собирает события в список."""
+
+    def __init__(self):
+        self.events: List[tuple] = []
+
+    def emit(self, kind, player=None, amount=0, info=None):
+        self.events.append((kind, player, amount, info))
+
+
+class TeeSink(EventSink):
+    """Передаёт события сразу нескольким приёмникам."""
+
+    def __init__(self, *sinks: EventSink):
+        self.sinks = [sink for sink in sinks if sink.enabled]
+        self.enabled = bool(self.sinks)
+
+    def emit(self, kind, player=None, amount=0, info=None):
+        for sink in self.sinks:
+            sink.emit(kind, player, amount, info)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+class JsonlSink(EventSink):
+    """Буферизованно пишет события в файл, по одному JSON-объекту на строку."""
+
+    def __init__(self, path: str, buffer_size: int = 4096):
+        self.file = open(path, 'a', encoding='utf-8')
+        self.buffer_size = buffer_size
+        self.buffer: List[str] = []
+
+    def emit(self, kind, player=None, amount=0, info=None):
+        self.buffer.append(json.dumps([EVENT_NAMES[kind], player, amount, info], ensure_ascii=False))
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write('\n'.join(self.buffer) + '\n')
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def format_event(kind: int, player: Optional[str], amount: int, info: Any) -> Optional[str]:
+    """Текст события в том виде, в котором его печатал betting.py (None — не печатать)."""
+    if kind == STREET:
+        round_number, community_cards = info
+        header = f"\nРаунд ставок {round_number + 1}:"
+        if round_number == 0:
+            header += "\nПрефлоп"
+        return f"{header}\nОбщие карты: {community_cards}"
+    if kind == BLIND:
+        is_big, all_in = info
+        blind = "большой блайнд" if is_big else "малый блайнд"
+        if all_in:
+            return f"{player} поставил всё ({blind}): {amount}"
+        return f"{player} поставил {blind}: {amount}"
+    if kind == TO_CALL:
+        current_bet, agent_bet = info
+        return f"{player}: нужно поставить {amount} для колла (текущая ставка: {current_bet}, текущая ставка агента: {agent_bet})"
+    if kind == FOLD:
+        return f"{player} решил fold (ставка: 0, остаток: {info})"
+    if kind == CHECK:
+        return f"{player} решил check (ставка: {info[0]}, остаток: {info[1]})"
+    if kind == CALL:
+        if amount == 0:
+            return f"{player} уже уравнял текущую ставку."
+        return f"{player} решил call (ставка: {info[0]}, остаток: {info[1]})"
+    if kind == ALL_IN:
+        return f"{player} делает all-in (текущая ставка агента: {info}, остаток: 0)"
+    if kind == RAISE:
+        return f"{player} решил raise на {amount} (текущая ставка агента: {info[0]}, остаток: {info[1]})"
+    if kind == INVALID_RAISE:
+        if info:
+            return f"{player} не может сделать raise на меньшую сумму. Фолд."
+        return f"{player} не может сделать raise на {amount}. Делает фолд."
+    if kind == SHOWDOWN_START:
+        return "Все дошли до шоудауна. Определяем победителя..."
+    if kind == SHOWDOWN:
+        combination_name, cards = info
+        return f"{player} {cards} комбинация: {combination_name} (оценка: {amount})"
+    if kind == POT_AWARDED:
+        if info:
+            return f"{player} получает дополнительно {amount} из остатка банка."
+        return f"{player} получает {amount} из банка!"
+    if kind == UNCONTESTED:
+        return f"{player} выиграл банк: {amount}!"
+    if kind == NO_SHOWDOWN:
+        return "Игроков недостаточно для шоудауна. Игра завершена."
+    if kind == TIMEOUT:
+        return f"{player} не ответил вовремя, действие по умолчанию: {info}"
+    if kind == EQUITY_SHARE:
+        return f"{player} получает {amount} из банка по эквити {info:.1%}"
+    if kind in (HAND_START, HAND_END):
+        return None
+    return f"{EVENT_NAMES[kind]} {player} {amount} {info}"
+
+
+NULL_SINK = NullSink()
+PRINT_SINK = PrintSink()
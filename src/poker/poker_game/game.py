@@ -1,23 +1,52 @@
-from .deck import Deck
+from .deck import CompactDeck
 from .player import Player
+from .table import TableState
+from .profiling import PROFILER, DEAL
+from time import perf_counter
 import random
 
 class PokerGame:
-    def __init__(self, num_players):
+    def __init__(self, num_players, rng=None):
         self.players = [Player(f"Player {i+1}") for i in range(num_players)]
-        self.deck = Deck()  # Колода карт
+        self.deck = CompactDeck(rng)  # Колода карт; rng — генератор случайных чисел стола
         self.pot = 0  # Пот
         self.community_cards = []  # Общие карты
         self.round = 0  # Текущий раунд (потенциально префлоп, флоп, терн, ривер)
+        self.table = TableState()  # Состояние раздачи, переиспользуется между раздачами
     
     def deal_cards(self):
         """Раздать карты игрокам."""
+        profiling = PROFILER.next_sampled
+        if profiling:
+            started = perf_counter()
+        draw = self.deck.draw
         for player in self.players:
-            player.receive_cards([self.deck.draw(), self.deck.draw()])
+            # Список карт игрока переиспользуется между раздачами.
+            cards = player.cards
+            cards.clear()
+            cards.append(draw())
+            cards.append(draw())
+            player.receive_cards(cards)
+            tracker = getattr(player, 'hand_tracker', None)
+            if tracker is not None:
+                tracker.reset(cards)
+        if profiling:
+            PROFILER.record(DEAL, perf_counter() - started)
 
     def deal_community_cards(self, count):
-        """Раздать общие карты (флоп, терн, ривер)."""
-        self.community_cards.extend([self.deck.draw() for _ in range(count)])
+        """Раздать общие карты (флоп, терн, ривер) и обновить оценки рук игроков."""
+        profiling = PROFILER.active
+        if profiling:
+            started = perf_counter()
+        cards = [self.deck.draw() for _ in range(count)]
+        self.community_cards.extend(cards)
+        for player in self.players:
+            tracker = getattr(player, 'hand_tracker', None)
+            if tracker is not None:
+                for card in cards:
+                    tracker.add(card)
+        if profiling:
+            PROFILER.record(DEAL, perf_counter() - started)
 
     def betting_round(self):
         """Раунд ставок. Здесь можно использовать агентов для принятия решений."""
@@ -34,8 +63,13 @@ class PokerGame:
 
     def reset_game(self):
         """Сброс игры после раунда."""
-        self.community_cards = []
+        self.community_cards.clear()
         self.pot = 0
         for player in self.players:
             player.reset()
-        self.deck.shuffle()
+            # Флаг и ставка раздачи есть только у агентов, у Player их нет.
+            if hasattr(player, 'active'):
+                player.active = True
+            if hasattr(player, 'current_bet'):
+                player.current_bet = 0
+        self.deck.reset()  # Возвращаем сданные карты в колоду
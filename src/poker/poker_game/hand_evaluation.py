@@ -1,6 +1,368 @@
-from itertools import combinations
-from collections import Counter
-from typing import List, Dict
+from itertools import combinations_with_replacement
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .utils import CARD_CODES, card_to_int
+
+# Категории комбинаций по возрастанию силы.
+HIGH_CARD = 0
+ONE_PAIR = 1
+TWO_PAIR = 2
+THREE_OF_A_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_OF_A_KIND = 7
+STRAIGHT_FLUSH = 8
+
+HAND_NAMES = [
+    'High Card', 'One Pair', 'Two Pair', 'Three of a Kind', 'Straight',
+    'Flush', 'Full House', 'Four of a Kind', 'Straight Flush',
+]
+
+# Оценка руки — одно целое число: категория в старших битах,
+# затем до пяти значимых рангов по 4 бита. Больше — сильнее.
+CATEGORY_SHIFT = 20
+ACE = 12
+WHEEL_MASK = 0b1000000001111  # A-2-3-4-5
+
+
+def hand_category(value: int) -> int:
+    """Возвращает категорию комбинации по её оценке."""
+    return value >> CATEGORY_SHIFT
+
+
+def hand_name(value: int) -> str:
+    """Возвращает название комбинации по её оценке."""
+    category = value >> CATEGORY_SHIFT
+    if category == STRAIGHT_FLUSH and (value >> 16) & 0xF == ACE:
+        return 'Royal Flush'
+    return HAND_NAMES[category]
+
+
+def _pack(category: int, ranks: List[int]) -> int:
+    value = category << CATEGORY_SHIFT
+    shift = 16
+    for rank in ranks:
+        value |= rank << shift
+        shift -= 4
+    return value
+
+
+def _straight_high(mask: int) -> int:
+    """Старший ранг лучшего стрита в маске рангов или -1."""
+    for high in range(ACE, 3, -1):
+        window = 0b11111 << (high - 4)
+        if mask & window == window:
+            return high
+    if mask & WHEEL_MASK == WHEEL_MASK:
+        return 3
+    return -1
+
+
+def _top_ranks(mask: int, count: int) -> List[int]:
+    ranks = []
+    for rank in range(ACE, -1, -1):
+        if mask >> rank & 1:
+            ranks.append(rank)
+            if len(ranks) == count:
+                break
+    return ranks
+
+
+def _flush_value(mask: int) -> int:
+    high = STRAIGHT_HIGH[mask]
+    if high >= 0:
+        return _pack(STRAIGHT_FLUSH, [high])
+    return _pack(FLUSH, _top_ranks(mask, 5))
+
+
+def _rank_value(counts: List[int]) -> int:
+    """Лучшая комбинация без учёта флеша по количеству карт каждого ранга."""
+    mask = 0
+    quads, trips, pairs = [], [], []
+    for rank in range(ACE, -1, -1):
+        count = counts[rank]
+        if count:
+            mask |= 1 << rank
+            if count == 4:
+                quads.append(rank)
+            elif count == 3:
+                trips.append(rank)
+            elif count == 2:
+                pairs.append(rank)
+
+    if quads:
+        quad = quads[0]
+        return _pack(FOUR_OF_A_KIND, [quad] + _top_ranks(mask & ~(1 << quad), 1))
+
+    if trips and (len(trips) > 1 or pairs):
+        pair = max(trips[1:] + pairs)
+        return _pack(FULL_HOUSE, [trips[0], pair])
+
+    high = STRAIGHT_HIGH[mask]
+    if high >= 0:
+        return _pack(STRAIGHT, [high])
+
+    if trips:
+        trip = trips[0]
+        return _pack(THREE_OF_A_KIND, [trip] + _top_ranks(mask & ~(1 << trip), 2))
+
+    if len(pairs) >= 2:
+        high_pair, low_pair = pairs[0], pairs[1]
+        rest = mask & ~(1 << high_pair) & ~(1 << low_pair)
+        return _pack(TWO_PAIR, [high_pair, low_pair] + _top_ranks(rest, 1))
+
+    if pairs:
+        pair = pairs[0]
+        return _pack(ONE_PAIR, [pair] + _top_ranks(mask & ~(1 << pair), 3))
+
+    return _pack(HIGH_CARD, _top_ranks(mask, 5))
+
+
+def _build_tables():
+    """
+    Строит таблицы поиска.
+
+    Набор рангов кодируется суммой 5 ** rank (в каждом разряде пятеричного
+    числа — количество карт ранга), поэтому ключ не зависит от порядка карт.
+    Масти считаются в трёхбитных счётчиках: по сумме сразу видно, есть ли флеш.
+    """
+    powers = [5 ** rank for rank in range(13)]
+    rank_table = {}
+    for size in range(1, 8):
+        for ranks in combinations_with_replacement(range(13), size):
+            counts = [0] * 13
+            key = 0
+            for rank in ranks:
+                counts[rank] += 1
+                key += powers[rank]
+            if max(counts) <= 4:
+                rank_table[key] = _rank_value(counts)
+
+    flush_table = [0] * 8192
+    for mask in range(8192):
+        if bin(mask).count('1') >= 5:
+            flush_table[mask] = _flush_value(mask)
+
+    flush_suit = [-1] * 4096
+    for suits in range(4096):
+        for suit in range(4):
+            if (suits >> (3 * suit)) & 7 >= 5:
+                flush_suit[suits] = suit
+
+    return rank_table, flush_table, flush_suit
+
+
+STRAIGHT_HIGH = [_straight_high(mask) for mask in range(8192)]
+RANK_KEYS = [5 ** (code >> 2) for code in range(52)]
+SUIT_KEYS = [1 << (3 * (code & 3)) for code in range(52)]
+RANK_TABLE, FLUSH_TABLE, FLUSH_SUIT = _build_tables()
+
+LOW_RANKS = 7  # младшие ранги ключа (2–8), см. _dense_rank_table
+_LOW_BASE = 5 ** LOW_RANKS
+
+
+def _digit_vectors(ranks: int):
+    """Все наборы из 0–7 карт на `ranks` рангах (не больше 4 карт ранга): (число карт, ключ)."""
+    vectors = [(0, 0)]
+    for rank in range(ranks):
+        vectors = [(size + count, key + count * 5 ** rank) for size, key in vectors
+                   for count in range(5) if size + count <= 7]
+    return vectors
+
+
+def _dense_rank_table():
+    """
+    Плотная таблица оценок по ключу рангов для пакетной оценки.
+
+    Ключ делится на младшую часть (ранги 2–8) и старшую (9–A). Младшие
+    части пронумерованы по возрастанию числа карт, поэтому подходящие к
+    старшей части из s карт младшие части (не больше 7 - s карт) образуют
+    префикс нумерации, и индекс руки — offsets[старшая] + ids[младшая].
+    Так таблица не больше словаря RANK_TABLE, а поиск — два обращения к
+    небольшим массивам вместо двоичного поиска.
+
+    Returns:
+        tuple: ids (по младшей части ключа), offsets (по старшей) и values.
+    """
+    low = sorted(_digit_vectors(LOW_RANKS))
+    ids = np.zeros(_LOW_BASE, dtype=np.int64)
+    prefix = [0] * 9  # prefix[s] — сколько младших частей содержат меньше s карт
+    for index, (size, key) in enumerate(low):
+        ids[key] = index
+        prefix[size + 1] = index + 1
+    for size in range(1, 9):
+        prefix[size] = max(prefix[size], prefix[size - 1])
+
+    offsets = np.zeros(5 ** (13 - LOW_RANKS), dtype=np.int64)
+    total = 0
+    for size, key in sorted(_digit_vectors(13 - LOW_RANKS)):
+        offsets[key] = total
+        total += prefix[8 - size]
+
+    values = np.zeros(total, dtype=np.int32)
+    keys = np.array(list(RANK_TABLE), dtype=np.int64)
+    values[offsets[keys // _LOW_BASE] + ids[keys % _LOW_BASE]] = list(RANK_TABLE.values())
+    return ids, offsets, values
+
+
+# Те же таблицы в виде массивов NumPy для пакетной оценки.
+_RANK_KEYS_NP = np.array(RANK_KEYS, dtype=np.int64)
+_SUIT_KEYS_NP = np.array(SUIT_KEYS, dtype=np.int64)
+_LOW_IDS, _HIGH_OFFSETS, _DENSE_RANK_VALUES = _dense_rank_table()
+_FLUSH_TABLE_NP = np.array(FLUSH_TABLE, dtype=np.int32)
+_FLUSH_SUIT_NP = np.array(FLUSH_SUIT, dtype=np.int64)
+
+
+def evaluate_cards(codes: Sequence[int]) -> int:
+    """
+    Быстро оценивает лучшую комбинацию из 5–7 карт, заданных кодами.
+
+    Таблицы построены и для 1–4 карт: тогда оценка описывает пары, сеты и
+    старшие карты среди уже известных карт.
+
+    Args:
+        codes (Sequence[int]): Коды карт (см. utils.card_to_int).
+
+    Returns:
+        int: Оценка руки; большее значение соответствует более сильной руке.
+    """
+    key = 0
+    suits = 0
+    for code in codes:
+        key += RANK_KEYS[code]
+        suits += SUIT_KEYS[code]
+    value = RANK_TABLE[key]
+
+    suit = FLUSH_SUIT[suits]
+    if suit >= 0:
+        mask = 0
+        for code in codes:
+            if code & 3 == suit:
+                mask |= 1 << (code >> 2)
+        # При семи картах каре может сочетаться с флешем, поэтому берём максимум.
+        flush_value = FLUSH_TABLE[mask]
+        if flush_value > value:
+            value = flush_value
+    return value
+
+
+def evaluate_hands_batch(cards: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+    """
+    Оценивает множество рук сразу векторными поисками по таблицам.
+
+    Args:
+        cards (np.ndarray): Массив кодов карт формы (N, 7) (допустимо и 5–6 карт в строке).
+        chunk_size (int): Сколько рук обрабатывать за раз; ограничивает память
+            под промежуточные массивы при очень больших N.
+
+    Returns:
+        np.ndarray: Массив int32 длины N с теми же оценками, что и evaluate_cards.
+    """
+    cards = np.asarray(cards)
+    if cards.ndim != 2 or not 5 <= cards.shape[1] <= 7:
+        raise ValueError("Ожидается массив формы (N, 5..7) с кодами карт.")
+
+    result = np.empty(cards.shape[0], dtype=np.int32)
+    for start in range(0, cards.shape[0], chunk_size):
+        chunk = cards[start:start + chunk_size].astype(np.int64)
+
+        keys = _RANK_KEYS_NP[chunk].sum(axis=1)
+        values = _DENSE_RANK_VALUES[_HIGH_OFFSETS[keys // _LOW_BASE] + _LOW_IDS[keys % _LOW_BASE]]
+
+        # Флеш встречается редко, поэтому маски мастей строим только для таких рук.
+        flush_suit = _FLUSH_SUIT_NP[_SUIT_KEYS_NP[chunk].sum(axis=1)]
+        flush_rows = np.flatnonzero(flush_suit >= 0)
+        if len(flush_rows):
+            flush_cards = chunk[flush_rows]
+            in_suit = (flush_cards & 3) == flush_suit[flush_rows, None]
+            masks = np.where(in_suit, 1 << (flush_cards >> 2), 0).sum(axis=1)
+            values[flush_rows] = np.maximum(values[flush_rows], _FLUSH_TABLE_NP[masks])
+
+        result[start:start + len(chunk)] = values
+    return result
+
+
+def _board_keys(boards: np.ndarray):
+    """Суммы ключей рангов и мастей по строкам досок."""
+    return _RANK_KEYS_NP[boards].sum(axis=1), _SUIT_KEYS_NP[boards].sum(axis=1)
+
+
+def _evaluate_rows(hole_cards: np.ndarray, boards: np.ndarray, board_keys, repeat: int = 1) -> np.ndarray:
+    """
+    Оценивает руку hole_cards[i] на доске boards[i // repeat] для каждой строки i.
+
+    Ключи доски (см. _board_keys) считаются один раз, и для нескольких рук
+    на тех же досках к ним добавляются только ключи двух карт.
+    """
+    rank_keys = _RANK_KEYS_NP[hole_cards].sum(axis=1)
+    suit_keys = _SUIT_KEYS_NP[hole_cards].sum(axis=1)
+    if repeat > 1:
+        rank_keys = rank_keys.reshape(-1, repeat)
+        suit_keys = suit_keys.reshape(-1, repeat)
+        rank_keys += board_keys[0][:, None]
+        suit_keys += board_keys[1][:, None]
+        rank_keys = rank_keys.ravel()
+        suit_keys = suit_keys.ravel()
+    else:
+        rank_keys += board_keys[0]
+        suit_keys += board_keys[1]
+    values = _DENSE_RANK_VALUES[_HIGH_OFFSETS[rank_keys // _LOW_BASE] + _LOW_IDS[rank_keys % _LOW_BASE]]
+
+    flush_suit = _FLUSH_SUIT_NP[suit_keys]
+    flush_rows = np.flatnonzero(flush_suit >= 0)
+    if len(flush_rows):
+        flush_cards = np.hstack([hole_cards[flush_rows], boards[flush_rows // repeat]])
+        in_suit = (flush_cards & 3) == flush_suit[flush_rows, None]
+        masks = np.where(in_suit, 1 << (flush_cards >> 2), 0).sum(axis=1)
+        values[flush_rows] = np.maximum(values[flush_rows], _FLUSH_TABLE_NP[masks])
+    return values
+
+
+def _suit_masks(cards: np.ndarray) -> np.ndarray:
+    """Маски рангов по мастям для каждой строки: форма (N, 4)."""
+    masks = np.zeros((cards.shape[0], 4), dtype=np.int64)
+    for column in range(cards.shape[1]):
+        codes = cards[:, column]
+        masks[np.arange(len(codes)), codes & 3] |= 1 << (codes >> 2)
+    return masks
+
+
+def evaluate_with_board(hole_cards: np.ndarray, boards: np.ndarray) -> np.ndarray:
+    """
+    Оценивает каждую руку на каждой доске.
+
+    Ключи рангов и мастей складываются из ключей руки и доски, поэтому
+    7-карточные строки не собираются. Для рук, пересекающихся с доской,
+    результат не имеет смысла — их отсекает вызывающий.
+
+    Args:
+        hole_cards (np.ndarray): Карты на руках, форма (M, 2).
+        boards (np.ndarray): Доски из 5 карт, форма (R, 5).
+
+    Returns:
+        np.ndarray: Оценки int32 формы (R, M).
+    """
+    hole_cards = np.asarray(hole_cards, dtype=np.int64)
+    boards = np.asarray(boards, dtype=np.int64)
+    if boards.ndim != 2 or boards.shape[1] != 5:
+        raise ValueError("Ожидается массив досок формы (R, 5).")
+
+    rank_keys = _RANK_KEYS_NP[boards].sum(axis=1)[:, None] + _RANK_KEYS_NP[hole_cards].sum(axis=1)
+    # У пересекающихся с доской рук ключи могут выйти за пределы таблиц.
+    index = _HIGH_OFFSETS[np.minimum(rank_keys // _LOW_BASE, len(_HIGH_OFFSETS) - 1)] + _LOW_IDS[rank_keys % _LOW_BASE]
+    values = _DENSE_RANK_VALUES[np.minimum(index, len(_DENSE_RANK_VALUES) - 1)]
+
+    suit_keys = _SUIT_KEYS_NP[boards].sum(axis=1)[:, None] + _SUIT_KEYS_NP[hole_cards].sum(axis=1)
+    flush_suit = _FLUSH_SUIT_NP[np.minimum(suit_keys, len(_FLUSH_SUIT_NP) - 1)]
+    rows, columns = np.nonzero(flush_suit >= 0)
+    if len(rows):
+        suits = flush_suit[rows, columns]
+        masks = _suit_masks(boards)[rows, suits] | _suit_masks(hole_cards)[columns, suits]
+        values[rows, columns] = np.maximum(values[rows, columns], _FLUSH_TABLE_NP[masks])
+    return values
 
 
 def evaluate_hand(cards: List[str]) -> Dict:
@@ -13,92 +375,112 @@ def evaluate_hand(cards: List[str]) -> Dict:
     Returns:
         Dict: Словарь с информацией о лучшей комбинации и её оценкой.
     """
-    ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-    rank_values = {rank: i for i, rank in enumerate(ranks, start=2)}
+    # Проверка на корректное количество карт
+    if len(cards) != 7:
+        raise ValueError("Должно быть ровно 7 карт для оценки комбинации.")
+
+    score = evaluate_cards([card_to_int(card) for card in cards])
+    return {'combination_name': hand_name(score), 'score': score}
 
-    def get_rank(card):
-        return card[:-1]
 
-    def get_suit(card):
-        return card[1]
+class IncrementalEvaluator:
+    __slots__ = ('codes', 'rank_key', 'suit_key', 'rank_mask', 'suit_masks')
 
-    def check_straight(ranks: List[int]) -> bool:
+    def __init__(self, hole_cards: Sequence = ()):
         """
-        Проверяет, есть ли стрит (последовательность из 5 карт по рангам).
-        Учитывает случай "колеса" (A-2-3-4-5).
+        Оценка руки, которая обновляется по мере открытия общих карт.
+
+        Хранит те же ключи, что и evaluate_cards (сумму пятеричных ключей
+        рангов и счётчики мастей), а также маски рангов по мастям, поэтому
+        добавление карты и ответ на вопрос "что у меня сейчас" стоят O(1)
+        без перебора пятикарточных подмножеств.
+
+        Args:
+            hole_cards (Sequence): Карты на руках (строки или коды).
         """
-        unique_ranks = sorted(set(ranks), reverse=True)
-        for i in range(len(unique_ranks) - 4):
-            if unique_ranks[i] - unique_ranks[i + 4] == 4:
-                return True
-        if set([14, 5, 4, 3, 2]).issubset(unique_ranks):  # Для случая "колеса" (A-5)
-            return True
-        return False
-
-    def get_hand_score(combo: List[str]) -> Dict:
+        self.codes = []
+        self.reset(hole_cards)
+
+    def reset(self, hole_cards: Sequence = ()):
+        """Начинает новую раздачу с указанными картами на руках."""
+        self.codes.clear()
+        self.rank_key = 0
+        self.suit_key = 0
+        self.rank_mask = 0
+        self.suit_masks = [0, 0, 0, 0]
+        for card in hole_cards:
+            self.add(card)
+
+    def add(self, card):
+        """Добавляет открытую карту (строку или код)."""
+        code = CARD_CODES[card] if isinstance(card, str) else card
+        self.codes.append(code)
+        self.rank_key += RANK_KEYS[code]
+        self.suit_key += SUIT_KEYS[code]
+        bit = 1 << (code >> 2)
+        self.rank_mask |= bit
+        self.suit_masks[code & 3] |= bit
+
+    def score(self) -> int:
+        """Оценка лучшей комбинации из известных карт (та же шкала, что у evaluate_cards)."""
+        value = RANK_TABLE[self.rank_key]
+        suit = FLUSH_SUIT[self.suit_key]
+        if suit >= 0:
+            flush_value = FLUSH_TABLE[self.suit_masks[suit]]
+            if flush_value > value:
+                value = flush_value
+        return value
+
+    def best_hand(self) -> Dict:
+        """Лучшая собранная комбинация в формате evaluate_hand."""
+        score = self.score()
+        return {'combination_name': hand_name(score), 'score': score}
+
+    def draws(self) -> Dict:
         """
-        Оценивает комбинацию из 5 карт и возвращает её название и оценку.
+        Дро на флеш и стрит для оставшихся карт.
+
+        Returns:
+            Dict: flush_draw (масть с четырьмя картами или None),
+            backdoor_flush (масти с тремя картами), straight_ranks (ранги,
+            которые доделывают стрит), straight_draw ('open-ended',
+            'gutshot' или None) и outs — число неизвестных карт, которые
+            дают флеш или стрит.
         """
-        card_ranks = sorted([rank_values[get_rank(card)] for card in combo], reverse=True)
-        card_suits = [get_suit(card) for card in combo]
-        rank_counts = Counter(card_ranks)
-        suit_counts = Counter(card_suits)
-
-        is_flush = any(count >= 5 for count in suit_counts.values())
-        is_straight = check_straight(card_ranks)
-        is_straight_flush = is_flush and is_straight
-
-        if is_straight_flush:
-            if max(card_ranks) == rank_values['A']:
-                return {'combination_name': 'Royal Flush', 'score': 10000}
-            return {'combination_name': 'Straight Flush', 'score': 9000 + max(card_ranks)}
-
-        if 4 in rank_counts.values():
-            quads_rank = [rank for rank, count in rank_counts.items() if count == 4][0]
-            kicker = max([rank for rank in card_ranks if rank != quads_rank])
-            return {'combination_name': 'Four of a Kind', 'score': 8000 + quads_rank * 10 + kicker}
-
-        if 3 in rank_counts.values() and 2 in rank_counts.values():
-            triplet = [rank for rank, count in rank_counts.items() if count == 3][0]
-            pair = [rank for rank, count in rank_counts.items() if count == 2][0]
-            return {'combination_name': 'Full House', 'score': 7000 + triplet * 10 + pair}
-
-        if is_flush:
-            flush_cards = sorted([rank for rank, suit in zip(card_ranks, card_suits) if suit_counts[suit] >= 5], reverse=True)
-            return {'combination_name': 'Flush', 'score': 6000 + sum(flush_cards[:5])}
-
-        if is_straight:
-            return {'combination_name': 'Straight', 'score': 5000 + max(card_ranks)}
-
-        if 3 in rank_counts.values():
-            triplet = [rank for rank, count in rank_counts.items() if count == 3][0]
-            kickers = sorted([rank for rank in card_ranks if rank != triplet], reverse=True)[:2]
-            return {'combination_name': 'Three of a Kind', 'score': 4000 + triplet * 10 + sum(kickers)}
-
-        if list(rank_counts.values()).count(2) >= 2:
-            pairs = sorted([rank for rank, count in rank_counts.items() if count == 2], reverse=True)[:2]
-            kicker = max([rank for rank in card_ranks if rank not in pairs])
-            return {'combination_name': 'Two Pair', 'score': 3000 + pairs[0] * 10 + pairs[1] + kicker}
-
-        if 2 in rank_counts.values():
-            pair = [rank for rank, count in rank_counts.items() if count == 2][0]
-            kickers = sorted([rank for rank in card_ranks if rank != pair], reverse=True)[:3]
-            return {'combination_name': 'One Pair', 'score': 2000 + pair * 10 + sum(kickers)}
-
-        return {'combination_name': 'High Card', 'score': 1000 + sum(card_ranks[:5])}
+        result = {'flush_draw': None, 'backdoor_flush': [], 'straight_ranks': [],
+                  'straight_draw': None, 'outs': 0}
+        if len(self.codes) >= 7:
+            return result
 
-    # Проверка на корректное количество карт
-    if len(cards) != 7:
-        raise ValueError("Должно быть ровно 7 карт для оценки комбинации.")
+        flush_suit = FLUSH_SUIT[self.suit_key]
+        for suit in range(4):
+            count = (self.suit_key >> (3 * suit)) & 7
+            if count == 4 and flush_suit < 0:
+                result['flush_draw'] = suit
+            elif count == 3 and len(self.codes) <= 5:
+                result['backdoor_flush'].append(suit)
+
+        if STRAIGHT_HIGH[self.rank_mask] < 0:
+            for rank in range(ACE + 1):
+                bit = 1 << rank
+                if not self.rank_mask & bit and STRAIGHT_HIGH[self.rank_mask | bit] >= 0:
+                    result['straight_ranks'].append(rank)
+            if len(result['straight_ranks']) >= 2:
+                result['straight_draw'] = 'open-ended'
+            elif result['straight_ranks']:
+                result['straight_draw'] = 'gutshot'
+
+        outs = 0
+        draw_suit = result['flush_draw']
+        if draw_suit is not None:
+            outs += 13 - 4
+        # Карта нужного для стрита ранга в масти флеш-дро уже посчитана выше.
+        outs += len(result['straight_ranks']) * (4 if draw_suit is None else 3)
+        result['outs'] = outs
+        return result
+
+    def __len__(self):
+        return len(self.codes)
 
-    best_hand = {'combination_name': '', 'score': 0}
-    for combo in combinations(cards, 5):  # Перебираем все сочетания из 7 карт по 5
-        hand_score = get_hand_score(list(combo))
-        if hand_score['score'] > best_hand['score']:
-            best_hand = hand_score
-
-    return best_hand
-#  #['♠', '♣', '♦', '♥']
-# cards = ['4♣', '6♠', 'Q♠', '10♥', '8♠', '6♠', '3♣']  # Пример флеша
-# result = evaluate_hand(cards)
-# print(result)
\ No newline at end of file
+    def __repr__(self):
+        return f"IncrementalEvaluator(cards={len(self.codes)}, hand={hand_name(self.score()) if self.codes else None!r})"
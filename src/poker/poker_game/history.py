@@ -0,0 +1,212 @@
+import os
+import struct
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from .events import (EventSink, STREET, BLIND, FOLD, CHECK, CALL, ALL_IN, RAISE, INVALID_RAISE,
+                     HAND_START, HAND_END)
+from .utils import CARD_CODES
+
+# Формат файла истории раздач (little-endian):
+#   заголовок: magic "PKHH", версия, MAX_SEATS, MAX_ACTIONS (4 x uint32);
+#   далее записи фиксированной длины HAND_DTYPE, по одной на раздачу.
+MAGIC = b'PKHH'
+VERSION = 1
+MAX_SEATS = 10
+MAX_ACTIONS = 128
+HEADER = struct.Struct('<4sIII')
+NO_CARD = 255
+
+# Флаги записи.
+TRUNCATED = 1  # действий было больше MAX_ACTIONS, сохранены первые
+
+# События, которые попадают в последовательность действий.
+RECORDED_ACTIONS = frozenset((BLIND, FOLD, CHECK, CALL, ALL_IN, RAISE, INVALID_RAISE))
+
+HAND_DTYPE = np.dtype([
+    ('hand_id', '<u8'),
+    ('num_seats', 'u1'),
+    ('board_size', 'u1'),
+    ('flags', 'u1'),
+    ('num_actions', 'u1'),
+    ('hole_cards', 'u1', (MAX_SEATS, 2)),
+    ('board', 'u1', (5,)),
+    ('stacks', '<i4', (MAX_SEATS,)),
+    ('results', '<i4', (MAX_SEATS,)),
+    ('action_seat', 'u1', (MAX_ACTIONS,)),
+    ('action_kind', 'u1', (MAX_ACTIONS,)),
+    ('action_street', 'u1', (MAX_ACTIONS,)),
+    ('action_amount', '<i4', (MAX_ACTIONS,)),
+])
+
+RECORD_SIZE = HAND_DTYPE.itemsize
+_OFFSETS = {name: HAND_DTYPE.fields[name][1] for name in HAND_DTYPE.names}
+_PREFIX = struct.Struct('<QBBBB')
+_INT32 = struct.Struct('<i')
+
+# Пустая запись: карт нет, все числа нулевые. Новая раздача начинается с её копии.
+_EMPTY_RECORD = np.zeros(1, dtype=HAND_DTYPE)
+_EMPTY_RECORD['hole_cards'] = NO_CARD
+_EMPTY_RECORD['board'] = NO_CARD
+_EMPTY_RECORD = _EMPTY_RECORD.tobytes()
+
+
+class HandHistoryWriter(EventSink):
+    def __init__(self, path: str, buffer_hands: int = 4096):
+        """
+        Пишет раздачи в бинарный файл истории, дописывая его в конец.
+
+        Подключается к manage_betting_rounds как приёмник событий (вместе с
+        выводом на экран — через TeeSink). Каждое действие сразу пишется в
+        ячейку текущей записи в буфере; буфер сбрасывается на диск блоками
+        по `buffer_hands` раздач. События вне раздачи (до HAND_START или
+        после HAND_END, например от отдельного betting_round) пропускаются.
+
+        Args:
+            path (str): Путь к файлу истории.
+            buffer_hands (int): Сколько раздач держать в буфере.
+        """
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.hand_id = _check_header(path) if exists else 0
+        self.file = open(path, 'ab')
+        if not exists:
+            self.file.write(HEADER.pack(MAGIC, VERSION, MAX_SEATS, MAX_ACTIONS))
+        self.buffer = bytearray(RECORD_SIZE * buffer_hands)
+        self.buffered = 0
+        self.buffer_hands = buffer_hands
+
+        self._base = 0
+        self._seats = {}
+        self._stacks = []
+        self._street = 0
+        self._num_actions = 0
+        self._flags = 0
+
+    def emit(self, kind, player=None, amount=0, info=None):
+        if kind in RECORDED_ACTIONS:
+            seat = self._seats.get(player)
+            if seat is None:  # вне раздачи
+                return
+            index = self._num_actions
+            if index < MAX_ACTIONS:
+                buffer = self.buffer
+                base = self._base + index
+                buffer[base + _OFFSETS['action_seat']] = seat
+                buffer[base + _OFFSETS['action_kind']] = kind
+                buffer[base + _OFFSETS['action_street']] = self._street
+                _INT32.pack_into(buffer, self._base + _OFFSETS['action_amount'] + 4 * index, amount)
+                self._num_actions = index + 1
+            else:
+                self._flags |= TRUNCATED
+        elif kind == STREET:
+            self._street = info[0]
+        elif kind == HAND_START:
+            self._start(*info)
+        elif kind == HAND_END and self._seats:
+            self._finish(*info)
+
+    def _start(self, names: List[str], stacks: List[int], hole_cards: List[List[str]]):
+        if len(names) > MAX_SEATS:
+            raise ValueError(f"История раздач поддерживает не больше {MAX_SEATS} мест.")
+        if len(set(names)) != len(names):
+            raise ValueError("Имена игроков за столом должны быть уникальными: по ним определяется место.")
+        base = self._base = self.buffered * RECORD_SIZE
+        buffer = self.buffer
+        buffer[base:base + RECORD_SIZE] = _EMPTY_RECORD
+        self._seats = {name: seat for seat, name in enumerate(names)}
+        self._stacks = stacks
+        self._street = 0
+        self._num_actions = 0
+        self._flags = 0
+
+        offset = base + _OFFSETS['hole_cards']
+        for cards in hole_cards:
+            for card in cards[:2]:
+                buffer[offset] = CARD_CODES[card]
+                offset += 1
+            offset += 2 - len(cards[:2])
+        struct.pack_into(f'<{len(stacks)}i', buffer, base + _OFFSETS['stacks'], *stacks)
+
+    def _finish(self, final_stacks: List[int], board: List[str]):
+        base = self._base
+        buffer = self.buffer
+        _PREFIX.pack_into(buffer, base, self.hand_id, len(self._seats), len(board),
+                          self._flags, self._num_actions)
+        offset = base + _OFFSETS['board']
+        buffer[offset:offset + len(board)] = bytes(CARD_CODES[card] for card in board)
+        results = [final - start for final, start in zip(final_stacks, self._stacks)]
+        struct.pack_into(f'<{len(results)}i', buffer, base + _OFFSETS['results'], *results)
+
+        self._seats = {}
+        self.hand_id += 1
+        self.buffered += 1
+        if self.buffered == self.buffer_hands:
+            self.flush()
+
+    def flush(self):
+        """Сбрасывает буфер на диск."""
+        if self.buffered:
+            self.file.write(memoryview(self.buffer)[:self.buffered * RECORD_SIZE])
+            self.buffered = 0
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def _check_header(path: str) -> int:
+    """Проверяет заголовок файла и возвращает количество записей в нём."""
+    with open(path, 'rb') as file:
+        raw = file.read(HEADER.size)
+    if len(raw) != HEADER.size:
+        raise ValueError(f"{path} не является файлом истории раздач.")
+    magic, version, max_seats, max_actions = HEADER.unpack(raw)
+    if magic != MAGIC or version != VERSION or max_seats != MAX_SEATS or max_actions != MAX_ACTIONS:
+        raise ValueError(f"{path}: несовместимый формат истории раздач.")
+    size = os.path.getsize(path) - HEADER.size
+    if size % RECORD_SIZE:
+        raise ValueError(f"{path}: файл обрезан посреди записи.")
+    return size // RECORD_SIZE
+
+
+class HandHistoryReader:
+    def __init__(self, path: str):
+        """
+        Читает файл истории через отображение в память.
+
+        `records` — структурированный массив NumPy поверх файла: ни одна
+        запись не читается, пока к ней не обратились, поэтому файлы в
+        несколько гигабайт не нужно загружать в память целиком.
+        """
+        count = _check_header(path)
+        self.path = path
+        if count:
+            self.records = np.memmap(path, dtype=HAND_DTYPE, mode='r', offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=HAND_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def __iter__(self) -> Iterator[np.void]:
+        return iter(self.records)
+
+    def iter_chunks(self, chunk_size: int = 65536) -> Iterator[np.ndarray]:
+        """Проходит файл блоками записей (срезы memmap, без копирования)."""
+        for start in range(0, len(self.records), chunk_size):
+            yield self.records[start:start + chunk_size]
+
+    def __repr__(self):
+        return f"HandHistoryReader(path={self.path!r}, hands={len(self)})"
+
+
+def record_actions(record: np.void) -> List[Tuple[int, int, int, int]]:
+    """Действия раздачи в виде списка (место, тип события, раунд, сумма)."""
+    count = int(record['num_actions'])
+    return list(zip(record['action_seat'][:count].tolist(), record['action_kind'][:count].tolist(),
+                    record['action_street'][:count].tolist(), record['action_amount'][:count].tolist()))
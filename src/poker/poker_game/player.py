@@ -1,9 +1,12 @@
+from .hand_evaluation import IncrementalEvaluator
+
 class Player:
     def __init__(self, name):
         self.name = name
         self.cards = []  # Две закрытые карты
         self.money = 1000  # Начальная сумма денег
         self.bet = 0  # Текущая ставка
+        self.hand_tracker = IncrementalEvaluator()  # Оценка руки по ходу раздачи
     
     def receive_cards(self, cards):
         """Получить карты от дилера."""
@@ -21,7 +24,7 @@ class Player:
     def reset(self):
         """Сбросить ставки и карты."""
         self.bet = 0
-        self.cards = []
+        self.cards.clear()
 
     def is_broke(self):
         """Проверка, что у игрока нет денег."""
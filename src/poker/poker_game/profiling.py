@@ -0,0 +1,199 @@
+import json
+import time
+from array import array
+from typing import Callable, Dict, Optional
+
+# Фазы, которые замеряет движок. Замеры вложенные: hand включает
+# betting_round, а тот — decision. Сдача карт на руках идёт до начала
+# раздачи в manage_betting_rounds, поэтому она замеряется, если будет
+# замерена следующая раздача (Profiler.next_sampled), — как и остальные
+# фазы, только в каждой sample_every-й раздаче.
+HAND = 'hand'                    # manage_betting_rounds целиком
+BETTING_ROUND = 'betting_round'  # один раунд ставок
+DECISION = 'decision'            # agent.make_decision
+DEAL = 'deal'                    # сдача карт из колоды (карты на руках, флоп, терн, ривер)
+SHOWDOWN = 'showdown'            # determine_winner
+POT = 'pot'                      # распределение банка
+PHASES = [HAND, BETTING_ROUND, DECISION, DEAL, SHOWDOWN, POT]
+
+STREET_NAMES = ['preflop', 'flop', 'turn', 'river']
+
+
+class PhaseStats:
+    __slots__ = ('count', 'total', 'max', 'samples', 'index')
+
+    def __init__(self, window: int):
+        """
+        Счётчики одной фазы: число вызовов, суммарное и максимальное время.
+
+        Для перцентилей хранится кольцевой буфер последних `window` замеров,
+        так что память не растёт со временем работы.
+        """
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = array('d', bytes(8 * window))
+        self.index = 0
+
+    def add(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        index = self.index
+        self.samples[index] = elapsed
+        index += 1
+        self.index = 0 if index == len(self.samples) else index
+
+    def snapshot(self) -> Dict:
+        recent = sorted(self.samples[:min(self.count, len(self.samples))])
+        result = {
+            'count': self.count,
+            'total_sec': self.total,
+            'mean_us': self.total / self.count * 1e6 if self.count else 0.0,
+            'max_us': self.max * 1e6,
+        }
+        for percentile in (50, 90, 99):
+            value = recent[min(len(recent) * percentile // 100, len(recent) - 1)] if recent else 0.0
+            result[f'p{percentile}_us'] = value * 1e6
+        return result
+
+
+class Profiler:
+    def __init__(self, window: int = 4096):
+        """
+        Счётчики горячих участков игрового цикла.
+
+        Выключен по умолчанию: движок проверяет `enabled` (как у приёмников
+        событий) и без профилирования не вызывает таймер вообще. Включённый
+        профилировщик стоит пару вызовов perf_counter и одну запись на фазу;
+        чтобы оставить его работать в долгих симуляциях, замеряйте лишь
+        каждую `sample_every`-ю раздачу (раздачи считаются все).
+
+        Args:
+            window (int): Сколько последних замеров каждой фазы хранить для
+                перцентилей.
+        """
+        self.enabled = False
+        self.active = False  # замеряется ли текущая раздача
+        self.window = window
+        self.sample_every = 1
+        self._countdown = 1
+        self.reset()
+        self.dump_interval = None
+        self.dump_path = None
+        self.dump_callback = None
+        self._next_dump = 0.0
+
+    def record(self, phase: str, elapsed: float):
+        self.phases[phase].add(elapsed)
+
+    def decision(self, street: int, action: str, elapsed: float):
+        """Замер решения агента и учёт действия по раунду ставок."""
+        self._decisions.add(elapsed)
+        counts = self.actions[street]
+        if action in counts:
+            counts[action] += 1
+        else:
+            counts[action] = 1
+
+    @property
+    def next_sampled(self) -> bool:
+        """Будет ли замерена следующая раздача (для сдачи карт до begin_hand)."""
+        return self.enabled and self._countdown == 1
+
+    def begin_hand(self) -> bool:
+        """Вызывается в начале раздачи; возвращает True, если её нужно замерять."""
+        self.hands += 1
+        self._countdown -= 1
+        if self._countdown:
+            self.active = False
+            return False
+        self._countdown = self.sample_every
+        self.active = True
+        return True
+
+    def hand_finished(self, elapsed: float):
+        """Вызывается в конце замеренной раздачи; при необходимости сбрасывает снимок."""
+        self.phases[HAND].add(elapsed)
+        self.active = False
+        if self.dump_interval is not None and time.monotonic() >= self._next_dump:
+            self._next_dump = time.monotonic() + self.dump_interval
+            self.dump()
+
+    def enable(self, sample_every: int = 1, dump_interval: Optional[float] = None,
+               dump_path: Optional[str] = None,
+               dump_callback: Optional[Callable[[Dict], None]] = None) -> 'Profiler':
+        """
+        Включает профилирование.
+
+        Args:
+            sample_every (int): Замерять каждую N-ю раздачу.
+            dump_interval (float): Период сброса снимков в секундах (проверяется
+                в конце раздачи); None — только по запросу.
+            dump_path (str): Файл, в который дописывается снимок (JSON на строку).
+            dump_callback (Callable): Функция, получающая снимок.
+        """
+        if sample_every < 1:
+            raise ValueError("sample_every должно быть положительным.")
+        self.sample_every = sample_every
+        self._countdown = 1
+        self.dump_interval = dump_interval
+        self.dump_path = dump_path
+        self.dump_callback = dump_callback
+        self._next_dump = time.monotonic() + (dump_interval or 0.0)
+        self.enabled = True
+        return self
+
+    def disable(self):
+        self.enabled = False
+        self.active = False
+
+    def reset(self):
+        """Обнуляет все счётчики."""
+        self.phases = {phase: PhaseStats(self.window) for phase in PHASES}
+        self._decisions = self.phases[DECISION]
+        self.actions = [{} for _ in STREET_NAMES]
+        self.hands = 0
+        self.started = time.time()
+
+    def snapshot(self) -> Dict:
+        """
+        Returns:
+            Dict: hands (все раздачи), sampled_hands (замеренные), elapsed_sec,
+            phases (count, total_sec, mean_us, max_us, p50_us, p90_us, p99_us
+            по каждой фазе) и actions (число действий каждого типа по раундам
+            ставок в замеренных раздачах).
+        """
+        return {
+            'hands': self.hands,
+            'sampled_hands': self.phases[HAND].count,
+            'elapsed_sec': time.time() - self.started,
+            'phases': {phase: stats.snapshot() for phase, stats in self.phases.items()},
+            'actions': {street: dict(counts) for street, counts in zip(STREET_NAMES, self.actions)},
+        }
+
+    def dump(self):
+        """Передаёт снимок в dump_callback и дописывает его в dump_path."""
+        snapshot = self.snapshot()
+        if self.dump_callback is not None:
+            self.dump_callback(snapshot)
+        if self.dump_path is not None:
+            with open(self.dump_path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(snapshot) + '\n')
+
+    def __repr__(self):
+        return f"Profiler(enabled={self.enabled}, hands={self.hands})"
+
+
+# Общий профилировщик, который проверяет движок.
+PROFILER = Profiler()
+
+
+def enable_profiling(**kwargs) -> Profiler:
+    """Включает общий профилировщик; параметры — как у Profiler.enable."""
+    return PROFILER.enable(**kwargs)
+
+
+def disable_profiling():
+    PROFILER.disable()
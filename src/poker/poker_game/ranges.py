@@ -0,0 +1,409 @@
+import re
+from itertools import combinations
+from math import comb
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .equity import Card, _to_codes
+from .equity_tables import NUM_CLASSES
+from .hand_evaluation import evaluate_with_board
+from .utils import CARDS
+
+# Все 1326 комбинаций карт на руках; у комбинации (a, b) всегда a < b.
+NUM_COMBOS = 1326
+COMBOS = np.array(list(combinations(range(52), 2)), dtype=np.int64)
+COMBO_INDEX = np.full((52, 52), -1, dtype=np.int64)
+COMBO_INDEX[COMBOS[:, 0], COMBOS[:, 1]] = np.arange(NUM_COMBOS)
+COMBO_INDEX[COMBOS[:, 1], COMBOS[:, 0]] = np.arange(NUM_COMBOS)
+# Для каждой карты — 51 комбинация, в которую она входит.
+CARD_COMBOS = np.array([[COMBO_INDEX[card, other] for other in range(52) if other != card]
+                        for card in range(52)], dtype=np.int64)
+
+# Класс стартовой руки каждой комбинации (нумерация как в equity_tables.hole_class).
+_high = np.maximum(COMBOS[:, 0], COMBOS[:, 1]) >> 2
+_low = np.minimum(COMBOS[:, 0], COMBOS[:, 1]) >> 2
+_suited = (COMBOS[:, 0] & 3) == (COMBOS[:, 1] & 3)
+COMBO_CLASS = np.where(_suited, _high * 13 + _low, _low * 13 + _high)
+CLASS_SIZES = np.bincount(COMBO_CLASS, minlength=NUM_CLASSES)
+
+_RANK = r'(?:10|[2-9TJQKA])'
+_SUIT = r'[SHDC♠♥♦♣]'
+_COMBO_RE = re.compile(rf'^({_RANK})({_SUIT})({_RANK})({_SUIT})$')
+_CLASS_RE = re.compile(rf'^({_RANK})({_RANK})([SO]?)(\+?)$')
+_SPAN_RE = re.compile(rf'^({_RANK})({_RANK})([SO]?)-({_RANK})({_RANK})([SO]?)$')
+_PERCENT_RE = re.compile(r'^(\d+(?:\.\d+)?)%$')
+_RANK_VALUES = {symbol: value for value, symbol in enumerate('23456789TJQKA')}
+_RANK_VALUES['10'] = _RANK_VALUES['T']
+_SUIT_VALUES = {'S': 0, '♠': 0, 'C': 1, '♣': 1, 'D': 2, '♦': 2, 'H': 3, '♥': 3}
+
+# Ключи оценок разных досок (и карт) разносятся на этот шаг, чтобы одна
+# сортировка обслуживала сразу все доски блока; оценка меньше 2^24.
+_GROUP = 1 << 24
+
+# Классы стартовых рук от сильных к слабым по эквити против случайной руки.
+# Таблица фиксирована: посчитана один раз range_equity(full, full) на
+# 600 000 общих досдачах (погрешность эквити класса около 0.05%), так что
+# соседние классы с почти равным эквити всегда идут в одном порядке.
+PREFLOP_ORDER = (
+    'AA KK QQ JJ TT 99 88 AKs 77 AQs AJs AKo ATs AQo AJo KQs '
+    '66 A9s ATo KJs A8s KTs KQo A7s A9o KJo 55 QJs K9s A6s A5s A8o '
+    'KTo QTs A4s A7o K8s A3s QJo K9o Q9s A6o A5o JTs K7s A2s QTo 44 '
+    'A4o K6s Q8s K8o A3o K5s J9s Q9o JTo K7o A2o K4s Q7s K6o T9s J8s '
+    'K3s 33 Q6s Q8o J9o K5o K2s Q5s J7s T8s K4o Q4s Q7o T9o J8o K3o '
+    'Q6o Q3s 98s T7s J6s K2o 22 Q2s Q5o J5s T8o J7o 97s Q4o J4s T6s '
+    'J3s Q3o 98o 87s T7o J6o 96s J2s Q2o J5o T5s T4s 97o 86s J4o T6o '
+    '95s T3s 76s J3o 87o T2s 85s 96o J2o T5o 94s 75s T4o 86o 93s 65s '
+    '95o 84s T3o 92s 76o 74s T2o 54s 85o 64s 83s 94o 75o 82s 93o 65o '
+    '73s 53s 63s 84o 92o 74o 43s 72s 54o 64o 52s 62s 83o 82o 42s 73o '
+    '53o 63o 32s 43o 72o 52o 62o 42o 32o'
+).split()
+
+_preflop_order: Optional[np.ndarray] = None
+
+
+def _class_combos(high: int, low: int, kind: str) -> List[int]:
+    """Комбинации класса: пара, одномастные ('S'), разномастные ('O') или обе."""
+    if high == low:
+        cards = [high * 4 + suit for suit in range(4)]
+        return [COMBO_INDEX[a, b] for a, b in combinations(cards, 2)]
+    result = []
+    for first in range(4):
+        for second in range(4):
+            suited = first == second
+            if kind == 'S' and not suited or kind == 'O' and suited:
+                continue
+            result.append(COMBO_INDEX[high * 4 + first, low * 4 + second])
+    return result
+
+
+def _parse_token(token: str) -> List[int]:
+    match = _COMBO_RE.match(token)
+    if match:
+        first = _RANK_VALUES[match[1]] * 4 + _SUIT_VALUES[match[2]]
+        second = _RANK_VALUES[match[3]] * 4 + _SUIT_VALUES[match[4]]
+        if first == second:
+            raise ValueError(f"Карты в комбинации {token!r} совпадают.")
+        return [COMBO_INDEX[first, second]]
+
+    match = _PERCENT_RE.match(token)
+    if match:
+        return list(np.flatnonzero(HandRange.top(float(match[1])).weights))
+
+    match = _CLASS_RE.match(token)
+    if match:
+        high, low = _RANK_VALUES[match[1]], _RANK_VALUES[match[2]]
+        high, low = max(high, low), min(high, low)
+        kind, plus = match[3], match[4]
+        if high == low:
+            if kind:
+                raise ValueError(f"У пары не бывает масти: {token!r}")
+            ranks = range(high, 13) if plus else [high]
+            return [index for rank in ranks for index in _class_combos(rank, rank, '')]
+        kickers = range(low, high) if plus else [low]
+        return [index for kicker in kickers for index in _class_combos(high, kicker, kind)]
+
+    match = _SPAN_RE.match(token)
+    if match:
+        first = (_RANK_VALUES[match[1]], _RANK_VALUES[match[2]])
+        last = (_RANK_VALUES[match[4]], _RANK_VALUES[match[5]])
+        kind = match[3]
+        if kind != match[6]:
+            raise ValueError(f"Разные масти в границах диапазона: {token!r}")
+        if first[0] == first[1] and last[0] == last[1]:
+            low, high = sorted((first[0], last[0]))
+            return [index for rank in range(low, high + 1) for index in _class_combos(rank, rank, '')]
+        if first[0] != last[0]:
+            raise ValueError(f"У границ диапазона разные старшие карты: {token!r}")
+        low, high = sorted((first[1], last[1]))
+        return [index for kicker in range(low, high + 1) for index in _class_combos(first[0], kicker, kind)]
+
+    raise ValueError(f"Не удалось разобрать диапазон: {token!r}")
+
+
+def preflop_order() -> np.ndarray:
+    """
+    Индексы классов стартовых рук в порядке PREFLOP_ORDER.
+
+    Нумерация как в equity_tables.hole_class; используется для диапазонов
+    вида "15%".
+    """
+    global _preflop_order
+    if _preflop_order is None:
+        order = []
+        for name in PREFLOP_ORDER:
+            high, low = _RANK_VALUES[name[0]], _RANK_VALUES[name[1]]
+            order.append(high * 13 + low if high == low or name[2:] == 's' else low * 13 + high)
+        _preflop_order = np.array(order, dtype=np.int64)
+    return _preflop_order
+
+
+class HandRange:
+    __slots__ = ('weights',)
+
+    def __init__(self, notation: Union[str, Sequence[float], None] = None):
+        """
+        Диапазон рук: вес каждой из 1326 комбинаций (0 — комбинации нет).
+
+        Нотация — список через запятую: пары и классы (QQ, AKs, AKo, AK),
+        "+" (TT+, A2s+), отрезки (22-55, A2s-A5s), конкретные комбинации
+        (AhKh, A♥K♥, 10hJh), доля лучших рук (15%) и вес через двоеточие
+        (AA:0.5). Десятку можно писать как T или 10.
+
+        Args:
+            notation: Строка в нотации диапазонов или массив 1326 весов.
+        """
+        if notation is None:
+            self.weights = np.zeros(NUM_COMBOS)
+        elif isinstance(notation, str):
+            self.weights = np.zeros(NUM_COMBOS)
+            self.add(notation)
+        else:
+            weights = np.array(notation, dtype=np.float64)
+            if weights.shape != (NUM_COMBOS,):
+                raise ValueError(f"Ожидается {NUM_COMBOS} весов.")
+            self.weights = weights
+
+    @classmethod
+    def full(cls) -> 'HandRange':
+        """Все комбинации с весом 1."""
+        return cls(np.ones(NUM_COMBOS))
+
+    @classmethod
+    def top(cls, percent: float) -> 'HandRange':
+        """Лучшие `percent` процентов комбинаций по preflop_order (целыми классами)."""
+        result = cls()
+        target = NUM_COMBOS * percent / 100
+        total = 0
+        for index in preflop_order():
+            if total >= target:
+                break
+            result.weights[COMBO_CLASS == index] = 1.0
+            total += CLASS_SIZES[index]
+        return result
+
+    def add(self, notation: str, weight: float = 1.0) -> 'HandRange':
+        """Добавляет руки из нотации (вес токена перекрывает `weight`)."""
+        for token in notation.replace(' ', '').upper().split(','):
+            if not token:
+                continue
+            token_weight = weight
+            if ':' in token:
+                token, value = token.split(':', 1)
+                token_weight = float(value)
+            self.weights[_parse_token(token)] = token_weight
+        return self
+
+    def remove_cards(self, cards: Iterable[Card]) -> 'HandRange':
+        """Копия диапазона без комбинаций, содержащих `cards` (блокеры)."""
+        weights = self.weights.copy()
+        for code in _to_codes(cards):
+            weights[CARD_COMBOS[code]] = 0.0
+        return HandRange(weights)
+
+    @property
+    def mask(self) -> np.ndarray:
+        """Булева маска комбинаций диапазона."""
+        return self.weights > 0
+
+    def combos(self) -> List[Tuple[str, str]]:
+        """Комбинации диапазона в виде пар строковых карт."""
+        return [(CARDS[a], CARDS[b]) for a, b in COMBOS[self.mask].tolist()]
+
+    def weight(self, hole_cards: Sequence[Card]) -> float:
+        first, second = _to_codes(hole_cards)
+        return float(self.weights[COMBO_INDEX[first, second]])
+
+    def num_combos(self) -> float:
+        """Взвешенное число комбинаций."""
+        return float(self.weights.sum())
+
+    def __contains__(self, hole_cards) -> bool:
+        return self.weight(hole_cards) > 0
+
+    def __len__(self):
+        return int(np.count_nonzero(self.weights))
+
+    def __or__(self, other: 'HandRange') -> 'HandRange':
+        return HandRange(np.maximum(self.weights, other.weights))
+
+    def __and__(self, other: 'HandRange') -> 'HandRange':
+        return HandRange(np.minimum(self.weights, other.weights))
+
+    def __repr__(self):
+        return f"HandRange(combos={len(self)}, weighted={self.num_combos():g})"
+
+
+def _as_range(value: Union[HandRange, str]) -> HandRange:
+    return value if isinstance(value, HandRange) else HandRange(value)
+
+
+def _runs(keys: np.ndarray):
+    """
+    Сортирует ключи и для каждого элемента находит границы его серии равных.
+
+    Returns:
+        Tuple: порядок сортировки, а также для каждого элемента (в исходной
+        нумерации) позиции начала и конца его серии в отсортированном массиве.
+    """
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    change = np.empty(len(keys), dtype=bool)
+    change[0] = True
+    np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=change[1:])
+    run = np.cumsum(change) - 1
+    starts = np.flatnonzero(change)
+    ends = np.append(starts[1:], len(keys))
+    left = np.empty(len(keys), dtype=np.int64)
+    right = np.empty(len(keys), dtype=np.int64)
+    left[order] = starts[run]
+    right[order] = ends[run]
+    return order, left, right
+
+
+class _Layout:
+    def __init__(self, combos: np.ndarray):
+        """
+        Раскладка пар (карта, комбинация) для поправки на блокеры.
+
+        Каждая комбинация из `combos` даёт две пары — по своим картам. Пары
+        упорядочены по карте, так что у каждой карты непрерывная группа;
+        slots[i, k] — место пары комбинации i и её k-й карты.
+        """
+        size = len(combos)
+        cards = np.concatenate((COMBOS[combos, 0], COMBOS[combos, 1]))
+        order = np.argsort(cards, kind='stable')
+        self.card = cards[order]
+        self.combo = np.concatenate((np.arange(size), np.arange(size)))[order]
+        position = np.empty(2 * size, dtype=np.int64)
+        position[order] = np.arange(2 * size)
+        self.slots = position.reshape(2, size).T
+        bounds = np.searchsorted(self.card, np.arange(53))
+        self.group_start = bounds[self.card]
+        self.group_end = bounds[self.card + 1]
+
+
+def _accumulate(boards: np.ndarray, combos: np.ndarray, layout: _Layout, hero: np.ndarray,
+                villain: np.ndarray, win: np.ndarray, tie: np.ndarray, total: np.ndarray):
+    """
+    Добавляет к счётчикам комбинаций героя результаты на досках блока.
+
+    Для комбинации героя h на доске r вес выигранных матчапов — это вес
+    комбинаций соперника с меньшей оценкой минус те из них, что содержат
+    карты h (поправка на блокеры). Суммы берутся по префиксным суммам весов
+    в отсортированных оценках, без матрицы пар комбинаций. Считаются только
+    `combos` — объединение обоих диапазонов.
+    """
+    count = len(boards)
+    size = len(combos)
+    scores = evaluate_with_board(COMBOS[combos], boards).astype(np.int64)
+    on_board = np.zeros((count, 52), dtype=bool)
+    on_board[np.arange(count)[:, None], boards] = True
+    blocked = on_board[:, COMBOS[combos, 0]] | on_board[:, COMBOS[combos, 1]]
+    scores[blocked] = 0
+    hero_weights = np.where(blocked, 0.0, hero)
+    villain_weights = np.where(blocked, 0.0, villain)
+    rows = np.arange(count)[:, None]
+
+    # Все комбинации соперника на каждой доске.
+    order, left, right = _runs((scores + rows * _GROUP).ravel())
+    cumulative = np.concatenate(([0.0], np.cumsum(villain_weights.ravel()[order])))
+    left = left.reshape(count, size)
+    right = right.reshape(count, size)
+    less = cumulative[left] - cumulative[rows * size]
+    equal = cumulative[right] - cumulative[left]
+    available = villain_weights.sum(axis=1, keepdims=True)
+
+    # То же по группам "доска, карта". Сама комбинация героя лежит в группах
+    # обеих своих карт, поэтому границы её серии и есть ответ на запрос.
+    keys = scores[:, layout.combo] + (rows * 52 + layout.card) * _GROUP
+    order, left, right = _runs(keys.ravel())
+    cumulative = np.concatenate(([0.0], np.cumsum(villain_weights[:, layout.combo].ravel()[order])))
+    base = rows * (2 * size)
+    for column in (0, 1):
+        slots = layout.slots[:, column]
+        element = base + slots
+        group_start = cumulative[base + layout.group_start[slots]]
+        element_left = cumulative[left[element]]
+        less = less - (element_left - group_start)
+        equal = equal - (cumulative[right[element]] - element_left)
+        available = available - (cumulative[base + layout.group_end[slots]] - group_start)
+
+    # Своя же комбинация вычтена дважды (по обеим картам) — возвращаем её.
+    equal = equal + villain_weights
+    available = available + villain_weights
+
+    win[combos] += (hero_weights * less).sum(axis=0)
+    tie[combos] += (hero_weights * equal).sum(axis=0)
+    total[combos] += (hero_weights * available).sum(axis=0)
+
+
+def range_equity(hero: Union[HandRange, str], villain: Union[HandRange, str],
+                 board: Optional[List[Card]] = None, dead_cards: Optional[List[Card]] = None,
+                 max_runouts: int = 2000, samples: int = 2000, seed: Optional[int] = None,
+                 chunk_size: int = 64) -> Dict:
+    """
+    Эквити диапазона против диапазона.
+
+    Если досдач не больше `max_runouts` (ривер, терн, флоп), перебираются
+    все; иначе (префлоп) берутся `samples` случайных досдач. На каждой доске
+    оценки всех 1326 комбинаций считаются одним векторным вызовом.
+
+    Args:
+        hero (HandRange | str): Диапазон героя.
+        villain (HandRange | str): Диапазон соперника.
+        board (List[Card]): Открытые общие карты (0, 3, 4 или 5).
+        dead_cards (List[Card]): Карты, вышедшие из игры.
+        max_runouts (int): Порог точного перебора.
+        samples (int): Число случайных досдач, если перебор слишком велик.
+        seed (int): Зерно для выборки досдач.
+        chunk_size (int): Досок за один векторный шаг.
+
+    Returns:
+        Dict: equity, win, tie, runouts, exact и combo_equity — эквити каждой
+        из 1326 комбинаций героя (nan для комбинаций не из диапазона).
+    """
+    hero = _as_range(hero)
+    villain = _as_range(villain)
+    board = _to_codes(board or [])
+    dead = _to_codes(dead_cards or [])
+    if len(board) not in (0, 3, 4, 5):
+        raise ValueError("На доске может быть 0, 3, 4 или 5 карт.")
+    known = board + dead
+    if len(set(known)) != len(known):
+        raise ValueError("Карты повторяются.")
+
+    hero_weights = hero.remove_cards(known).weights
+    villain_weights = villain.remove_cards(known).weights
+    deck = np.array([code for code in range(52) if code not in set(known)], dtype=np.int64)
+    missing = 5 - len(board)
+
+    exact = comb(len(deck), missing) <= max_runouts
+    if exact:
+        runouts = np.array(list(combinations(deck.tolist(), missing)), dtype=np.int64)
+        runouts = runouts.reshape(len(runouts), missing)
+    else:
+        rng = np.random.default_rng(seed)
+        runouts = deck[np.argsort(rng.random((samples, len(deck))), axis=1)[:, :missing]]
+    boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.int64), (len(runouts), len(board))), runouts])
+
+    combos = np.flatnonzero((hero_weights > 0) | (villain_weights > 0))
+    layout = _Layout(combos)
+    win = np.zeros(NUM_COMBOS)
+    tie = np.zeros(NUM_COMBOS)
+    total = np.zeros(NUM_COMBOS)
+    for start in range(0, len(boards), chunk_size):
+        _accumulate(boards[start:start + chunk_size], combos, layout, hero_weights[combos],
+                    villain_weights[combos], win, tie, total)
+
+    matchups = total.sum()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        combo_equity = np.where(total > 0, (win + tie / 2) / total, np.nan)
+    return {
+        'equity': (win.sum() + tie.sum() / 2) / matchups if matchups else 0.0,
+        'win': win.sum() / matchups if matchups else 0.0,
+        'tie': tie.sum() / matchups if matchups else 0.0,
+        'runouts': len(boards),
+        'exact': exact,
+        'combo_equity': combo_equity,
+    }
@@ -0,0 +1,148 @@
+import argparse
+import random
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.betting import RUNOUT_PLAY, manage_betting_rounds
+from src.poker.poker_game.events import EventSink, NULL_SINK, PRINT_SINK
+from src.poker.poker_game.game import PokerGame
+
+
+class Session:
+    def __init__(self, agents: Sequence, stack: int = 1000, min_bet: int = 10, small_blind: int = 10,
+                 big_blind: int = 20, rng=None, sink: EventSink = NULL_SINK, runout: str = RUNOUT_PLAY):
+        """
+        Поток раздач за одним столом с сохранением стеков между раздачами.
+
+        Стол, колода, список мест и список общих карт создаются один раз и
+        переиспользуются: перед раздачей места переставляются на месте
+        (seats[0] — малый блайнд, как в manage_betting_rounds), у агентов
+        сбрасываются ставка и флаг active, а их списки карт очищаются и
+        заполняются заново (PokerGame.deal_cards), колода возвращает курсор
+        в начало. После раздачи малый блайнд переходит к следующему по кругу
+        игроку с деньгами, а проигравшие всё выбывают из-за стола.
+
+        Args:
+            agents (Sequence): Агенты в порядке мест за столом.
+            stack (int): Начальный стек каждого агента.
+            min_bet (int): Минимальная ставка.
+            small_blind (int): Малый блайнд.
+            big_blind (int): Большой блайнд.
+            rng: Генератор для колоды (как у PokerGame); решения RandomAgent
+                по-прежнему используют модуль random.
+            sink (EventSink): Приёмник событий всех раздач.
+            runout (str): Режим all-in (см. manage_betting_rounds).
+        """
+        if len(agents) < 2:
+            raise ValueError("Для сессии нужно не меньше двух агентов.")
+        self.players = list(agents)  # оставшиеся за столом, в порядке мест
+        self.min_bet = min_bet
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.sink = sink
+        self.runout = runout
+        self.game = PokerGame(num_players=0, rng=rng)
+        self.seats = list(self.players)  # порядок мест в текущей раздаче
+        self.game.players = self.seats
+        self.button = 0  # индекс малого блайнда в players
+        self.hands_played = 0
+        self.eliminated: List[Tuple[str, int]] = []  # (имя, номер раздачи) в порядке выбывания
+        for agent in self.players:
+            agent.money = stack
+
+    @property
+    def finished(self) -> bool:
+        return len(self.players) < 2
+
+    def play_hand(self) -> bool:
+        """
+        Играет одну раздачу.
+
+        Returns:
+            bool: False, если за столом меньше двух игроков и раздача не сыграна.
+        """
+        players = self.players
+        count = len(players)
+        if count < 2:
+            return False
+
+        seats = self.seats
+        button = self.button
+        for seat in range(count):
+            agent = players[(button + seat) % count]
+            seats[seat] = agent
+            agent.reset()
+            agent.active = True
+        game = self.game
+        game.community_cards.clear()
+        game.deck.reset()
+        game.deal_cards()
+
+        manage_betting_rounds(agents=seats, min_bet=self.min_bet, game=game,
+                              small_blind=self.small_blind, big_blind=self.big_blind, sink=self.sink,
+                              runout=self.runout)
+        self.hands_played += 1
+        self._advance()
+        return True
+
+    def _advance(self):
+        """Передаёт малый блайнд следующему игроку с деньгами и убирает проигравших."""
+        players = self.players
+        count = len(players)
+        next_blind = None
+        for offset in range(1, count + 1):
+            agent = players[(self.button + offset) % count]
+            if agent.money > 0:
+                next_blind = agent
+                break
+
+        if any(agent.money <= 0 for agent in players):
+            for agent in players:
+                if agent.money <= 0:
+                    self.eliminated.append((agent.name, self.hands_played))
+            players[:] = [agent for agent in players if agent.money > 0]
+            del self.seats[len(players):]
+        self.button = players.index(next_blind) if next_blind is not None else 0
+
+    def run(self, max_hands: Optional[int] = None) -> int:
+        """
+        Играет раздачи, пока за столом не останется один игрок или не будет
+        сыграно `max_hands` раздач (None — без ограничения).
+
+        Returns:
+            int: Число сыгранных раздач.
+        """
+        played = 0
+        while (max_hands is None or played < max_hands) and self.play_hand():
+            played += 1
+        return played
+
+    def standings(self) -> List[Dict]:
+        """Оставшиеся игроки по убыванию стека, затем выбывшие от последнего к первому."""
+        result = [{'name': agent.name, 'money': agent.money}
+                  for agent in sorted(self.players, key=lambda agent: -agent.money)]
+        for name, hand in reversed(self.eliminated):
+            result.append({'name': name, 'money': 0, 'eliminated_at': hand})
+        return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сессия раздач за одним столом до последнего игрока.")
+    parser.add_argument("--agents", type=int, default=6)
+    parser.add_argument("--hands", type=int, default=None, help="Максимум раздач (по умолчанию — до победителя).")
+    parser.add_argument("--stack", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true", help="Печатать ход раздач.")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    session = Session([RandomAgent(f"Agent {i + 1}") for i in range(args.agents)], stack=args.stack,
+                      rng=random.Random(args.seed), sink=PRINT_SINK if args.verbose else NULL_SINK)
+    started = time.perf_counter()
+    hands = session.run(args.hands)
+    elapsed = time.perf_counter() - started
+    print(f"Раздач: {hands}, {hands / elapsed:,.0f} раздач/с")
+    for place, row in enumerate(session.standings(), 1):
+        suffix = f" (выбыл на раздаче {row['eliminated_at']})" if 'eliminated_at' in row else ""
+        print(f"{place}. {row['name']}: {row['money']}{suffix}")
@@ -0,0 +1,75 @@
+from typing import List
+
+
+class TableState:
+    __slots__ = ('seats', 'num_seats', 'active_mask', 'active_count', 'pot', 'current_bet',
+                 'street', 'community_cards')
+
+    def __init__(self, seats=None):
+        """
+        Состояние стола во время раздачи.
+
+        Места хранятся списком агентов, активные места — битовой маской,
+        а их число поддерживается инкрементально, поэтому проверки вида
+        "остался ли один игрок" стоят O(1). Деньги и ставки остаются
+        атрибутами агентов (money, current_bet): их читает make_decision.
+
+        Args:
+            seats (List): Агенты в порядке мест; seats[0] — малый блайнд.
+        """
+        self.seats = []
+        self.num_seats = 0
+        self.active_mask = 0
+        self.active_count = 0
+        self.pot = 0
+        self.current_bet = 0
+        self.street = 0
+        self.community_cards = []
+        if seats is not None:
+            self.start_hand(seats, [], 0)
+
+    def start_hand(self, seats: List, community_cards: List[str], current_bet: int):
+        """
+        Готовит состояние к новой раздаче без создания нового объекта.
+
+        Активными считаются агенты с флагом active.
+        """
+        self.seats = seats
+        self.num_seats = len(seats)
+        mask = 0
+        count = 0
+        for seat, agent in enumerate(seats):
+            if agent.active:
+                mask |= 1 << seat
+                count += 1
+        self.active_mask = mask
+        self.active_count = count
+        self.pot = 0
+        self.current_bet = current_bet
+        self.street = 0
+        self.community_cards = community_cards
+
+    def is_active(self, seat: int) -> bool:
+        return bool(self.active_mask >> seat & 1)
+
+    def fold(self, seat: int):
+        """Выводит место из раздачи."""
+        if self.active_mask >> seat & 1:
+            self.active_mask &= ~(1 << seat)
+            self.active_count -= 1
+        self.seats[seat].active = False
+
+    def last_active(self):
+        """Единственный оставшийся активный агент (или None)."""
+        if self.active_count != 1:
+            return None
+        return self.seats[self.active_mask.bit_length() - 1]
+
+    def active_seats(self) -> List:
+        """Активные агенты в порядке мест."""
+        mask = self.active_mask
+        return [agent for seat, agent in enumerate(self.seats) if mask >> seat & 1]
+
+    def __repr__(self):
+        return (f"TableState(seats={self.num_seats}, active={self.active_count}, "
+                f"pot={self.pot}, street={self.street})")
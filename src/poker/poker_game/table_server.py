@@ -0,0 +1,405 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.betting import RUNOUT_PLAY, betting_steps, hand_steps
+from src.poker.poker_game.events import EventSink, NULL_SINK, TIMEOUT
+from src.poker.poker_game.game import PokerGame
+
+# Протокол бота: TCP, по одному JSON-объекту на строку. Запросы разных столов
+# идут по общему соединению и различаются полем id; ответы могут приходить
+# в любом порядке.
+#   запрос: {"id", "agent", "hole_cards", "community_cards", "current_bet",
+#            "agent_bet", "money", "pot", "min_bet"}
+#   ответ:  {"id", "action": "fold" | "check" | "call" | "raise", "amount"}
+DEFAULT_TIMEOUT = 1.0
+VALID_ACTIONS = frozenset(('fold', 'check', 'call', 'raise'))
+
+Decision = Tuple[str, int]
+
+
+def default_action(agent, current_bet: int) -> Decision:
+    """Действие вместо опоздавшего ответа: чек, если он возможен, иначе фолд."""
+    if current_bet == agent.current_bet:
+        return "check", 0
+    return "fold", 0
+
+
+async def request_decision(agent, community_cards: List[str], current_bet: int, pot: int, min_bet: int,
+                           timeout: float, sink: EventSink = NULL_SINK) -> Tuple[Decision, bool]:
+    """
+    Решение агента с ограничением по времени.
+
+    Агенты с корутиной make_decision_async (удалённые боты) ждутся не дольше
+    `timeout` секунд; обычные агенты вызываются напрямую. Если ответа нет,
+    соединение разорвано или ответ некорректен, используется default_action.
+
+    Returns:
+        Tuple[Decision, bool]: Решение и признак того, что оно по умолчанию.
+    """
+    decide = getattr(agent, 'make_decision_async', None)
+    if decide is None:
+        return agent.make_decision(community_cards=community_cards, current_bet=current_bet,
+                                   pot=pot, min_bet=min_bet), False
+    try:
+        return await asyncio.wait_for(decide(community_cards, current_bet, pot, min_bet), timeout), False
+    except (asyncio.TimeoutError, ConnectionError, OSError, ValueError):
+        decision = default_action(agent, current_bet)
+        if sink.enabled:
+            sink.emit(TIMEOUT, agent.name, 0, decision[0])
+        return decision, True
+
+
+async def async_play_steps(steps, table, min_bet: int, sink: EventSink = NULL_SINK,
+                           timeout: float = DEFAULT_TIMEOUT) -> int:
+    """
+    Асинхронный play_steps: проводит генератор правил (betting_steps или
+    hand_steps), а пока стол ждёт ответа агента, цикл событий обслуживает
+    другие столы.
+
+    Returns:
+        int: Сколько решений было принято по умолчанию.
+    """
+    defaults = 0
+    request = next(steps, None)
+    community_cards = table.community_cards
+    while request is not None:
+        agent, current_bet, pot = request
+        decision, defaulted = await request_decision(agent, community_cards, current_bet, pot, min_bet,
+                                                     timeout, sink)
+        defaults += defaulted
+        try:
+            request = steps.send(decision)
+        except StopIteration:
+            break
+    return defaults
+
+
+async def async_betting_round(table, min_bet: int, small_blind: int, big_blind: int,
+                              sink: EventSink = NULL_SINK, timeout: float = DEFAULT_TIMEOUT,
+                              skip_all_in: bool = False) -> int:
+    """
+    Асинхронный betting_round: правила те же (betting_steps).
+
+    Returns:
+        int: Сколько решений было принято по умолчанию.
+    """
+    return await async_play_steps(betting_steps(table, min_bet, small_blind, big_blind, sink, skip_all_in),
+                                  table, min_bet, sink, timeout)
+
+
+async def async_manage_betting_rounds(agents: List, min_bet: int, game: PokerGame, small_blind: int,
+                                      big_blind: int, sink: EventSink = NULL_SINK,
+                                      timeout: float = DEFAULT_TIMEOUT, runout: str = RUNOUT_PLAY,
+                                      max_boards: int = 20000) -> int:
+    """
+    Асинхронная версия manage_betting_rounds: правила раздачи те же
+    (hand_steps), поэтому и порядок событий совпадает.
+
+    Returns:
+        int: Сколько решений было принято по умолчанию.
+    """
+    steps = hand_steps(agents, min_bet, game, small_blind, big_blind, sink, runout, max_boards, profile=False)
+    return await async_play_steps(steps, game.table, min_bet, sink, timeout)
+
+
+class AsyncTable:
+    def __init__(self, agents: List, stack: int = 1000, min_bet: int = 10, small_blind: int = 10,
+                 big_blind: int = 20, timeout: float = DEFAULT_TIMEOUT, rng=None,
+                 sink: EventSink = NULL_SINK, runout: str = RUNOUT_PLAY):
+        """
+        Стол, который играет раздачи внутри цикла событий.
+
+        Как и battle.play_hand, каждая раздача начинается со стека `stack`,
+        а кнопка сдвигается на одно место за раздачу.
+
+        Args:
+            agents (List): Агенты за столом (локальные или RemoteAgent).
+            timeout (float): Время на одно решение удалённого агента, секунды.
+            rng: Источник случайности колоды (random.Random); у каждого стола свой.
+            sink (EventSink): Приёмник событий стола.
+            runout (str): Режим all-in (см. manage_betting_rounds).
+        """
+        self.agents = agents
+        self.game = PokerGame(num_players=len(agents), rng=rng)
+        self.stack = stack
+        self.min_bet = min_bet
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.timeout = timeout
+        self.sink = sink
+        self.runout = runout
+        self.hands_played = 0
+        self.defaults = 0
+        self.results = [0] * len(agents)
+
+    async def play_hand(self) -> List[int]:
+        """Играет одну раздачу и возвращает выигрыш каждого агента."""
+        agents = self.agents
+        button = self.hands_played % len(agents)
+        seats = agents[button:] + agents[:button]
+        for agent in agents:
+            agent.reset()
+            agent.active = True
+            agent.money = self.stack
+        game = self.game
+        game.players = seats
+        game.community_cards = []
+        game.deck.reset()
+        game.deal_cards()
+
+        self.defaults += await async_manage_betting_rounds(seats, self.min_bet, game, self.small_blind,
+                                                           self.big_blind, self.sink, self.timeout,
+                                                           self.runout)
+        self.hands_played += 1
+        results = [agent.money - self.stack for agent in agents]
+        for seat, result in enumerate(results):
+            self.results[seat] += result
+        return results
+
+    async def run(self, hands: int) -> List[int]:
+        """Играет `hands` раздач подряд и возвращает суммарный результат по агентам."""
+        for _ in range(hands):
+            await self.play_hand()
+        return self.results
+
+
+async def run_tables(tables: Sequence[AsyncTable], hands: int) -> List[List[int]]:
+    """Играет по `hands` раздач на всех столах одновременно в одном цикле событий."""
+    return await asyncio.gather(*(table.run(hands) for table in tables))
+
+
+class BotConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Соединение с процессом бота.
+
+        Запросы мультиплексируются: у каждого свой id, ответ находит своё
+        ожидание по id, поэтому один медленный ответ не задерживает остальные.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.ids = itertools.count()
+        self.closed = False
+        self.task = asyncio.get_running_loop().create_task(self._read())
+
+    async def request(self, message: Dict) -> Dict:
+        if self.closed:
+            raise ConnectionError("Соединение с ботом закрыто.")
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        message['id'] = request_id
+        try:
+            self.writer.write(json.dumps(message, ensure_ascii=False).encode() + b'\n')
+            await self.writer.drain()
+            return await future
+        finally:
+            self.pending.pop(request_id, None)
+
+    async def _read(self):
+        try:
+            async for line in self.reader:
+                response = json.loads(line)
+                future = self.pending.get(response.get('id'))
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self.closed = True
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Соединение с ботом разорвано."))
+
+    async def close(self):
+        self.closed = True
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        self.task.cancel()
+
+
+class ConnectionPool:
+    def __init__(self, host: str, port: int, size: int = 4):
+        """
+        Пул соединений с процессом бота.
+
+        Соединения открываются при первом запросе и переоткрываются после
+        разрыва; запросы распределяются между ними по кругу.
+
+        Args:
+            host (str): Адрес бота.
+            port (int): Порт бота.
+            size (int): Количество соединений.
+        """
+        self.host = host
+        self.port = port
+        self.size = size
+        self.connections: List[Optional[BotConnection]] = [None] * size
+        self._locks = [asyncio.Lock() for _ in range(size)]
+        self._next = itertools.cycle(range(size))
+
+    async def request(self, message: Dict) -> Dict:
+        index = next(self._next)
+        connection = self.connections[index]
+        if connection is None or connection.closed:
+            async with self._locks[index]:
+                connection = self.connections[index]
+                if connection is None or connection.closed:
+                    reader, writer = await asyncio.open_connection(self.host, self.port)
+                    connection = self.connections[index] = BotConnection(reader, writer)
+        return await connection.request(message)
+
+    async def close(self):
+        for index, connection in enumerate(self.connections):
+            if connection is not None:
+                await connection.close()
+                self.connections[index] = None
+
+
+class RemoteAgent:
+    def __init__(self, name: str, pool: ConnectionPool):
+        """Агент, решения которого принимает бот в другом процессе (см. протокол выше)."""
+        self.name = name
+        self.pool = pool
+        self.cards = []
+        self.money = 1000
+        self.current_bet = 0
+        self.active = True
+
+    def receive_cards(self, cards):
+        self.cards = cards
+
+    async def make_decision_async(self, community_cards, current_bet, pot, min_bet) -> Decision:
+        response = await self.pool.request({
+            'agent': self.name,
+            'hole_cards': self.cards,
+            'community_cards': list(community_cards),
+            'current_bet': current_bet,
+            'agent_bet': self.current_bet,
+            'money': self.money,
+            'pot': pot,
+            'min_bet': min_bet,
+        })
+        action = response.get('action')
+        if action not in VALID_ACTIONS:
+            raise ValueError(f"Некорректный ответ бота: {response!r}")
+        return action, int(response.get('amount', 0))
+
+    def reset(self):
+        self.cards.clear()
+        self.current_bet = 0
+
+
+def random_policy(message: Dict) -> Decision:
+    """Решение по правилам RandomAgent для запроса протокола."""
+    agent = RandomAgent(message['agent'])
+    agent.money = message['money']
+    agent.current_bet = message['agent_bet']
+    return agent.make_decision(message['community_cards'], message['current_bet'], message['pot'],
+                               message['min_bet'])
+
+
+async def serve_bot(host: str = '127.0.0.1', port: int = 0,
+                    policy: Callable[[Dict], Decision] = random_policy) -> asyncio.AbstractServer:
+    """
+    Запускает простой бот-сервер по протоколу стола (для локальных прогонов и тестов).
+
+    Args:
+        host (str): Адрес.
+        port (int): Порт; 0 — выбрать свободный (см. server.sockets).
+        policy (Callable): Функция запроса -> (действие, сумма); может быть
+            корутиной — тогда запросы одного соединения обрабатываются параллельно.
+
+    Returns:
+        asyncio.AbstractServer: Запущенный сервер.
+    """
+    async def answer(message, writer):
+        decision = policy(message)
+        if asyncio.iscoroutine(decision):
+            decision = await decision
+        action, amount = decision
+        writer.write(json.dumps({'id': message['id'], 'action': action, 'amount': amount}).encode() + b'\n')
+
+    async def handle(reader, writer):
+        tasks = set()
+        try:
+            async for line in reader:
+                task = asyncio.ensure_future(answer(json.loads(line), writer))
+                if not task.done():
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+async def _main(args):
+    server = None
+    host, port = args.bot_host, args.bot_port
+    if port is None:
+        server = await serve_bot()
+        host, port = server.sockets[0].getsockname()[:2]
+    pool = ConnectionPool(host, port, size=args.connections)
+
+    tables = []
+    for index in range(args.tables):
+        agents = [RemoteAgent(f"Bot {i+1}", pool) if i < args.remote else RandomAgent(f"Agent {i+1}")
+                  for i in range(args.agents)]
+        tables.append(AsyncTable(agents, timeout=args.timeout, rng=random.Random(f"{args.seed}:{index}")))
+
+    started = time.perf_counter()
+    await run_tables(tables, args.hands)
+    elapsed = time.perf_counter() - started
+    hands = sum(table.hands_played for table in tables)
+    defaults = sum(table.defaults for table in tables)
+    print(f"{args.tables} столов, {hands} раздач за {elapsed:.2f} с ({hands / elapsed:.0f} раздач/с), "
+          f"решений по умолчанию: {defaults}")
+
+    await pool.close()
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+
+async def _serve_forever(host: str, port: int):
+    server = await serve_bot(host, port)
+    print(f"Бот слушает {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Асинхронные столы с удалёнными ботами.")
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--hands", type=int, default=100, help="Раздач на каждом столе.")
+    parser.add_argument("--agents", type=int, default=6)
+    parser.add_argument("--remote", type=int, default=2, help="Сколько мест за столом у удалённых ботов.")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bot-host", default='127.0.0.1')
+    parser.add_argument("--bot-port", type=int, default=None,
+                        help="Порт внешнего бота; по умолчанию запускается локальный.")
+    parser.add_argument("--serve-bot", action="store_true", help="Только запустить бот-сервер на --bot-port.")
+    args = parser.parse_args()
+
+    if args.serve_bot:
+        asyncio.run(_serve_forever(args.bot_host, args.bot_port or 9000))
+    else:
+        asyncio.run(_main(args))
@@ -0,0 +1,82 @@
+from typing import Iterable, List, Tuple
+
+# Порядок рангов и мастей совпадает с порядком в Deck, поэтому код карты
+# равен её индексу в свежей колоде: code = rank * 4 + suit.
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+SUITS = ['♠', '♣', '♦', '♥']
+CARDS = [f"{value}{suit}" for value in RANKS for suit in SUITS]
+CARD_CODES = {card: code for code, card in enumerate(CARDS)}
+
+
+def card_to_int(card: str) -> int:
+    """
+    Переводит строковую карту в целочисленный код.
+
+    Args:
+        card (str): Карта в формате "рангмасть" (например, "10♥").
+
+    Returns:
+        int: Код карты от 0 до 51.
+    """
+    try:
+        return CARD_CODES[card]
+    except KeyError:
+        raise ValueError(f"Неизвестная карта: {card!r}") from None
+
+
+def int_to_card(code: int) -> str:
+    """
+    Переводит целочисленный код карты в строку.
+
+    Args:
+        code (int): Код карты от 0 до 51.
+
+    Returns:
+        str: Карта в формате "рангмасть".
+    """
+    return CARDS[code]
+
+
+def cards_to_ints(cards: Iterable[str]) -> List[int]:
+    """Переводит список строковых карт в список кодов."""
+    return [card_to_int(card) for card in cards]
+
+
+def ints_to_cards(codes: Iterable[int]) -> List[str]:
+    """Переводит список кодов в список строковых карт."""
+    return [CARDS[code] for code in codes]
+
+
+def canonical_cards(*groups: Iterable[int]) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Переставляет масти так, чтобы изоморфные расклады совпали.
+
+    Расклады, отличающиеся только перестановкой мастей (A♠K♠ на одной доске
+    и A♥K♥ на доске с переставленными мастями), дают одинаковый результат.
+    Масти упорядочиваются по подписи — рангам этой масти в каждой группе;
+    у неразличимых мастей подписи совпадают, поэтому порядок между ними
+    на результат не влияет. Внутри группы карты сортируются по убыванию.
+
+    Args:
+        *groups (Iterable[int]): Группы кодов карт (например, карты на руках
+            и общие карты); порядок карт внутри группы не важен.
+
+    Returns:
+        Tuple[Tuple[int, ...], ...]: Группы с переставленными мастями.
+    """
+    groups = [tuple(group) for group in groups]
+    signatures = []
+    for suit in range(4):
+        signature = tuple(
+            sorted((code >> 2 for code in group if code & 3 == suit), reverse=True)
+            for group in groups
+        )
+        signatures.append((signature, suit))
+    signatures.sort(reverse=True)
+    mapping = [0] * 4
+    for new_suit, (_, suit) in enumerate(signatures):
+        mapping[suit] = new_suit
+    return tuple(
+        tuple(sorted(((code & ~3) | mapping[code & 3] for code in group), reverse=True))
+        for group in groups
+    )
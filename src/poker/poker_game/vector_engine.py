@@ -0,0 +1,229 @@
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from src.poker.agents.batch import ACTIONS, CALL, CHECK, FOLD, RAISE  # коды действий пакетного протокола
+from .hand_evaluation import evaluate_hands_batch
+
+# Сколько общих карт открыто на каждом раунде ставок.
+BOARD_SIZES = [0, 3, 4, 5]
+
+
+class VectorizedTables:
+    def __init__(self, num_tables: int, num_players: int, starting_money: int = 1000,
+                 min_bet: int = 10, small_blind: int = 10, big_blind: int = 20,
+                 rng: Union[np.random.Generator, int, None] = None):
+        """
+        Состояние K столов в виде массивов (struct-of-arrays).
+
+        Все столы проходят префлоп, флоп, терн и ривер синхронно; на каждом
+        шаге ходит одно и то же место за всеми столами, где оно ещё в игре.
+        Правила повторяют betting.betting_round и manage_betting_rounds.
+
+        Args:
+            num_tables (int): Количество столов K.
+            num_players (int): Игроков за каждым столом.
+            starting_money (int): Начальный стек.
+            min_bet (int): Минимальная ставка.
+            small_blind (int): Размер малого блайнда.
+            big_blind (int): Размер большого блайнда.
+            rng: Генератор NumPy или зерно для раздачи карт.
+        """
+        if num_players < 2:
+            raise ValueError("Нужно хотя бы 2 игрока за столом.")
+        if 2 * num_players + 5 > 52:
+            raise ValueError("Слишком много игроков для одной колоды.")
+        self.num_tables = num_tables
+        self.num_players = num_players
+        self.min_bet = min_bet
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.rng = np.random.default_rng(rng)
+
+        self.money = np.full((num_tables, num_players), starting_money, dtype=np.int64)
+        self.bets = np.zeros((num_tables, num_players), dtype=np.int64)
+        self.active = np.ones((num_tables, num_players), dtype=bool)
+        self.active_count = np.full(num_tables, num_players, dtype=np.int64)
+        self.pot = np.zeros(num_tables, dtype=np.int64)
+        self.current_bet = np.full(num_tables, min_bet, dtype=np.int64)
+        self.finished = np.zeros(num_tables, dtype=bool)
+        self.hole_cards = np.zeros((num_tables, num_players, 2), dtype=np.int64)
+        self.board = np.zeros((num_tables, 5), dtype=np.int64)
+        self.street = 0
+        self.actions_taken = 0
+
+    def reset_hand(self):
+        """Сбрасывает состояние раздачи; стеки сохраняются."""
+        self.bets.fill(0)
+        self.active.fill(True)
+        self.active_count.fill(self.num_players)
+        self.pot.fill(0)
+        self.current_bet.fill(self.min_bet)
+        self.finished.fill(False)
+        self.street = 0
+
+    def deal(self, decks: Optional[np.ndarray] = None):
+        """
+        Раздаёт карты на всех столах.
+
+        Args:
+            decks (np.ndarray): Порядок выдачи карт формы (K, >= 2N + 5); первая
+                карта строки выдаётся первой. По умолчанию — случайные колоды.
+        """
+        needed = 2 * self.num_players + 5
+        if decks is None:
+            decks = np.argsort(self.rng.random((self.num_tables, 52)), axis=1)[:, :needed]
+        decks = np.asarray(decks, dtype=np.int64)
+        # Как в PokerGame.deal_cards: каждый игрок получает две карты подряд.
+        self.hole_cards[:] = decks[:, :2 * self.num_players].reshape(self.num_tables, self.num_players, 2)
+        self.board[:] = decks[:, 2 * self.num_players:needed]
+
+    def play_hand(self, policies, decks: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Разыгрывает одну раздачу на всех столах.
+
+        Args:
+            policies: Пакетный агент для всех мест или список агентов по местам;
+                у агента должен быть метод decide_batch (агентов с
+                make_decision оборачивает agents.batch.PerSeatAdapter).
+            decks (np.ndarray): Порядок карт (см. deal).
+
+        Returns:
+            np.ndarray: Изменение стеков за раздачу, форма (K, N).
+        """
+        policies = _policies_for_seats(policies, self.num_players)
+        start = self.money.copy()
+        self.reset_hand()
+        self.deal(decks)
+
+        for round_number in range(4):
+            self.street = round_number
+            self._betting_round(policies, round_number)
+
+            # Остался один игрок — он забирает банк.
+            alone = ~self.finished & (self.active_count == 1)
+            if alone.any():
+                rows = np.flatnonzero(alone)
+                seats = self.active[rows].argmax(axis=1)
+                self.money[rows, seats] += self.pot[rows]
+                self.finished[rows] = True
+            if self.finished.all():
+                break
+
+        self._showdown()
+        return self.money - start
+
+    def play(self, policies, num_hands: int) -> np.ndarray:
+        """Разыгрывает `num_hands` раздач подряд и возвращает суммарный результат (K, N)."""
+        total = np.zeros((self.num_tables, self.num_players), dtype=np.int64)
+        for _ in range(num_hands):
+            total += self.play_hand(policies)
+        return total
+
+    def _post_blinds(self):
+        rows = np.flatnonzero(~self.finished)
+        for seat, blind in ((0, self.small_blind), (1, self.big_blind)):
+            paid = np.minimum(self.money[rows, seat], blind)
+            self.money[rows, seat] -= paid
+            self.bets[rows, seat] = paid
+            self.pot[rows] += paid
+        self.current_bet[rows] = self.bets[rows, 1]
+
+    def _betting_round(self, policies, round_number: int):
+        if round_number == 0:
+            self._post_blinds()
+
+        done = self.finished.copy()
+        # В первом проходе префлопа блайнды пропускают ход (флаг в betting_round).
+        skipped = np.zeros(self.num_tables, dtype=np.int64)
+        board = self.board[:, :BOARD_SIZES[round_number]]
+
+        while not done.all():
+            raised = np.zeros(self.num_tables, dtype=bool)
+            for seat in range(self.num_players):
+                acting = ~done
+                if round_number == 0 and seat < 2:
+                    skip = acting & (skipped != 2)
+                    skipped[skip] += 1
+                    acting &= ~skip
+                acting &= self.active[:, seat]
+
+                # Если активный игрок остался один, раунд на этом столе окончен.
+                alone = acting & (self.active_count == 1)
+                done |= alone
+                acting &= ~alone
+
+                rows = np.flatnonzero(acting)
+                if len(rows):
+                    raised[rows] |= self._act(policies[seat], rows, seat, board)
+
+            behind = (self.active & (self.bets < self.current_bet[:, None])).any(axis=1)
+            done |= ~(raised | behind)
+
+    def _act(self, policy, rows: np.ndarray, seat: int, board: np.ndarray) -> np.ndarray:
+        current_bet = self.current_bet[rows]
+        agent_bet = self.bets[rows, seat]
+        money = self.money[rows, seat]
+        actions, amounts = policy.decide_batch(
+            rows=rows, seat=seat, current_bet=current_bet, agent_bet=agent_bet,
+            money=money, pot=self.pot[rows], min_bet=self.min_bet,
+            hole_cards=self.hole_cards[rows, seat], community_cards=board[rows],
+        )
+        actions = np.asarray(actions)
+        amounts = np.asarray(amounts, dtype=np.int64)
+        self.actions_taken += len(rows)
+
+        # Колл: доплачиваем до текущей ставки или идём ва-банк.
+        calls = actions == CALL
+        to_call = np.where(calls, np.maximum(current_bet - agent_bet, 0), 0)
+        paid = np.minimum(to_call, money)
+
+        # Рейз: сумма сверх текущей ставки агента; если ставки ещё не было,
+        # сначала уравнивается текущая ставка.
+        raises = actions == RAISE
+        legal = raises & (amounts + agent_bet > current_bet) & (money >= amounts + current_bet)
+        first_bet = legal & (agent_bet == 0)
+        raise_paid = np.where(legal, amounts, 0) + np.where(first_bet, current_bet, 0)
+        new_agent_bet = np.where(first_bet, current_bet, agent_bet) + paid + np.where(legal, amounts, 0)
+
+        self.money[rows, seat] = money - paid - raise_paid
+        self.bets[rows, seat] = new_agent_bet
+        self.pot[rows] += paid + raise_paid
+        self.current_bet[rows] = current_bet + np.where(legal, amounts, 0)
+
+        # Фолд, а также недопустимый рейз, который считается фолдом.
+        folds = (actions == FOLD) | (raises & ~legal)
+        if folds.any():
+            folded = rows[folds]
+            self.active[folded, seat] = False
+            self.active_count[folded] -= 1
+        return legal
+
+    def _showdown(self):
+        rows = np.flatnonzero(~self.finished)
+        if not len(rows):
+            return
+        hands = np.concatenate([
+            self.hole_cards[rows],
+            np.broadcast_to(self.board[rows, None, :], (len(rows), self.num_players, 5)),
+        ], axis=2).reshape(-1, 7)
+        scores = evaluate_hands_batch(hands).reshape(len(rows), self.num_players).astype(np.int64)
+        scores[~self.active[rows]] = -1
+
+        winners = scores == scores.max(axis=1, keepdims=True)
+        counts = winners.sum(axis=1)
+        share = self.pot[rows] // counts
+        self.money[rows] += winners * share[:, None]
+        # Остаток от деления получает первый по порядку победитель.
+        first = winners.argmax(axis=1)
+        self.money[rows, first] += self.pot[rows] - share * counts
+        self.finished[rows] = True
+
+
+def _policies_for_seats(policies: Sequence, num_players: int) -> List:
+    """Приводит одного агента или список агентов к списку по местам."""
+    if isinstance(policies, (list, tuple)):
+        if len(policies) != num_players:
+            raise ValueError("Количество агентов не совпадает с числом мест.")
+        return list(policies)
+    return [policies] * num_players
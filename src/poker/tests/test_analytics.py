@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.analytics import FIELDS, AnalyticsSink, analyze_history
+from src.poker.poker_game.betting import RUNOUT_EV, RUNOUT_MODES, manage_betting_rounds
+from src.poker.poker_game.events import EQUITY_SHARE, HAND_END, ListSink, TeeSink
+from src.poker.poker_game.game import PokerGame
+from src.poker.poker_game.history import HandHistoryWriter
+
+NAMES = [f"Agent {seat + 1}" for seat in range(4)]
+HANDS = 300
+
+
+class Caller(RandomAgent):
+    """Всегда уравнивает."""
+
+    def make_decision(self, community_cards, current_bet, pot, min_bet):
+        if current_bet == self.current_bet:
+            return "check", 0
+        return "call", min(current_bet - self.current_bet, self.money)
+
+
+def play_hands(path, runout, agents=None, hands=HANDS, stack=None, seed=0):
+    """Раздачи в оба приёмника сразу; по умолчанию — короткие случайные стеки (частые all-in на префлопе)."""
+    random.seed(seed)
+    analytics = AnalyticsSink()
+    events = ListSink()
+    writer = HandHistoryWriter(path)
+    agents = agents or [RandomAgent(name) for name in NAMES]
+    for _ in range(hands):
+        game = PokerGame(num_players=0)
+        game.players = agents
+        for agent in agents:
+            agent.reset()
+            agent.active = True
+            agent.money = stack or random.randint(30, 300)
+        game.deal_cards()
+        manage_betting_rounds(agents, 10, game, 10, 20, sink=TeeSink(analytics, writer, events), runout=runout)
+    writer.close()
+    return analytics.stats, events.events
+
+
+def test_preflop_all_in_counts_as_seen_flop(tmp_path):
+    # Стек равен большому блайнду: оба игрока all-in на префлопе, и в
+    # RUNOUT_EV банк делится без сдачи доски.
+    path = str(tmp_path / 'hands.phh')
+    names = NAMES[:2]
+    live, _ = play_hands(path, RUNOUT_EV, [Caller(name) for name in names], hands=5, stack=20)
+    recorded = analyze_history(path, names)
+    for stats in (live, recorded):
+        for name, row in stats.by_agent().items():
+            assert (row.hands, row.saw_flop, row.showdown) == (5, 5, 5)
+            assert stats.summary()[name]['wtsd'] == 1.0
+
+
+@pytest.mark.parametrize('runout', RUNOUT_MODES)
+def test_history_and_sink_statistics_agree(tmp_path, runout):
+    path = str(tmp_path / 'hands.phh')
+    live, events = play_hands(path, runout)
+    recorded = analyze_history(path, NAMES, chunk_size=64)
+
+    assert set(live.players) == set(recorded.players)
+    for key, stats in live.players.items():
+        assert stats.showdown <= stats.saw_flop
+        assert {field: getattr(stats, field) for field in FIELDS} == \
+            {field: getattr(recorded.players[key], field) for field in FIELDS}
+    assert live.summary() == recorded.summary()
+
+    summary = live.summary()
+    assert sum(row['hands'] for row in summary.values()) == HANDS * len(NAMES)
+    for row in summary.values():
+        assert 0.0 <= row['wtsd'] <= 1.0
+        for stats in row['positions'].values():
+            assert 0.0 <= stats['wtsd'] <= 1.0
+
+    if runout == RUNOUT_EV:
+        # Вскрытия all-in на префлопе действительно были: банк поделён по
+        # эквити, а доска так и не сдана.
+        shared = False
+        preflop_showdowns = 0
+        for kind, _, _, info in events:
+            if kind == EQUITY_SHARE:
+                shared = True
+            elif kind == HAND_END:
+                preflop_showdowns += shared and not info[1]
+                shared = False
+        assert preflop_showdowns > 0
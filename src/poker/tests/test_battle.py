@@ -0,0 +1,54 @@
+import pytest
+
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.battle import AgentStats, play_hand, replay_hand, run_matchup
+from src.poker.poker_game.betting import RUNOUT_MODES
+from src.poker.poker_game.events import HAND_END, ListSink
+from src.poker.poker_game.game import PokerGame
+
+SPECS = [(f"Agent {i + 1}", RandomAgent) for i in range(4)]
+HANDS = 300
+SEED = 11
+
+
+def serial_results(runout):
+    """Все раздачи подряд в одном процессе и одной игре."""
+    agents = [factory(name) for name, factory in SPECS]
+    game = PokerGame(num_players=len(agents))
+    return [play_hand(agents, game, hand, SEED, runout=runout) for hand in range(HANDS)]
+
+
+@pytest.mark.parametrize('runout', RUNOUT_MODES)
+def test_parallel_matchup_matches_serial_play(runout):
+    parallel = run_matchup(SPECS, HANDS, seed=SEED, processes=2, chunk_size=70, runout=runout)
+    single = run_matchup(SPECS, HANDS, seed=SEED, processes=1, chunk_size=HANDS, runout=runout)
+    assert parallel['hands'] == single['hands'] == HANDS
+    assert parallel['agents'] == single['agents']
+
+    totals = [AgentStats(name) for name, _ in SPECS]
+    for results in serial_results(runout):
+        for accumulator, result in zip(totals, results):
+            accumulator.add(result)
+    assert parallel['agents'] == {accumulator.name: accumulator.summary(20) for accumulator in totals}
+    assert sum(stats['chips'] for stats in parallel['agents'].values()) == 0
+
+
+def test_replay_hand_reproduces_hand_from_session():
+    results = serial_results('play')
+    for hand in (0, 7, 123, HANDS - 1):
+        sink = ListSink()
+        assert replay_hand(SPECS, hand, SEED, sink=sink) == results[hand]
+        assert sink.events[-1][0] == HAND_END
+
+
+def test_agent_stats_merge_equals_single_accumulator():
+    values = [40, -20, 0, 300, -1000, 15, -15]
+    whole = AgentStats("A")
+    left, right = AgentStats("A"), AgentStats("A")
+    for index, value in enumerate(values):
+        whole.add(value)
+        (left if index < 3 else right).add(value)
+    left.merge(right)
+    assert left.summary(20) == whole.summary(20)
+    assert (whole.hands, whole.won, whole.total) == (7, 3, sum(values))
+    assert AgentStats("B").summary(20)['hands'] == 0
@@ -0,0 +1,154 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.betting import (RUNOUT_DEAL, RUNOUT_EV, manage_betting_rounds, pot_layers, settle_by_equity,
+                                          split_pot)
+from src.poker.poker_game.equity import showdown_equities
+from src.poker.poker_game.events import ALL_IN, EQUITY_SHARE, NULL_SINK, ListSink
+from src.poker.poker_game.game import PokerGame
+from src.poker.poker_game.hand_evaluation import evaluate_hand
+from src.poker.poker_game.table import TableState
+
+STACKS = [1000, 300, 600]
+# Вклады: J ставит 990 (10 остаются за ним), короткий A — все 300, B — все 600.
+BEHIND = 1000 - 990
+MAIN_POT = 3 * 300
+SIDE_POT = 2 * 300
+UNCALLED = 990 - 600
+
+
+class Jam(RandomAgent):
+    """Сразу ставит весь стек."""
+
+    def make_decision(self, community_cards, current_bet, pot, min_bet):
+        if self.money <= 0:
+            return "fold", 0
+        amount = self.money - current_bet
+        if amount > 0 and self.money >= amount + current_bet:
+            return "raise", amount
+        return "call", 0
+
+
+class Call(RandomAgent):
+    """Уравнивает любую ставку."""
+
+    def make_decision(self, community_cards, current_bet, pot, min_bet):
+        return "call", 0
+
+
+class CountingRandom(random.Random):
+    """Считает вызовы random(), чтобы проверить, сколько генератора съела раздача."""
+
+    def __init__(self, seed):
+        super().__init__(seed)
+        self.calls = 0
+
+    def random(self):
+        self.calls += 1
+        return super().random()
+
+
+def play_all_in(runout, seed, sink=NULL_SINK):
+    agents = [Jam("J"), Call("A"), Call("B")]
+    game = PokerGame(num_players=0, rng=CountingRandom(seed))
+    game.players = agents
+    for agent, stack in zip(agents, STACKS):
+        agent.money = stack
+    game.deal_cards()
+    manage_betting_rounds(agents, 10, game, 10, 20, sink=sink, runout=runout)
+    return agents, game
+
+
+def test_pot_layers_and_split_with_dead_money():
+    seats = [Jam("J"), Call("A"), Call("B"), Call("F")]
+    for agent, bet in zip(seats, [990, 300, 600, 20]):
+        agent.current_bet = bet
+    seats[3].active = False
+    table = TableState(seats)
+    table.pot = 990 + 300 + 600 + 20
+
+    layers = pot_layers(table)
+    # Сброшенная ставка F остаётся в основном банке, но F на него не претендует.
+    assert layers == [[MAIN_POT + 20, [0, 1, 2]], [SIDE_POT, [0, 2]], [UNCALLED, [0]]]
+
+    # A сильнее всех, B сильнее J: каждому — его слой.
+    assert split_pot(layers, np.array([[1, 3, 2]])) == [UNCALLED, MAIN_POT + 20, SIDE_POT]
+    # Ничья A и B на основном банке, B забирает побочный.
+    assert split_pot(layers, np.array([[1, 3, 3]])) == [UNCALLED, 460, 460 + SIDE_POT]
+    # Две доски, по одной победе у каждого: нечётная фишка при равных долях — раньше сидящему.
+    assert split_pot([[901, [0, 1]]], np.array([[2, 1], [1, 2]])) == [451, 450]
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_deal_runout_pays_side_pots(seed):
+    sink = ListSink()
+    agents, game = play_all_in(RUNOUT_DEAL, seed, sink)
+    assert [agent.current_bet for agent in agents] == [990, 300, 600]
+    assert sum(agent.money for agent in agents) == sum(STACKS)
+    assert {event[1] for event in sink.events if event[0] == ALL_IN} >= {"A", "B"}
+
+    assert len(game.community_cards) == 5
+    score = {agent.name: evaluate_hand(agent.cards + game.community_cards)['score'] for agent in agents}
+    expected = {"J": BEHIND + UNCALLED, "A": 0, "B": 0}
+    for amount, names in [(MAIN_POT, "JAB"), (SIDE_POT, "JB")]:
+        best = max(score[name] for name in names)
+        winners = [name for name in names if score[name] == best]
+        for name in winners:
+            expected[name] += amount // len(winners)
+    assert {agent.name: agent.money for agent in agents} == expected
+
+
+def test_ev_runout_splits_side_pots_by_equity():
+    sink = ListSink()
+    agents, game = play_all_in(RUNOUT_EV, 3, sink)
+    assert sum(agent.money for agent in agents) == sum(STACKS)
+    # Доска не сдаётся; генератор колоды ушёл на закрытые карты и одно зерно досок.
+    assert game.community_cards == []
+    assert game.deck.rng.calls == game.deck.position + 1 == 7
+
+    jam, short, big = agents
+    shares = {event[1]: event[2] for event in sink.events if event[0] == EQUITY_SHARE}
+    assert shares == {"J": jam.money - BEHIND, "A": short.money, "B": big.money}
+    three_way = showdown_equities([jam.cards, short.cards, big.cards], seed=1)['equity']
+    heads_up = showdown_equities([jam.cards, big.cards], dead_cards=short.cards, seed=1)['equity']
+    assert short.money == pytest.approx(MAIN_POT * three_way[1], abs=20)
+    assert big.money == pytest.approx(MAIN_POT * three_way[2] + SIDE_POT * heads_up[1], abs=20)
+    assert jam.money >= BEHIND + UNCALLED
+
+    again, _ = play_all_in(RUNOUT_EV, 3)
+    assert [agent.money for agent in again] == [agent.money for agent in agents]
+
+
+def test_ev_samples_are_independent_between_hands():
+    # Одни и те же руки all-in на префлопе: каждая раздача берёт своё зерно
+    # досок из генератора колоды, и ошибка выборки усредняется.
+    shares = []
+    for seed in range(20):
+        seats = [Call("A"), Call("B")]
+        for agent, cards in zip(seats, [['A♠', 'K♠'], ['Q♥', 'Q♦']]):
+            agent.cards = cards
+            agent.current_bet = 500
+            agent.money = 0
+        table = TableState(seats)
+        table.pot = 1000
+        game = PokerGame(num_players=0, rng=random.Random(seed))
+        settle_by_equity(table, game, max_boards=1000, sink=NULL_SINK)
+        shares.append(seats[0].money)
+        assert seats[0].money + seats[1].money == 1000
+
+    assert len(set(shares)) > 1
+    exact = showdown_equities([['A♠', 'K♠'], ['Q♥', 'Q♦']], seed=1)['equity'][0]
+    assert np.mean(shares) == pytest.approx(1000 * exact, abs=15)
+
+
+@pytest.mark.parametrize('runout', [RUNOUT_DEAL, RUNOUT_EV])
+def test_short_stacks_never_win_more_than_they_cover(runout):
+    for seed in range(100, 160):
+        agents, _ = play_all_in(runout, seed)
+        money = [agent.money for agent in agents]
+        assert sum(money) == sum(STACKS)
+        assert money[1] <= MAIN_POT and money[2] <= MAIN_POT + SIDE_POT
+        assert money[0] >= BEHIND + UNCALLED
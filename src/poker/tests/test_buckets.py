@@ -0,0 +1,90 @@
+import os
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from src.poker.poker_game.buckets import (FEATURES, BucketTables, _class_path, _StreetTable, _write_street,
+                                          build_buckets, canonical_key, canonical_keys, street_path)
+from src.poker.poker_game.equity_tables import NUM_CLASSES, canonical_flop_key
+
+
+def random_deals(rng, count, board_size):
+    cards = np.argsort(rng.random((count, 52)), axis=1)[:, :2 + board_size]
+    return cards[:, :2], cards[:, 2:]
+
+
+@pytest.mark.parametrize('board_size', [0, 3, 4, 5])
+def test_canonical_keys_match_scalar_version(board_size):
+    rng = np.random.default_rng(board_size)
+    holes, boards = random_deals(rng, 500, board_size)
+    keys = canonical_keys(holes, boards)
+    assert keys.tolist() == [canonical_key(hole, board) for hole, board in zip(holes.tolist(), boards.tolist())]
+
+    # Перестановка мастей не меняет ключ.
+    permutation = rng.permutation(4)
+    assert canonical_keys((holes & ~3) | permutation[holes & 3], (boards & ~3) | permutation[boards & 3]).tolist() \
+        == keys.tolist()
+
+
+def test_canonical_key_matches_flop_tables():
+    rng = np.random.default_rng(1)
+    holes, boards = random_deals(rng, 300, 3)
+    for hole, board in zip(holes.tolist(), boards.tolist()):
+        assert canonical_key(hole, board) == canonical_flop_key(hole, board)
+
+
+def test_canonical_keys_count_isomorphic_hands():
+    # Векторные ключи разбивают руки на те же классы, что и canonical_key;
+    # на префлопе их ровно 169.
+    hole = [48, 44]  # A♠ K♠
+    boards = np.array(list(combinations([code for code in range(52) if code not in hole], 3)), dtype=np.int64)
+    keys = canonical_keys(np.tile(hole, (len(boards), 1)), boards)
+    assert len(np.unique(keys)) == len({canonical_key(hole, board) for board in boards.tolist()})
+    preflop = np.array(list(combinations(range(52), 2)), dtype=np.int64)
+    assert len(np.unique(canonical_keys(preflop, np.empty((len(preflop), 0))))) == NUM_CLASSES
+
+
+def test_hash_table_finds_every_key(tmp_path):
+    rng = np.random.default_rng(2)
+    keys = np.unique(rng.integers(0, 52 ** 7, size=5000))
+    # Соседние ключи с одинаковыми старшими битами хэша проверяют пробирование.
+    keys = np.unique(np.concatenate([keys, np.arange(1000, 1300)]))
+    buckets = rng.integers(0, 50, size=len(keys))
+    centers = rng.random((50, len(FEATURES))).astype(np.float32)
+    path = str(tmp_path / 'flop.bkt')
+    _write_street(path, 3, keys, buckets, centers)
+
+    table = _StreetTable(path)
+    assert (table.board_size, table.num_buckets, table.size) == (3, 50, len(keys))
+    assert np.array(table.centers).tolist() == centers.tolist()
+    assert [table.lookup(int(key)) for key in keys] == buckets.tolist()
+    missing = set(range(1300, 1400)) - set(keys.tolist())
+    for key in missing:
+        with pytest.raises(KeyError):
+            table.lookup(key)
+
+
+def test_resumed_build_equals_fresh_build(tmp_path):
+    options = dict(streets=['preflop'], num_buckets=8, samples=50, processes=2, seed=5)
+    fresh = str(tmp_path / 'fresh')
+    build_buckets(fresh, **options)
+
+    resumed = str(tmp_path / 'resumed')
+    build_buckets(resumed, **options)
+    # Как после прерывания: итогового файла нет, часть признаков не посчитана.
+    os.remove(street_path(resumed, 'preflop'))
+    for index in range(0, NUM_CLASSES, 3):
+        os.remove(_class_path(os.path.join(resumed, 'work'), 'preflop', index))
+    build_buckets(resumed, **options)
+
+    with open(street_path(fresh, 'preflop'), 'rb') as first, open(street_path(resumed, 'preflop'), 'rb') as second:
+        assert first.read() == second.read()
+
+    tables = BucketTables(fresh)
+    assert tables.num_buckets == 8
+    assert tables.bucket(['A♠', 'A♥'], []) == 7
+    assert tables.bucket(['7♣', '2♦'], []) < tables.bucket(['K♠', 'Q♠'], [])
+    assert np.all(np.diff(tables.centers('preflop')[:, FEATURES.index('ehs')]) >= 0)
+    with pytest.raises(ValueError):
+        tables.bucket(['A♠', 'A♥'], ['2♣', '3♦', '4♥'])
@@ -0,0 +1,79 @@
+import pytest
+
+from src.poker.poker_game.cache import (EVALUATION_CACHE, LRUCache, cache_stats, cached_equity, cached_evaluate_hand,
+                                        clear_caches)
+from src.poker.poker_game.equity import calculate_equity
+from src.poker.poker_game.hand_evaluation import evaluate_hand
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'a' становится самым свежим
+    cache.put('c', 3)           # вытесняется 'b'
+    assert 'b' not in cache
+    assert 'a' in cache and 'c' in cache
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+
+def test_lru_counters():
+    cache = LRUCache(maxsize=4)
+    assert cache.get('missing') is None
+    cache.put('key', 'value')
+    assert cache.get('key') == 'value'
+    assert cache.get_or_compute('key', lambda: pytest.fail("значение должно браться из кэша")) == 'value'
+    assert cache.get_or_compute('other', lambda: 42) == 42
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (2, 2, 0, 2)
+    assert stats['hit_rate'] == pytest.approx(0.5)
+
+    cache.clear()
+    assert cache.stats()['hits'] == cache.stats()['misses'] == len(cache) == 0
+
+
+def test_lru_rejects_empty_size():
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+
+def test_cached_equity_shares_suit_isomorphic_spots():
+    cache = LRUCache(16)
+    first = cached_equity(['A♠', 'K♠'], ['Q♠', 'J♦', '2♠'], samples=2000, seed=1, cache=cache)
+    second = cached_equity(['A♥', 'K♥'], ['Q♥', 'J♣', '2♥'], samples=2000, seed=1, cache=cache)
+    assert second is first
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+    # Другая масть у дро — другой расклад.
+    cached_equity(['A♠', 'K♠'], ['Q♥', 'J♦', '2♠'], samples=2000, seed=1, cache=cache)
+    assert len(cache) == 2
+
+    # Другие параметры расчёта — другая запись.
+    cached_equity(['A♠', 'K♠'], ['Q♠', 'J♦', '2♠'], samples=2000, seed=2, cache=cache)
+    assert len(cache) == 3
+
+
+def test_cached_equity_matches_calculate_equity_on_canonical_spot():
+    cache = LRUCache(4)
+    cached = cached_equity(['A♠', 'A♥'], samples=3000, seed=4, cache=cache)
+    direct = calculate_equity(['A♠', 'A♥'], samples=3000, seed=4)
+    assert cached['equity'] == pytest.approx(direct['equity'], abs=3 * direct['ci'])
+
+
+def test_cached_evaluate_hand_ignores_card_order():
+    cache = LRUCache(8)
+    cards = ['A♠', 'K♠', 'Q♠', 'J♠', '10♠', '2♦', '3♣']
+    first = cached_evaluate_hand(cards, cache)
+    assert first == evaluate_hand(cards)
+    assert cached_evaluate_hand(cards[::-1], cache) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_shared_caches_report_and_clear():
+    clear_caches()
+    cached_evaluate_hand(['A♠', 'A♥', '2♦', '7♣', '9♥', 'J♦', 'Q♣'])
+    cached_evaluate_hand(['A♥', 'A♠', '2♦', '7♣', '9♥', 'J♦', 'Q♣'])
+    assert cache_stats()['evaluation']['hits'] == 1
+    clear_caches()
+    assert len(EVALUATION_CACHE) == 0 and cache_stats()['equity']['misses'] == 0
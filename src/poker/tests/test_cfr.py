@@ -0,0 +1,98 @@
+import json
+import os
+import random
+
+import numpy as np
+import pytest
+
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.battle import play_hand
+from src.poker.poker_game.cfr import (CALL_LEVELS, META_FILE, POT_LEVELS, CFRAgent, CFRTrainer, GameAbstraction,
+                                      regret_matching)
+from src.poker.poker_game.game import PokerGame
+
+
+def test_regret_matching():
+    assert regret_matching([3.0, 1.0, -5.0], [True, True, True]) == [0.75, 0.25, 0.0]
+    # Положительное сожаление недопустимого действия не учитывается.
+    assert regret_matching([3.0, 1.0, 4.0], [True, True, False]) == [0.75, 0.25, 0.0]
+    # Без положительных сожалений — равномерно по допустимым действиям.
+    assert regret_matching([-1.0, 0.0, -2.0], [False, True, True]) == [0.0, 0.5, 0.5]
+
+
+def test_infoset_indices_are_unique_and_in_bounds():
+    game = GameAbstraction()
+    seen = set()
+    for street in range(4):
+        for bucket in range(game.cards.num_buckets):
+            for to_call in [0] + [game.min_bet * 2 ** level for level in range(CALL_LEVELS + 2)]:
+                for pot in [game.big_blind * 2 ** level for level in range(POT_LEVELS + 2)]:
+                    key = game.infoset(street, bucket, to_call, pot)
+                    assert 0 <= key < game.num_infosets
+                    seen.add(key)
+    assert len(seen) == game.num_infosets
+
+
+def test_legal_actions_follow_engine_rules():
+    game = GameAbstraction()
+    # Чек возможен, фолд — нет; рейз требует money >= amount + текущая ставка.
+    assert game.legal_actions(0, 20, 1000) == (False, True, True)
+    assert game.legal_actions(0, 500, 980) == (False, True, False)
+    # Колл на все фишки меньше ставки запрещён: остаётся только фолд.
+    assert game.legal_actions(300, 600, 200) == (True, False, False)
+
+
+def test_resume_from_checkpoint_reproduces_tables(tmp_path):
+    continuous = CFRTrainer(str(tmp_path / 'continuous'))
+    continuous.train(60, seed=1)
+    continuous.train(60, seed=2)
+
+    first = CFRTrainer(str(tmp_path / 'resumed'))
+    first.train(60, seed=1)
+    del first
+    resumed = CFRTrainer(str(tmp_path / 'resumed'))
+    assert resumed.iterations == 60
+    resumed.train(60, seed=2)
+
+    np.testing.assert_array_equal(np.load(tmp_path / 'resumed' / 'regret.npy'), np.asarray(continuous.regret))
+    np.testing.assert_array_equal(np.load(tmp_path / 'resumed' / 'strategy.npy'), np.asarray(continuous.strategy))
+    with open(os.path.join(tmp_path, 'resumed', META_FILE), encoding='utf-8') as file:
+        assert json.load(file)['iterations'] == 120
+
+
+def test_parallel_training_merges_batches(tmp_path):
+    # Задачи стартуют с текущих общих таблиц, поэтому результат зависит от
+    # порядка их выполнения; проверяем, что все приращения дошли до файлов.
+    trainer = CFRTrainer(str(tmp_path))
+    trainer.train(80, processes=2, batch_size=20, seed=5)
+    assert trainer.iterations == 80
+    assert np.asarray(trainer.strategy).sum() > 0
+    np.testing.assert_array_equal(np.load(tmp_path / 'strategy.npy'), np.asarray(trainer.strategy))
+    np.testing.assert_array_equal(np.load(tmp_path / 'regret.npy'), np.asarray(trainer.regret))
+
+    resumed = CFRTrainer(str(tmp_path))
+    assert resumed.iterations == 80
+
+
+class _WideCards:
+    """Абстракция карт с другим числом корзин."""
+    num_buckets = 30
+
+    def bucket(self, hole, board):
+        return 0
+
+
+def test_mismatched_abstraction_is_rejected(tmp_path):
+    CFRTrainer(str(tmp_path)).train(1, seed=0)
+    with pytest.raises(ValueError):
+        CFRTrainer(str(tmp_path), GameAbstraction(cards=_WideCards()))
+
+
+def test_cfr_agent_beats_random_agent(tmp_path):
+    trainer = CFRTrainer(str(tmp_path))
+    trainer.train(1000, seed=1)
+    agents = [CFRAgent("CFR", trainer.policy(), rng=random.Random(5)), RandomAgent("Random")]
+    game = PokerGame(num_players=0)
+    results = np.array([play_hand(agents, game, hand, seed=3)[0] for hand in range(600)])
+    # Около +2.5 BB за раздачу; порог с большим запасом.
+    assert results.mean() > GameAbstraction().big_blind
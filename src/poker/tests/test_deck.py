@@ -0,0 +1,58 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.poker.poker_game.deck import CompactDeck
+from src.poker.poker_game.utils import CARDS
+
+
+def test_draws_every_card_once():
+    deck = CompactDeck(random.Random(1))
+    drawn = [deck.draw() for _ in range(52)]
+    assert sorted(drawn) == sorted(CARDS)
+    assert len(deck) == 0 and deck.remaining() == []
+    assert deck.draw() is None and deck.draw_code() is None
+
+
+def test_remove_takes_dead_cards_out_of_play():
+    deck = CompactDeck(random.Random(2))
+    dead = ['A♠', 'K♥', 7]
+    deck.remove(dead)
+    assert len(deck) == 49
+    remaining = deck.remaining()
+    assert 'A♠' not in remaining and 'K♥' not in remaining and CARDS[7] not in remaining
+    drawn = {deck.draw_code() for _ in range(49)}
+    assert drawn == set(range(52)) - {CARDS.index('A♠'), CARDS.index('K♥'), 7}
+
+    # Уже убранную или сданную карту убрать нельзя.
+    deck.reset()
+    first = deck.draw()
+    with pytest.raises(ValueError):
+        deck.remove([first])
+    deck.remove(['2♣'])
+    with pytest.raises(ValueError):
+        deck.remove(['2♣'])
+
+
+def test_reset_returns_all_cards_and_replays_same_stream():
+    rng = random.Random(3)
+    deck = CompactDeck(rng)
+    deck.remove(['A♠', 'A♥'])
+    for _ in range(20):
+        deck.draw()
+    deck.reset()
+    assert len(deck) == 52
+    assert sorted(deck.remaining()) == sorted(CARDS)
+
+    # После reset те же случайные числа сдают те же карты, что и у новой колоды.
+    rng.seed(4)
+    replayed = [deck.draw() for _ in range(9)]
+    fresh = CompactDeck(random.Random(4))
+    assert replayed == [fresh.draw() for _ in range(9)]
+
+
+def test_accepts_numpy_generator():
+    deck = CompactDeck(np.random.default_rng(5))
+    drawn = [deck.draw_code() for _ in range(10)]
+    assert len(set(drawn)) == 10 and all(0 <= code < 52 for code in drawn)
@@ -0,0 +1,90 @@
+import math
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from src.poker.poker_game.equity import calculate_equity, runout_boards, showdown_equities
+from src.poker.poker_game.hand_evaluation import evaluate_cards
+from src.poker.poker_game.utils import cards_to_ints
+
+
+def exact_river_equity(hole, board):
+    """Эквити против одной случайной руки на полной доске перебором всех рук соперника."""
+    hero = evaluate_cards(hole + board)
+    rest = [code for code in range(52) if code not in hole + board]
+    total = 0.0
+    count = 0
+    for opponent in combinations(rest, 2):
+        villain = evaluate_cards(list(opponent) + board)
+        total += 1.0 if hero > villain else 0.5 if hero == villain else 0.0
+        count += 1
+    return total / count
+
+
+def test_calculate_equity_matches_exact_river():
+    hole = cards_to_ints(['A♠', 'K♦'])
+    board = cards_to_ints(['K♠', '7♥', '2♣', '9♦', 'J♣'])
+    result = calculate_equity(hole, board, samples=20000, seed=3)
+    assert result['samples'] == 20000
+    assert abs(result['equity'] - exact_river_equity(hole, board)) <= 3 * result['ci']
+
+
+def test_calculate_equity_known_preflop_values():
+    # Известные значения: AA против одной случайной руки ≈ 85%, 72o ≈ 35%.
+    assert calculate_equity(['A♠', 'A♥'], seed=1, samples=20000)['equity'] == pytest.approx(0.852, abs=0.01)
+    assert calculate_equity(['7♠', '2♥'], seed=1, samples=20000)['equity'] == pytest.approx(0.35, abs=0.01)
+    # С ростом числа соперников эквити падает.
+    multiway = [calculate_equity(['A♠', 'A♥'], num_opponents=count, seed=2)['equity'] for count in (1, 3, 5)]
+    assert multiway[0] > multiway[1] > multiway[2]
+
+
+def test_calculate_equity_is_reproducible():
+    first = calculate_equity(['Q♠', 'J♠'], ['10♠', '2♦', '3♣'], num_opponents=2, seed=11)
+    second = calculate_equity(['Q♠', 'J♠'], ['10♠', '2♦', '3♣'], num_opponents=2, seed=11)
+    assert first == second
+    parallel = calculate_equity(['Q♠', 'J♠'], ['10♠', '2♦', '3♣'], num_opponents=2, seed=11, processes=2)
+    assert parallel['equity'] == pytest.approx(first['equity'])
+
+
+def test_calculate_equity_rejects_repeated_cards():
+    with pytest.raises(ValueError):
+        calculate_equity(['A♠', 'A♠'])
+    with pytest.raises(ValueError):
+        calculate_equity(['A♠', 'K♠'], ['A♠', '2♦', '3♣'])
+
+
+def test_showdown_equities_matches_brute_force_on_flop():
+    holes = [['A♠', 'K♠'], ['Q♥', 'Q♦'], ['7♣', '8♣']]
+    board = ['2♠', '9♠', '10♣']
+    dead = ['3♦', '4♦']
+    result = showdown_equities(holes, board, dead)
+    assert result['exact'] and result['boards'] == math.comb(52 - 6 - 3 - 2, 2)
+
+    codes = [cards_to_ints(hole) for hole in holes]
+    used = set(sum(codes, [])) | set(cards_to_ints(board + dead))
+    expected = np.zeros(3)
+    count = 0
+    for turn_river in combinations([code for code in range(52) if code not in used], 2):
+        full = cards_to_ints(board) + list(turn_river)
+        scores = [evaluate_cards(hole + full) for hole in codes]
+        winners = [score == max(scores) for score in scores]
+        expected += np.array(winners) / sum(winners)
+        count += 1
+    np.testing.assert_allclose(result['equity'], expected / count)
+
+
+def test_showdown_equities_aces_against_kings():
+    result = showdown_equities([['A♠', 'A♥'], ['K♠', 'K♥']], seed=5)
+    assert not result['exact'] and result['boards'] == 20000
+    assert result['equity'].sum() == pytest.approx(1.0)
+    assert result['equity'][0] == pytest.approx(0.82, abs=0.01)
+
+
+def test_runout_boards_skip_known_cards():
+    known = cards_to_ints(['A♠', 'A♥', 'K♠', 'K♥'])
+    boards, exact = runout_boards([], known, max_boards=5000, seed=1)
+    assert not exact and boards.shape == (5000, 5)
+    assert not np.isin(boards, known).any()
+    ordered = np.sort(boards, axis=1)
+    assert not (ordered[:, 1:] == ordered[:, :-1]).any()
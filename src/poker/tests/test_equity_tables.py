@@ -0,0 +1,57 @@
+from itertools import combinations
+
+import pytest
+
+from src.poker.poker_game.equity_tables import (NUM_CLASSES, EquityTables, build_tables, canonical_flop_key,
+                                                hole_class, load_tables)
+from src.poker.poker_game.utils import cards_to_ints
+
+FLOP = ['A♠', '7♥', '2♦']
+
+
+@pytest.fixture(scope='module')
+def tables_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('equity') / 'tables.bin')
+    build_tables(path, preflop_samples=400, flop_samples=200, flops=[FLOP], processes=2, seed=3, chunk_size=300)
+    return path
+
+
+def test_hole_class_covers_grid():
+    classes = {hole_class(hole) for hole in combinations(range(52), 2)}
+    assert classes == set(range(NUM_CLASSES))
+    assert hole_class(['A♠', 'K♠']) == hole_class(['A♥', 'K♥']) != hole_class(['A♠', 'K♥'])
+
+
+def test_build_load_lookup(tables_path):
+    tables = load_tables(tables_path)
+    assert load_tables(tables_path) is tables
+
+    aces = tables.lookup(['A♠', 'A♥'], [])
+    assert aces == pytest.approx(0.85, abs=0.05)
+    # Против большего числа соперников эквити меньше.
+    row = [tables.preflop(['A♠', 'A♥'], count) for count in range(1, 10)]
+    assert all(first > second for first, second in zip(row, row[1:]))
+    assert tables.lookup(['A♠', 'A♥'], [], num_opponents=10) is None
+
+    # На флопе есть каждая рука из оставшихся карт, и с перестановкой мастей тоже.
+    flop = cards_to_ints(FLOP)
+    for hole in combinations([code for code in range(52) if code not in flop], 2):
+        assert 0.0 <= tables.lookup(list(hole), flop) <= 1.0
+    assert tables.flop(['K♠', 'K♦'], FLOP) == tables.flop(['K♥', 'K♣'], ['A♥', '7♠', '2♣'])
+    assert tables.flop(['A♥', 'A♦'], FLOP) > tables.flop(['3♣', '4♣'], FLOP)
+    # Чужого флопа и терна в таблице нет.
+    assert tables.flop(['A♥', 'A♦'], ['K♠', 'Q♠', 'J♠']) is None
+    assert tables.lookup(['A♥', 'A♦'], FLOP + ['K♠']) is None
+
+
+def test_build_does_not_depend_on_processes_or_chunks(tables_path, tmp_path):
+    # У каждой записи свой поток из SeedSequence, поэтому разбиение на задачи не влияет на результат.
+    path = str(tmp_path / 'tables.bin')
+    build_tables(path, preflop_samples=400, flop_samples=200, flops=[FLOP], processes=1, seed=3, chunk_size=500)
+    with open(tables_path, 'rb') as first, open(path, 'rb') as second:
+        assert first.read() == second.read()
+    assert len(EquityTables(path).flop_keys) == len(EquityTables(tables_path).flop_keys) > 0
+
+
+def test_canonical_flop_key_ignores_order():
+    assert canonical_flop_key(['K♠', 'K♦'], FLOP) == canonical_flop_key(['K♦', 'K♠'], ['2♦', 'A♠', '7♥'])
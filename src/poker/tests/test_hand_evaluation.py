@@ -0,0 +1,166 @@
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+
+from src.poker.poker_game.hand_evaluation import (IncrementalEvaluator, evaluate_cards, evaluate_hand,
+                                                  evaluate_hands_batch, evaluate_with_board, hand_category)
+from src.poker.poker_game.utils import CARD_CODES, CARDS
+
+SAMPLE_SIZE = 3000
+
+
+def reference_five(codes):
+    """Оценка пяти карт «в лоб»: (категория, ранги для сравнения)."""
+    ranks = sorted((code >> 2 for code in codes), reverse=True)
+    counts = Counter(ranks)
+    groups = sorted(counts.items(), key=lambda item: (item[1], item[0]), reverse=True)
+    ordered = [rank for rank, count in groups for _ in range(count)]
+    flush = len({code & 3 for code in codes}) == 1
+
+    unique = sorted(set(ranks), reverse=True)
+    straight_high = None
+    if len(unique) == 5:
+        if unique[0] - unique[4] == 4:
+            straight_high = unique[0]
+        elif unique == [12, 3, 2, 1, 0]:
+            straight_high = 3
+
+    if straight_high is not None and flush:
+        return 8, [straight_high]
+    if groups[0][1] == 4:
+        return 7, ordered
+    if groups[0][1] == 3 and groups[1][1] == 2:
+        return 6, ordered
+    if flush:
+        return 5, ranks
+    if straight_high is not None:
+        return 4, [straight_high]
+    if groups[0][1] == 3:
+        return 3, ordered
+    if groups[0][1] == 2 and groups[1][1] == 2:
+        return 2, ordered
+    if groups[0][1] == 2:
+        return 1, ordered
+    return 0, ranks
+
+
+def reference_seven(codes):
+    """Лучшие пять карт из семи перебором всех 21 сочетаний."""
+    return max(reference_five(five) for five in combinations(codes, 5))
+
+
+def random_hands(count, size=7, seed=2024):
+    rng = np.random.default_rng(seed)
+    return np.array([rng.choice(52, size, replace=False) for _ in range(count)], dtype=np.int64)
+
+
+def test_evaluate_cards_matches_brute_force_ordering():
+    hands = random_hands(SAMPLE_SIZE)
+    scores = [evaluate_cards(hand.tolist()) for hand in hands]
+    references = [reference_seven(hand.tolist()) for hand in hands]
+
+    for score, reference in zip(scores, references):
+        assert hand_category(score) == reference[0]
+
+    # Порядок оценок должен совпадать с порядком эталона, включая равенства.
+    order = sorted(range(SAMPLE_SIZE), key=lambda index: scores[index])
+    for previous, current in zip(order, order[1:]):
+        if scores[previous] == scores[current]:
+            assert references[previous] == references[current]
+        else:
+            assert references[previous] < references[current]
+
+
+def test_known_hands():
+    royal = evaluate_hand(['A♠', 'K♠', 'Q♠', 'J♠', '10♠', '2♦', '3♣'])
+    assert royal['combination_name'] == 'Royal Flush'
+    wheel = evaluate_hand(['A♠', '2♦', '3♣', '4♥', '5♠', '9♦', 'K♣'])
+    six_high = evaluate_hand(['6♠', '2♦', '3♣', '4♥', '5♠', '9♦', 'K♣'])
+    assert wheel['combination_name'] == six_high['combination_name'] == 'Straight'
+    assert wheel['score'] < six_high['score']
+
+
+def test_batch_matches_scalar():
+    for size in (5, 6, 7):
+        hands = random_hands(SAMPLE_SIZE, size, seed=size)
+        batch = evaluate_hands_batch(hands, chunk_size=1000)
+        assert batch.tolist() == [evaluate_cards(hand.tolist()) for hand in hands]
+
+
+def test_evaluate_with_board_matches_scalar():
+    deals = random_hands(200, 9, seed=7)
+    holes = deals[:, :2]
+    boards = deals[:, 2:7]
+    values = evaluate_with_board(holes[:20], boards)
+    for row in range(len(boards)):
+        for column in range(20):
+            hand = holes[column].tolist() + boards[row].tolist()
+            if len(set(hand)) == 7:
+                assert values[row, column] == evaluate_cards(hand)
+
+
+def test_evaluate_hand_accepts_card_strings():
+    hand = random_hands(1)[0]
+    assert evaluate_hand([CARDS[code] for code in hand])['score'] == evaluate_cards(hand.tolist())
+
+
+def test_incremental_evaluator_matches_evaluate_cards():
+    tracker = IncrementalEvaluator()
+    for hand in random_hands(500, seed=11):
+        codes = hand.tolist()
+        tracker.reset(codes[:2])
+        for size in range(3, 8):
+            tracker.add(CARDS[codes[size - 1]] if size % 2 else codes[size - 1])
+            assert len(tracker) == size
+            if size >= 5:
+                assert tracker.score() == evaluate_cards(codes[:size])
+        assert tracker.best_hand() == evaluate_hand([CARDS[code] for code in codes])
+
+
+def draws(cards):
+    return IncrementalEvaluator(cards).draws()
+
+
+def test_incremental_evaluator_known_draws():
+    spades, hearts = CARD_CODES['A♠'] & 3, CARD_CODES['A♥'] & 3
+
+    flush = draws(['A♠', 'K♠', 'Q♠', '7♠', '2♦'])
+    assert (flush['flush_draw'], flush['straight_draw'], flush['outs']) == (spades, None, 9)
+
+    open_ended = draws(['9♥', '8♣', '7♦', '6♠', '2♣'])
+    assert open_ended['straight_draw'] == 'open-ended'
+    assert open_ended['straight_ranks'] == [3, 8]  # пятёрка и десятка
+    assert open_ended['outs'] == 8
+
+    gutshot = draws(['9♥', '8♣', '6♦', '5♠', 'K♣'])
+    assert (gutshot['straight_draw'], gutshot['straight_ranks'], gutshot['outs']) == ('gutshot', [5], 4)
+
+    wheel = draws(['A♠', '2♦', '3♣', '4♥', 'K♠'])
+    assert (wheel['straight_draw'], wheel['straight_ranks'], wheel['outs']) == ('gutshot', [3], 4)
+
+    # Флеш-дро с двусторонним: карты нужного ранга в масти флеша не считаются дважды.
+    combo = draws(['9♥', '8♥', '7♥', '6♠', '2♥'])
+    assert (combo['flush_draw'], combo['straight_draw'], combo['outs']) == (hearts, 'open-ended', 15)
+
+    backdoor = draws(['A♠', 'K♠', 'Q♠', '7♦', '2♣'])
+    assert backdoor['backdoor_flush'] == [spades] and backdoor['flush_draw'] is None
+
+    # Готовый флеш — не дро; на ривере дро нет.
+    assert draws(['A♠', 'K♠', 'Q♠', '7♠', '2♠'])['flush_draw'] is None
+    assert draws(['9♥', '8♥', '7♥', '6♠', '2♥', 'K♦', 'K♣'])['outs'] == 0
+
+
+def test_incremental_evaluator_outs_match_brute_force():
+    for hand in random_hands(400, 6, seed=12).tolist() + random_hands(400, 5, seed=13).tolist():
+        if hand_category(evaluate_cards(hand)) in (4, 5, 8):
+            continue  # уже есть стрит или флеш — дро не считаются
+        suits = Counter(code & 3 for code in hand)
+        ranks = {code >> 2 for code in hand}
+        outs = 0
+        for card in set(range(52)) - set(hand):
+            with_card = ranks | {card >> 2}
+            straight = any(all((high - offset) % 13 in with_card for offset in range(5)) for high in range(3, 13))
+            if suits[card & 3] == 4 or straight:
+                outs += 1
+        assert draws(hand)['outs'] == outs, [CARDS[code] for code in hand]
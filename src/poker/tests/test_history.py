@@ -0,0 +1,138 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.betting import betting_round, manage_betting_rounds
+from src.poker.poker_game.events import CHECK, HAND_END, HAND_START, STREET, ListSink, TeeSink
+from src.poker.poker_game.game import PokerGame
+from src.poker.poker_game.history import (MAX_ACTIONS, NO_CARD, RECORDED_ACTIONS, TRUNCATED, HandHistoryReader,
+                                          HandHistoryWriter, record_actions)
+from src.poker.poker_game.utils import CARD_CODES
+
+HANDS = 40
+
+
+def play_hands(path, hands=HANDS, seed=0, buffer_hands=16):
+    random.seed(seed)
+    writer = HandHistoryWriter(path, buffer_hands=buffer_hands)
+    streams = []
+    agents = [RandomAgent(f"Agent {seat + 1}") for seat in range(6)]
+    for hand in range(hands):
+        game = PokerGame(num_players=0)
+        game.players = agents
+        for agent in agents:
+            agent.reset()
+            agent.active = True
+            agent.money = 1000
+        game.deal_cards()
+        events = ListSink()
+        manage_betting_rounds(agents, 10, game, 10, 20, sink=TeeSink(events, writer))
+        streams.append(events.events)
+    writer.close()
+    return streams
+
+
+def expected_record(events):
+    """Поля записи, восстановленные прямо по событиям раздачи."""
+    names, stacks, holes = events[0][3]
+    final, board = events[-1][3]
+    seats = {name: seat for seat, name in enumerate(names)}
+    actions = []
+    street = 0
+    for kind, player, amount, info in events:
+        if kind == STREET:
+            street = info[0]
+        elif kind in RECORDED_ACTIONS:
+            actions.append((seats[player], kind, street, amount))
+    return {
+        'holes': [[CARD_CODES[card] for card in cards] for cards in holes],
+        'board': [CARD_CODES[card] for card in board],
+        'stacks': stacks,
+        'results': [after - before for after, before in zip(final, stacks)],
+        'actions': actions,
+    }
+
+
+def test_write_read_round_trip(tmp_path):
+    path = str(tmp_path / 'hands.phh')
+    streams = play_hands(path)
+    reader = HandHistoryReader(path)
+    assert len(reader) == HANDS
+    for hand_id, (record, events) in enumerate(zip(reader, streams)):
+        expected = expected_record(events)
+        seats = int(record['num_seats'])
+        assert int(record['hand_id']) == hand_id
+        assert seats == 6 and int(record['flags']) == 0
+        assert record['hole_cards'][:seats].tolist() == expected['holes']
+        assert (record['hole_cards'][seats:] == NO_CARD).all()
+        board_size = int(record['board_size'])
+        assert record['board'][:board_size].tolist() == expected['board']
+        assert (record['board'][board_size:] == NO_CARD).all()
+        assert record['stacks'][:seats].tolist() == expected['stacks']
+        assert record['results'][:seats].tolist() == expected['results']
+        assert int(record['results'].sum()) == 0
+        assert record_actions(record) == expected['actions']
+
+    assert sum(len(chunk) for chunk in reader.iter_chunks(7)) == HANDS
+
+
+def test_appending_continues_hand_ids(tmp_path):
+    path = str(tmp_path / 'hands.phh')
+    play_hands(path, hands=5)
+    play_hands(path, hands=3, seed=1)
+    reader = HandHistoryReader(path)
+    assert reader.records['hand_id'].tolist() == list(range(8))
+
+
+def test_overflowing_actions_are_truncated(tmp_path):
+    path = str(tmp_path / 'hands.phh')
+    writer = HandHistoryWriter(path)
+    names = ["A", "B"]
+    writer.emit(HAND_START, None, 0, (names, [1000, 1000], [['A♠', 'K♠'], ['2♦', '7♣']]))
+    for index in range(MAX_ACTIONS + 5):
+        writer.emit(CHECK, names[index % 2], index, (0, 1000))
+    writer.emit(HAND_END, None, 0, ([1000, 1000], []))
+    writer.close()
+
+    record = HandHistoryReader(path)[0]
+    assert int(record['flags']) & TRUNCATED
+    assert int(record['num_actions']) == MAX_ACTIONS
+    actions = record_actions(record)
+    assert len(actions) == MAX_ACTIONS
+    assert actions[-1] == ((MAX_ACTIONS - 1) % 2, CHECK, 0, MAX_ACTIONS - 1)
+    assert int(record['board_size']) == 0
+
+
+def test_events_outside_hand_are_ignored(tmp_path):
+    path = str(tmp_path / 'hands.phh')
+    writer = HandHistoryWriter(path)
+    # Отдельный раунд ставок без HAND_START не ломает запись.
+    random.seed(3)
+    agents = [RandomAgent("A"), RandomAgent("B")]
+    game = PokerGame(num_players=0)
+    game.players = agents
+    game.deal_cards()
+    game.table.start_hand(agents, game.community_cards, 10)
+    betting_round(game.table, 10, 10, 20, sink=writer)
+    writer.emit(HAND_END, None, 0, ([1000, 1000], []))
+    writer.close()
+    assert len(HandHistoryReader(path)) == 0
+
+
+def test_duplicate_names_are_rejected(tmp_path):
+    writer = HandHistoryWriter(str(tmp_path / 'hands.phh'))
+    with pytest.raises(ValueError):
+        writer.emit(HAND_START, None, 0, (["A", "A"], [1000, 1000], [['A♠', 'K♠'], ['2♦', '7♣']]))
+    writer.close()
+
+
+def test_reader_rejects_foreign_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a history file')
+    with pytest.raises(ValueError):
+        HandHistoryReader(str(path))
+    empty = str(tmp_path / 'empty.phh')
+    HandHistoryWriter(empty).close()
+    assert len(HandHistoryReader(empty)) == 0 and isinstance(HandHistoryReader(empty).records, np.ndarray)
@@ -0,0 +1,88 @@
+import json
+import random
+
+import pytest
+
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.events import NULL_SINK
+from src.poker.poker_game.profiling import (BETTING_ROUND, DEAL, DECISION, HAND, PHASES, PROFILER, STREET_NAMES,
+                                            PhaseStats, Profiler)
+from src.poker.poker_game.session import Session
+
+
+class Caller(RandomAgent):
+    """Всегда уравнивает: каждая раздача доходит до ривера."""
+
+    def make_decision(self, community_cards, current_bet, pot, min_bet):
+        return ("check", 0) if current_bet == self.current_bet else ("call", 0)
+
+
+@pytest.fixture
+def profiler():
+    PROFILER.reset()
+    yield PROFILER
+    PROFILER.disable()
+    PROFILER.reset()
+
+
+def test_phase_stats_ring_buffer_keeps_recent_samples():
+    stats = PhaseStats(window=4)
+    for value in range(1, 11):
+        stats.add(value * 1e-6)
+    assert stats.count == 10
+    assert sorted(stats.samples) == pytest.approx([7e-6, 8e-6, 9e-6, 10e-6])
+    snapshot = stats.snapshot()
+    assert snapshot['total_sec'] == pytest.approx(55e-6)
+    assert snapshot['mean_us'] == pytest.approx(5.5)
+    assert snapshot['max_us'] == pytest.approx(10.0)
+    # Перцентили — по последним `window` замерам.
+    assert (snapshot['p50_us'], snapshot['p90_us'], snapshot['p99_us']) == pytest.approx((9.0, 10.0, 10.0))
+
+    empty = PhaseStats(window=4).snapshot()
+    assert empty['count'] == 0 and empty['mean_us'] == empty['p99_us'] == 0.0
+
+
+def test_sampling_applies_to_every_phase(profiler):
+    profiler.enable(sample_every=3)
+    session = Session([Caller(f"Agent {i + 1}") for i in range(3)], rng=random.Random(1), sink=NULL_SINK)
+    for _ in range(30):
+        session.play_hand()
+
+    snapshot = profiler.snapshot()
+    phases = snapshot['phases']
+    assert snapshot['hands'] == 30
+    assert snapshot['sampled_hands'] == phases[HAND]['count'] == 10
+    # Карты на руках, флоп, терн и ривер — только в замеренных раздачах.
+    assert phases[DEAL]['count'] == 4 * 10
+    assert phases[BETTING_ROUND]['count'] == 4 * 10
+    assert phases[DECISION]['count'] == sum(sum(counts.values()) for counts in snapshot['actions'].values())
+    assert set(snapshot['actions']) == set(STREET_NAMES)
+    assert set(phases) == set(PHASES)
+
+
+def test_disabled_profiler_records_nothing(profiler):
+    session = Session([Caller("A"), Caller("B")], rng=random.Random(2), sink=NULL_SINK)
+    for _ in range(5):
+        session.play_hand()
+    snapshot = profiler.snapshot()
+    assert snapshot['hands'] == 0
+    assert all(stats['count'] == 0 for stats in snapshot['phases'].values())
+
+
+def test_dump_writes_snapshots(profiler, tmp_path):
+    path = tmp_path / 'profile.jsonl'
+    received = []
+    profiler.enable(dump_interval=0.0, dump_path=str(path), dump_callback=received.append)
+    session = Session([Caller("A"), Caller("B")], rng=random.Random(3), sink=NULL_SINK)
+    for _ in range(3):
+        session.play_hand()
+
+    lines = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert len(lines) == len(received) == 3
+    assert [line['sampled_hands'] for line in lines] == [1, 2, 3]
+    assert lines[-1]['phases'][HAND]['count'] == 3
+
+
+def test_enable_validates_sample_every():
+    with pytest.raises(ValueError):
+        Profiler().enable(sample_every=0)
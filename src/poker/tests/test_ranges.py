@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from src.poker.poker_game.equity_tables import NUM_CLASSES, hole_class
+from src.poker.poker_game.hand_evaluation import evaluate_cards
+from src.poker.poker_game.ranges import (COMBOS, NUM_COMBOS, PREFLOP_ORDER, HandRange, _accumulate, _Layout,
+                                         preflop_order, range_equity)
+from src.poker.poker_game.utils import CARD_CODES
+
+
+def brute_force(boards, hero, villain):
+    """Счётчики героя прямым перебором всех пар комбинаций на каждой доске."""
+    win = np.zeros(NUM_COMBOS)
+    tie = np.zeros(NUM_COMBOS)
+    total = np.zeros(NUM_COMBOS)
+    for board in boards.tolist():
+        scores = {}
+        for index in np.flatnonzero((hero > 0) | (villain > 0)):
+            cards = COMBOS[index].tolist()
+            if not set(cards) & set(board):
+                scores[index] = evaluate_cards(cards + board)
+        for first in np.flatnonzero(hero > 0):
+            if first not in scores:
+                continue
+            for second in np.flatnonzero(villain > 0):
+                if second not in scores or set(COMBOS[first].tolist()) & set(COMBOS[second].tolist()):
+                    continue
+                weight = hero[first] * villain[second]
+                total[first] += weight
+                if scores[first] > scores[second]:
+                    win[first] += weight
+                elif scores[first] == scores[second]:
+                    tie[first] += weight
+    return win, tie, total
+
+
+def test_preflop_order_is_fixed_permutation():
+    order = preflop_order()
+    assert sorted(order.tolist()) == list(range(NUM_CLASSES))
+    assert len(PREFLOP_ORDER) == NUM_CLASSES
+    assert order[0] == hole_class(['A♠', 'A♥'])
+    assert order[7] == hole_class(['A♠', 'K♠'])
+    assert order[11] == hole_class(['A♠', 'K♥'])
+    assert order[-1] == hole_class(['3♠', '2♥'])
+    assert preflop_order() is order
+
+
+def test_top_ranges_follow_preflop_order():
+    assert HandRange('2%').combos() == HandRange('AA,KK,QQ,JJ,TT').combos()
+    assert len(HandRange('100%')) == NUM_COMBOS
+    assert HandRange('10%').mask.tolist() == HandRange.top(10).mask.tolist()
+
+
+def test_accumulate_matches_brute_force():
+    rng = np.random.default_rng(7)
+    # Диапазоны пересекаются, а доски бьют по их картам — поправка на
+    # блокеры работает и для общих комбинаций, и для совпадающих карт.
+    hero = HandRange('AA,AKs,KQ,T9s:0.5,7♣2♦').weights
+    villain = HandRange('AK,KK,QQ:0.3,T9s,8♣7♣,7♣2♦').weights
+    hero[hero > 0] *= rng.uniform(0.5, 1.5, int((hero > 0).sum()))
+    boards = [[CARD_CODES[card] for card in board]
+              for board in (['A♠', 'K♥', '10♠', '9♠', '2♣'], ['A♥', 'A♦', 'K♠', '7♣', '8♣'], ['Q♠', 'Q♥', '3♦', '4♣', '5♥'])]
+    boards += [rng.choice(52, 5, replace=False).tolist() for _ in range(3)]
+    boards = np.array(boards, dtype=np.int64)
+
+    combos = np.flatnonzero((hero > 0) | (villain > 0))
+    win = np.zeros(NUM_COMBOS)
+    tie = np.zeros(NUM_COMBOS)
+    total = np.zeros(NUM_COMBOS)
+    for start in range(0, len(boards), 4):
+        _accumulate(boards[start:start + 4], combos, _Layout(combos), hero[combos], villain[combos], win, tie, total)
+
+    expected_win, expected_tie, expected_total = brute_force(boards, hero, villain)
+    assert win == pytest.approx(expected_win)
+    assert tie == pytest.approx(expected_tie)
+    assert total == pytest.approx(expected_total)
+
+
+def test_river_equity_is_exact_and_symmetric():
+    board = ['A♠', 'K♥', '10♠', '9♠', '2♣']
+    forward = range_equity('AA,KQ', 'TT+,AK', board=board)
+    backward = range_equity('TT+,AK', 'AA,KQ', board=board)
+    assert forward['exact'] and forward['runouts'] == 1
+    assert forward['win'] == pytest.approx(1 - backward['win'] - backward['tie'])
+    assert forward['tie'] == pytest.approx(backward['tie'])
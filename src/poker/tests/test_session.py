@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.betting import RUNOUT_MODES
+from src.poker.poker_game.session import Session
+
+AGENTS = 6
+STACK = 200
+MAX_HANDS = 2000
+
+
+@pytest.mark.parametrize('runout', RUNOUT_MODES)
+def test_session_rotates_button_removes_busted_and_conserves_chips(runout):
+    random.seed(7)
+    agents = [RandomAgent(f"Agent {i + 1}") for i in range(AGENTS)]
+    hands = [agent.cards for agent in agents]
+    session = Session(agents, stack=STACK, rng=random.Random(7), runout=runout)
+
+    while not session.finished and session.hands_played < MAX_HANDS:
+        before = list(session.players)
+        small_blind = before[session.button]
+        assert session.play_hand()
+
+        # Фишки не появляются и не исчезают.
+        assert sum(agent.money for agent in agents) == AGENTS * STACK
+        # Проигравшие выбывают, за столом остаются только игроки с деньгами.
+        assert all(agent.money > 0 for agent in session.players)
+        busted = [agent for agent in before if agent.money <= 0]
+        assert session.eliminated[len(session.eliminated) - len(busted):] == [
+            (agent.name, session.hands_played) for agent in busted]
+        assert session.players == [agent for agent in before if agent.money > 0]
+        assert len(session.seats) == len(session.players)
+        # Малый блайнд переходит к следующему по кругу игроку с деньгами.
+        if not session.finished:
+            start = before.index(small_blind)
+            following = [before[(start + offset) % len(before)] for offset in range(1, len(before) + 1)]
+            assert session.players[session.button] is next(agent for agent in following if agent.money > 0)
+
+    assert session.finished
+    assert len(session.eliminated) == AGENTS - 1
+    assert session.standings()[0] == {'name': session.players[0].name, 'money': AGENTS * STACK}
+    # Списки карт агентов переиспользуются, а не создаются заново каждую раздачу.
+    assert all(agent.cards is cards for agent, cards in zip(agents, hands))
+
+
+def test_session_needs_two_agents():
+    with pytest.raises(ValueError):
+        Session([RandomAgent("Agent 1")])
+    session = Session([RandomAgent("Agent 1"), RandomAgent("Agent 2")])
+    session.players.pop()
+    assert session.finished and not session.play_hand()
@@ -0,0 +1,63 @@
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.table import TableState
+
+
+def make_seats(count, inactive=()):
+    seats = [RandomAgent(f"Agent {seat + 1}") for seat in range(count)]
+    for seat in inactive:
+        seats[seat].active = False
+    return seats
+
+
+def assert_consistent(table):
+    active = [seat for seat, agent in enumerate(table.seats) if agent.active]
+    assert table.active_mask == sum(1 << seat for seat in active)
+    assert table.active_count == len(active)
+    assert table.active_seats() == [table.seats[seat] for seat in active]
+
+
+def test_start_hand_reads_active_flags():
+    seats = make_seats(5, inactive=(1, 3))
+    table = TableState(seats)
+    assert table.num_seats == 5
+    assert_consistent(table)
+    assert table.last_active() is None
+
+
+def test_fold_keeps_mask_and_count_in_sync():
+    seats = make_seats(4)
+    table = TableState(seats)
+    for seat in (2, 0):
+        table.fold(seat)
+        assert not table.is_active(seat) and not seats[seat].active
+        assert_consistent(table)
+    # Повторный фолд ничего не меняет.
+    table.fold(2)
+    assert table.active_count == 2
+    assert_consistent(table)
+
+    table.fold(3)
+    assert table.last_active() is seats[1]
+    table.fold(1)
+    assert table.active_count == 0 and table.last_active() is None
+
+
+def test_last_active_finds_highest_remaining_seat():
+    seats = make_seats(9, inactive=range(8))
+    table = TableState(seats)
+    assert table.last_active() is seats[8]
+
+
+def test_start_hand_reuses_state():
+    table = TableState(make_seats(3))
+    table.fold(0)
+    table.pot = 500
+    table.street = 3
+
+    seats = make_seats(6, inactive=(5,))
+    community = []
+    table.start_hand(seats, community, 20)
+    assert (table.pot, table.street, table.current_bet) == (0, 0, 20)
+    assert table.community_cards is community
+    assert table.num_seats == 6
+    assert_consistent(table)
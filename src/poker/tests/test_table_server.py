@@ -0,0 +1,92 @@
+import asyncio
+import random
+import zlib
+
+import pytest
+
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.betting import RUNOUT_MODES, manage_betting_rounds
+from src.poker.poker_game.events import ListSink
+from src.poker.poker_game.game import PokerGame
+from src.poker.poker_game.table_server import ConnectionPool, RemoteAgent, async_manage_betting_rounds, serve_bot
+
+STACKS = [1000, 150, 600, 80, 1000, 400]
+HANDS = 20
+
+
+def scripted_decision(name, cards, current_bet, agent_bet, money, pot, min_bet):
+    """Детерминированное решение по наблюдению: одно и то же у агента и у бота."""
+    to_call = current_bet - agent_bet
+    roll = zlib.crc32(f"{name}{cards}{current_bet}{agent_bet}{pot}".encode()) % 10
+    if money <= 0:
+        return "fold", 0
+    if to_call <= 0:
+        return ("raise", min_bet * (1 + roll % 3)) if roll < 3 else ("check", 0)
+    if roll == 0:
+        return "fold", 0
+    if roll < 8:
+        return "call", 0
+    return "raise", to_call + min_bet * (1 + roll % 4)
+
+
+class ScriptedAgent(RandomAgent):
+    def make_decision(self, community_cards, current_bet, pot, min_bet):
+        return scripted_decision(self.name, list(self.cards), current_bet, self.current_bet, self.money, pot,
+                                 min_bet)
+
+
+def bot_policy(message):
+    return scripted_decision(message['agent'], message['hole_cards'], message['current_bet'], message['agent_bet'],
+                             message['money'], message['pot'], message['min_bet'])
+
+
+def new_game(agents, seed):
+    game = PokerGame(num_players=0, rng=random.Random(seed))
+    game.players = agents
+    for agent, stack in zip(agents, STACKS):
+        agent.reset()
+        agent.active = True
+        agent.money = stack
+    game.deal_cards()
+    return game
+
+
+def sync_events(runout):
+    streams = []
+    for seed in range(HANDS):
+        agents = [ScriptedAgent(f"Agent {seat + 1}") for seat in range(len(STACKS))]
+        sink = ListSink()
+        manage_betting_rounds(agents, 10, new_game(agents, seed), 10, 20, sink=sink, runout=runout)
+        streams.append(sink.events)
+    return streams
+
+
+async def async_events(runout):
+    server = await serve_bot(policy=bot_policy)
+    host, port = server.sockets[0].getsockname()[:2]
+    pool = ConnectionPool(host, port, size=2)
+    streams = []
+    try:
+        for seed in range(HANDS):
+            # Половина мест — удалённые боты, половина — локальные агенты.
+            agents = [RemoteAgent(f"Agent {seat + 1}", pool) if seat % 2 else ScriptedAgent(f"Agent {seat + 1}")
+                      for seat in range(len(STACKS))]
+            sink = ListSink()
+            defaults = await async_manage_betting_rounds(agents, 10, new_game(agents, seed), 10, 20, sink=sink,
+                                                         timeout=5.0, runout=runout)
+            assert defaults == 0
+            streams.append(sink.events)
+    finally:
+        await pool.close()
+        server.close()
+        await server.wait_closed()
+    return streams
+
+
+@pytest.mark.parametrize('runout', RUNOUT_MODES)
+def test_sync_and_async_engines_emit_identical_events(runout):
+    expected = sync_events(runout)
+    actual = asyncio.run(async_events(runout))
+    assert len(actual) == HANDS
+    for hand, (sync_stream, async_stream) in enumerate(zip(expected, actual)):
+        assert async_stream == sync_stream, f"раздача {hand}"
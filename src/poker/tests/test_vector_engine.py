@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+
+from src.poker.agents.batch import ACTION_CODES, ACTIONS, CALL, CHECK, FOLD, RAISE, PerSeatAdapter
+from src.poker.agents.random_agent import RandomAgent
+from src.poker.poker_game.betting import manage_betting_rounds
+from src.poker.poker_game.deck import Deck
+from src.poker.poker_game.events import NULL_SINK
+from src.poker.poker_game.game import PokerGame
+from src.poker.poker_game.utils import CARDS
+from src.poker.poker_game.vector_engine import VectorizedTables
+
+TABLES = 300
+STEPS = 400
+MIN_BET = 10
+
+
+class Script:
+    """Заранее выпавшие случайные числа: у каждого стола свой поток решений."""
+
+    def __init__(self, seed: int):
+        rng = np.random.default_rng(seed)
+        self.u = rng.random((TABLES, STEPS))
+        self.r = rng.random((TABLES, STEPS))
+        self.decks = np.argsort(rng.random((TABLES, 52)), axis=1)
+
+    def decide(self, table, step, current_bet, agent_bet, money, min_bet):
+        u = self.u[table, step]
+        if money <= 0:
+            return FOLD, 0
+        if current_bet == agent_bet:
+            action = CHECK if u < 0.7 else RAISE
+        elif money <= min_bet:
+            action = FOLD if u < 0.2 else CALL
+        else:
+            action = FOLD if u < 0.2 else (CALL if u < 0.7 else RAISE)
+        amount = current_bet + int(self.r[table, step] * (2 * min_bet + 1)) if action == RAISE else 0
+        return action, amount
+
+
+class ScriptedAgent(RandomAgent):
+    """Скалярный агент с make_decision, решения которого берутся из Script."""
+
+    def __init__(self, name, script, table, counter):
+        super().__init__(name)
+        self.script = script
+        self.table = table
+        self.counter = counter
+
+    def make_decision(self, community_cards, current_bet, pot, min_bet):
+        step = self.counter[0]
+        self.counter[0] += 1
+        action, amount = self.script.decide(self.table, step, current_bet, self.current_bet, self.money, min_bet)
+        return ACTIONS[action], amount
+
+
+class ScriptedBatch:
+    """Те же решения через decide_batch."""
+
+    def __init__(self, script):
+        self.script = script
+        self.steps = np.zeros(TABLES, dtype=np.int64)
+
+    def decide_batch(self, rows, current_bet, agent_bet, money, min_bet, **observation):
+        decisions = [self.script.decide(table, self.steps[table], bet, own, stack, min_bet)
+                     for table, bet, own, stack in zip(rows, current_bet, agent_bet, money)]
+        self.steps[rows] += 1
+        return np.array([action for action, _ in decisions]), np.array([amount for _, amount in decisions])
+
+
+def scalar_stacks(script, stacks):
+    """Разыгрывает каждый стол скалярным движком с той же колодой."""
+    result = np.zeros_like(stacks)
+    for table in range(TABLES):
+        counter = [0]
+        agents = [ScriptedAgent(f"Agent {seat + 1}", script, table, counter) for seat in range(stacks.shape[1])]
+        for agent, money in zip(agents, stacks[table]):
+            agent.money = int(money)
+        game = PokerGame(num_players=0)
+        game.players = agents
+        game.deck = Deck()
+        game.deck.cards = [CARDS[code] for code in script.decks[table][::-1]]
+        game.deal_cards()
+        manage_betting_rounds(agents, MIN_BET, game, 10, 20, sink=NULL_SINK)
+        result[table] = [agent.money for agent in agents]
+    return result
+
+
+@pytest.mark.parametrize('num_players', [2, 3, 6, 9])
+def test_vectorized_matches_scalar_engine(num_players):
+    script = Script(num_players)
+    # Короткие стеки, чтобы встречались и all-in.
+    stacks = np.random.default_rng(100 + num_players).integers(5, 3000, size=(TABLES, num_players))
+
+    tables = VectorizedTables(TABLES, num_players, min_bet=MIN_BET)
+    tables.money[:] = stacks
+    tables.play_hand(ScriptedBatch(script), decks=script.decks)
+
+    np.testing.assert_array_equal(tables.money, scalar_stacks(script, stacks))
+    np.testing.assert_array_equal(tables.money.sum(axis=1), stacks.sum(axis=1))
+
+
+def test_per_seat_adapter_matches_batch_policy():
+    num_players = 6
+    script = Script(42)
+    stacks = np.random.default_rng(7).integers(5, 3000, size=(TABLES, num_players))
+
+    batch = VectorizedTables(TABLES, num_players, min_bet=MIN_BET)
+    batch.money[:] = stacks
+    batch.play_hand(ScriptedBatch(script), decks=script.decks)
+
+    # У каждого стола свой счётчик решений, общий для всех мест, как в скалярном движке.
+    counters = {}
+
+    def factory_for(seat):
+        return lambda row: ScriptedAgent(f"Agent {seat + 1}", script, row, counters.setdefault(row, [0]))
+
+    adapted = VectorizedTables(TABLES, num_players, min_bet=MIN_BET)
+    adapted.money[:] = stacks
+    adapted.play_hand([PerSeatAdapter(factory_for(seat)) for seat in range(num_players)], decks=script.decks)
+
+    np.testing.assert_array_equal(adapted.money, batch.money)
+
+
+def test_per_seat_adapter_action_codes():
+    assert ACTION_CODES == {'fold': FOLD, 'check': CHECK, 'call': CALL, 'raise': RAISE}
+
+    script = Script(3)
+    rows = np.arange(50)
+    current_bet = np.full(50, 40)
+    agent_bet = np.where(rows % 2 == 0, 40, 20)
+    money = np.where(rows % 5 == 0, 0, 500)
+    counters = {}
+    adapter = PerSeatAdapter(lambda row: ScriptedAgent("Agent", script, row, counters.setdefault(row, [0])))
+    actions, amounts = adapter.decide_batch(
+        rows=rows, seat=2, current_bet=current_bet, agent_bet=agent_bet, money=money, pot=np.full(50, 100),
+        min_bet=MIN_BET, hole_cards=script.decks[rows, :2], community_cards=script.decks[rows, 2:5],
+    )
+    expected, expected_amounts = ScriptedBatch(script).decide_batch(rows, current_bet, agent_bet, money, MIN_BET)
+    np.testing.assert_array_equal(actions, expected)
+    np.testing.assert_array_equal(amounts, expected_amounts)